@@ -1,8 +1,10 @@
 import os
+import re
 import typing
 from starlette.responses import Response
 from starlette.staticfiles import StaticFiles
 from starlette.types import Scope
+from app.infrastructure.static_assets import AssetManifest
 
 # Маппинг MIME-типов, который работает в большинстве браузеров
 FONT_MIME_TYPES = {
@@ -14,15 +16,32 @@ FONT_MIME_TYPES = {
     "svg": "image/svg+xml"
 }
 
+# Адрес с хешем содержимого никогда не меняет смысл — кэшируем на год без перепроверки
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+# Прочие файлы из assets браузер может хранить, но перед использованием сверяет ETag / Last-Modified (ответ 304)
+REVALIDATE_CACHE_CONTROL = "no-cache"
+# Загрузки, названные по SHA-256 содержимого (file_blobs и их превью), тоже не меняются по своему адресу
+CONTENT_ADDRESSED_PATH = re.compile(r'^uploads/(?:achievements|previews)/[0-9a-f]{64}\.\w+$')
+
 
 class CustomStaticFiles(StaticFiles):
-    """Кастомный класс для обслуживания статических файлов с исправленными MIME-типами."""
+    """Кастомный класс для обслуживания статических файлов с исправленными MIME-типами.
+
+    Пути из манифеста с хешем (style.3f2a9c0d1b7e.css) и загрузки с именем-хешем
+    отдаются с вечным кэшем; прочие файлы из корней манифеста (assets) — с обязательной
+    перепроверкой по ETag, остальные загрузки — без своего Cache-Control.
+    """
+
+    def __init__(self, *args, manifest: AssetManifest = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.manifest = manifest
 
     def lookup_path(self, path: str) -> tuple[str, typing.Optional[os.stat_result]]:
         return super().lookup_path(path)
 
     async def get_response(self, path: str, scope: Scope) -> Response:
-        response = await super().get_response(path, scope)
+        original = self.manifest.resolve(path) if self.manifest is not None else None
+        response = await super().get_response(original or path, scope)
 
         ext = path.split(".")[-1].lower()
 
@@ -33,7 +52,15 @@ class CustomStaticFiles(StaticFiles):
             # 2. Принудительно устанавливаем заголовок CORS для шрифтов
             response.headers["Access-Control-Allow-Origin"] = "*"
 
-            # 3. Отключаем кэширование для устранения проблем
-            response.headers["Cache-Control"] = "no-cache, no-store, must-revalidate"
+        cache_control = self._cache_control(path.replace(os.sep, '/'), original)
+        if cache_control and response.status_code in (200, 304):
+            response.headers["Cache-Control"] = cache_control
+
+        return response
 
-        return response
\ No newline at end of file
+    def _cache_control(self, path: str, original: typing.Optional[str]) -> typing.Optional[str]:
+        if original or CONTENT_ADDRESSED_PATH.match(path):
+            return IMMUTABLE_CACHE_CONTROL
+        if self.manifest is not None and path.split('/', 1)[0] in self.manifest.roots:
+            return REVALIDATE_CACHE_CONTROL
+        return None
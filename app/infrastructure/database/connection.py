@@ -1,27 +1,83 @@
 import os
+import threading
 from sqlalchemy.orm import declarative_base
 
 Base = declarative_base()
 
-def get_database_connection():
-    driver = os.getenv("DB_DRIVER", "postgres").lower()
-    username = os.getenv("DB_USERNAME", "user")
-    password = os.getenv("DB_PASSWORD", "password")
-    host = os.getenv("DB_HOST", "localhost")
-    name = os.getenv("DB_NAME", "fastkit_db")
-    port = os.getenv("DB_PORT", "5432")
+# Реестр подключений на процесс: один engine (и один пул) на драйвер/URL
+_connections = {}
+_connections_lock = threading.Lock()
+
 
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def get_engine_options() -> dict:
+    return {
+        "pool_size": int(os.getenv("DB_POOL_SIZE", 5)),
+        "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", 10)),
+        "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", 1800)),
+        "pool_pre_ping": _env_bool("DB_POOL_PRE_PING", True),
+        "pool_timeout": int(os.getenv("DB_POOL_TIMEOUT", 30)),
+    }
+
+
+def _create_database_connection(driver, username, password, host, name, port):
     if driver == "postgres":
         from app.infrastructure.database.connections.postgres import Postgres
-        return Postgres(Base, username, password, host, name, port)
+        return Postgres(Base, username, password, host, name, port, get_engine_options())
     elif driver == "mysql":
         from app.infrastructure.database.connections.mysql import MySQL
-        return MySQL(Base, username, password, host, name, port)
+        return MySQL(Base, username, password, host, name, port, get_engine_options())
     elif driver == "sqlite":
         from app.infrastructure.database.connections.sqllite import SQLite
-        return SQLite(Base, name)
+        return SQLite(Base, name, get_engine_options())
     elif driver == "mongo":
         from app.infrastructure.database.connections.mongo import Mongo
         return Mongo(username, password, host, name, port)
     else:
-        raise ValueError(f"Unsupported database driver: {driver}")
\ No newline at end of file
+        raise ValueError(f"Unsupported database driver: {driver}")
+
+
+def get_database_connection():
+    driver = os.getenv("DB_DRIVER", "postgres").lower()
+    username = os.getenv("DB_USERNAME", "user")
+    password = os.getenv("DB_PASSWORD", "password")
+    host = os.getenv("DB_HOST", "localhost")
+    name = os.getenv("DB_NAME", "fastkit_db")
+    port = os.getenv("DB_PORT", "5432")
+
+    key = (driver, username, host, port, name)
+    connection = _connections.get(key)
+    if connection is not None:
+        return connection
+
+    with _connections_lock:
+        connection = _connections.get(key)
+        if connection is None:
+            connection = _create_database_connection(driver, username, password, host, name, port)
+            _connections[key] = connection
+    return connection
+
+
+def get_pool_status() -> list:
+    return [
+        {"driver": key[0], "database": key[4], **connection.pool_status()}
+        for key, connection in list(_connections.items())
+    ]
+
+
+def dispose_database_connections():
+    with _connections_lock:
+        for connection in _connections.values():
+            connection.dispose()
+        _connections.clear()
+
+
+async def dispose_async_database_connections():
+    for connection in list(_connections.values()):
+        await connection.dispose_async()
@@ -1,6 +1,11 @@
 from abc import ABC, abstractmethod
 
 class Base(ABC):
+    # URL async-драйвера (asyncpg/aiosqlite); None — async-режим не поддерживается
+    async_url = None
+    async_engine = None
+    engine_options = None
+
     @abstractmethod
     def get_url(self) -> str:
         pass
@@ -15,4 +20,44 @@ class Base(ABC):
 
     @abstractmethod
     def drop_all(self):
-        pass
\ No newline at end of file
+        pass
+
+    def get_async_engine(self):
+        if self.async_url is None:
+            raise NotImplementedError(f"{type(self).__name__} does not support async sessions")
+
+        # Async engine создается лениво: драйвер нужен только если async-путь используется
+        if self.async_engine is None:
+            from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+            self.async_engine = create_async_engine(self.async_url, **(self.engine_options or {}))
+            self.AsyncSessionLocal = async_sessionmaker(bind=self.async_engine, autoflush=False,
+                                                        expire_on_commit=False)
+        return self.async_engine
+
+    def get_async_session(self):
+        self.get_async_engine()
+        return self.AsyncSessionLocal()
+
+    def pool_status(self) -> dict:
+        status = self._pool_counters(self.engine.pool)
+        if self.async_engine is not None:
+            status["async"] = self._pool_counters(self.async_engine.pool)
+        return status
+
+    def dispose(self):
+        self.engine.dispose()
+
+    async def dispose_async(self):
+        if self.async_engine is not None:
+            await self.async_engine.dispose()
+            self.async_engine = None
+
+    @staticmethod
+    def _pool_counters(pool) -> dict:
+        status = {"pool_class": type(pool).__name__}
+        # Не у всех пулов есть счетчики (например, NullPool/StaticPool)
+        for name in ("size", "checkedin", "checkedout", "overflow"):
+            method = getattr(pool, name, None)
+            if callable(method):
+                status[name] = method()
+        return status
@@ -17,4 +17,13 @@ class Mongo(Base):
         self.client.drop_database(self.db.name)
 
     def get_session(self):
-        return self.db
\ No newline at end of file
+        return self.db
+
+    def get_async_engine(self):
+        raise NotImplementedError("Mongo does not support async sessions")
+
+    def pool_status(self) -> dict:
+        return {"pool_class": "MongoClient"}
+
+    def dispose(self):
+        self.client.close()
\ No newline at end of file
@@ -3,10 +3,10 @@ from sqlalchemy.orm import sessionmaker
 from .base import Base
 
 class MySQL(Base):
-    def __init__(self, base, username, password, host, db_name, port):
+    def __init__(self, base, username, password, host, db_name, port, engine_options: dict = None):
         self.base = base
         self.url = f"mysql+pymysql://{username}:{password}@{host}:{port}/{db_name}"
-        self.engine = create_engine(self.url)
+        self.engine = create_engine(self.url, **(engine_options or {}))
         self.SessionLocal = sessionmaker(bind=self.engine, autoflush=False, autocommit=False)
 
     def get_url(self) -> str:
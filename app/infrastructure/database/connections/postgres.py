@@ -3,10 +3,12 @@ from sqlalchemy.orm import sessionmaker
 from .base import Base
 
 class Postgres(Base):
-    def __init__(self, base, username, password, host, db_name, port):
+    def __init__(self, base, username, password, host, db_name, port, engine_options: dict = None):
         self.base = base
         self.url = f"postgresql+psycopg2://{username}:{password}@{host}:{port}/{db_name}"
-        self.engine = create_engine(self.url)
+        self.async_url = f"postgresql+asyncpg://{username}:{password}@{host}:{port}/{db_name}"
+        self.engine_options = engine_options or {}
+        self.engine = create_engine(self.url, **self.engine_options)
         self.SessionLocal = sessionmaker(bind=self.engine, autoflush=False, autocommit=False)
 
     def get_url(self) -> str:
@@ -3,10 +3,12 @@ from sqlalchemy.orm import sessionmaker
 from .base import Base
 
 class SQLite(Base):
-    def __init__(self, base, db_name):
+    def __init__(self, base, db_name, engine_options: dict = None):
         self.base = base
         self.url = f"sqlite:///{db_name}.db"
-        self.engine = create_engine(self.url, connect_args={"check_same_thread": False})
+        self.async_url = f"sqlite+aiosqlite:///{db_name}.db"
+        self.engine_options = engine_options or {}
+        self.engine = create_engine(self.url, connect_args={"check_same_thread": False}, **self.engine_options)
         self.SessionLocal = sessionmaker(bind=self.engine, autoflush=False, autocommit=False)
 
     def get_url(self) -> str:
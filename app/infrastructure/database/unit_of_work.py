@@ -0,0 +1,62 @@
+from fastapi import Request
+from app.infrastructure.database.connection import get_database_connection
+
+
+class UnitOfWork:
+    """Одна сессия БД на запрос: открывается лениво и закрывается ровно один раз."""
+
+    def __init__(self, connection=None):
+        self._connection = connection or get_database_connection()
+        self._session = None
+
+    @property
+    def session(self):
+        if self._session is None:
+            self._session = self._connection.get_session()
+        return self._session
+
+    @property
+    def is_open(self) -> bool:
+        return self._session is not None
+
+    def commit(self):
+        if self._session is not None:
+            self._session.commit()
+
+    def rollback(self):
+        if self._session is not None:
+            self._session.rollback()
+
+    def close(self):
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+
+    def complete(self, success: bool):
+        try:
+            if success:
+                self.commit()
+            else:
+                self.rollback()
+        except Exception:
+            self.rollback()
+            raise
+        finally:
+            self.close()
+
+
+def get_db(request: Request):
+    # Сессия, открытая GlobalContextMiddleware для текущего запроса
+    uow = getattr(request.state, 'uow', None)
+    if uow is not None:
+        yield uow.session
+        return
+
+    # Запрос прошел мимо middleware (тесты, отдельные приложения) — своя единица работы
+    uow = UnitOfWork()
+    success = False
+    try:
+        yield uow.session
+        success = True
+    finally:
+        uow.complete(success)
@@ -0,0 +1,195 @@
+import asyncio
+import os
+import time
+from email.message import EmailMessage
+import aiosmtplib
+from app.infrastructure.database.unit_of_work import UnitOfWork
+from app.repositories.admin.email_outbox_repository import EmailOutboxRepository
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None or value == '':
+        return default
+    return value.strip().lower() in ('1', 'true', 'yes', 'on')
+
+
+class EmailOutboxWorker:
+    """Фоновая доставка писем из таблицы email_outbox (по одному воркеру на процесс).
+
+    Запрос только сохраняет письмо и будит воркер; воркер забирает пачки,
+    отправляет их через одно переиспользуемое SMTP-соединение и повторяет
+    неудачные попытки с экспоненциальной задержкой.
+    """
+
+    def __init__(self, hostname: str = None, port: int = None, username: str = None, password: str = None,
+                 use_tls: bool = None, start_tls: bool = None, from_email: str = None,
+                 batch_size: int = None, poll_interval: float = None, max_attempts: int = None,
+                 retry_backoff: float = None, lease_seconds: float = 300, idle_timeout: float = 60,
+                 uow_factory=UnitOfWork):
+        self.hostname = hostname if hostname is not None else os.getenv('MAIL_HOST')
+        self.port = int(port or os.getenv('MAIL_PORT') or 587)
+        self.username = username if username is not None else os.getenv('MAIL_USERNAME')
+        self.password = password if password is not None else os.getenv('MAIL_PASSWORD')
+        self.use_tls = use_tls if use_tls is not None else _env_bool('MAIL_SSL_ENCRYPTION', False)
+        self.start_tls = start_tls if start_tls is not None else _env_bool('MAIL_TLS_ENCRYPTION', True)
+        self.from_email = from_email or os.getenv('MAIL_FROM_ADDRESS') or self.username
+        self.batch_size = batch_size or int(os.getenv('MAIL_OUTBOX_BATCH_SIZE', 50))
+        self.poll_interval = poll_interval if poll_interval is not None else float(os.getenv('MAIL_OUTBOX_POLL_INTERVAL', 5))
+        self.max_attempts = max_attempts or int(os.getenv('MAIL_OUTBOX_MAX_ATTEMPTS', 5))
+        self.retry_backoff = retry_backoff if retry_backoff is not None else float(os.getenv('MAIL_OUTBOX_RETRY_BACKOFF', 30))
+        self.lease_seconds = lease_seconds
+        self.idle_timeout = idle_timeout
+        self.uow_factory = uow_factory
+        self.sent = 0
+        self.failed = 0
+        self._smtp = None
+        self._last_used = 0.0
+        self._task = None
+        self._loop = None
+        self._wake = None
+        self._stopping = False
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.hostname)
+
+    # --- Запуск и остановка (lifespan приложения) ---
+
+    async def start(self):
+        if not self.enabled or self._task is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        self._stopping = False
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._stopping = True
+        self._wake.set()
+        await self._task
+        self._task = None
+        await self._disconnect()
+
+    def wake(self):
+        """Сигнал «в outbox появилось письмо»; безопасно вызывать из любого потока."""
+        if self._loop is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._wake.set)
+
+    async def _run(self):
+        while not self._stopping:
+            try:
+                delivered = await self.deliver_batch()
+            except Exception as e:
+                print(f"Email outbox worker error: {e}")
+                delivered = 0
+            if delivered >= self.batch_size:
+                continue  # в очереди, вероятно, есть еще — без паузы
+            if self._smtp is not None and time.monotonic() - self._last_used > self.idle_timeout:
+                await self._disconnect()
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+
+    # --- Доставка ---
+
+    async def deliver_batch(self) -> int:
+        """Забирает и отправляет одну пачку; возвращает число забранных писем."""
+        messages = await asyncio.to_thread(self._claim)
+        if not messages:
+            return 0
+
+        sent, failures = [], []
+        for position, message in enumerate(messages):
+            try:
+                await self._send(message)
+                sent.append(message.id)
+            except (aiosmtplib.SMTPConnectError, aiosmtplib.SMTPServerDisconnected, OSError) as e:
+                # Сервер недоступен — остаток пачки откладываем, не дожидаясь таймаута на каждом письме
+                self._smtp = None
+                failures.extend((rest, e) for rest in messages[position:])
+                break
+            except Exception as e:
+                failures.append((message, e))
+
+        await asyncio.to_thread(self._finish, sent, failures)
+        self.sent += len(sent)
+        return len(messages)
+
+    async def _send(self, message):
+        email = EmailMessage()
+        email['From'] = self.from_email
+        email['To'] = message.to
+        email['Subject'] = message.subject
+        email.set_content(message.body, subtype='html')
+
+        for attempt in (1, 2):
+            smtp = await self._connection()
+            try:
+                await smtp.send_message(email)
+                self._last_used = time.monotonic()
+                return
+            except aiosmtplib.SMTPServerDisconnected:
+                # Сервер закрыл простаивающее соединение — переподключаемся один раз
+                self._smtp = None
+                if attempt == 2:
+                    raise
+
+    async def _connection(self) -> aiosmtplib.SMTP:
+        if self._smtp is None or not self._smtp.is_connected:
+            smtp = aiosmtplib.SMTP(hostname=self.hostname, port=self.port, use_tls=self.use_tls,
+                                   start_tls=self.start_tls and not self.use_tls, timeout=30)
+            await smtp.connect()
+            if self.username:
+                await smtp.login(self.username, self.password or '')
+            self._smtp = smtp
+        return self._smtp
+
+    async def _disconnect(self):
+        smtp, self._smtp = self._smtp, None
+        if smtp is not None and smtp.is_connected:
+            try:
+                await smtp.quit()
+            except aiosmtplib.SMTPException:
+                smtp.close()
+
+    def _is_permanent(self, error: Exception) -> bool:
+        if isinstance(error, aiosmtplib.SMTPRecipientsRefused):
+            return all(refused.code >= 500 for refused in error.recipients)
+        return isinstance(error, aiosmtplib.SMTPResponseException) and 500 <= error.code < 600
+
+    def _claim(self) -> list:
+        uow = self.uow_factory()
+        try:
+            return EmailOutboxRepository(uow.session).claim(self.batch_size, self.lease_seconds)
+        finally:
+            uow.close()
+
+    def _finish(self, sent: list, failures: list):
+        uow = self.uow_factory()
+        try:
+            repository = EmailOutboxRepository(uow.session)
+            repository.mark_sent(sent)
+            for message, error in failures:
+                if self._is_permanent(error) or message.attempts >= self.max_attempts:
+                    repository.mark_failed(message.id, str(error))
+                    self.failed += 1
+                else:
+                    retry_in = min(self.retry_backoff * 2 ** (message.attempts - 1), 3600)
+                    repository.mark_failed(message.id, str(error), retry_in=retry_in)
+                print(f"Error sending email to {message.to}: {error}")
+        finally:
+            uow.close()
+
+
+email_outbox_worker = EmailOutboxWorker()
+
+
+def queue_email(db, to: str, subject: str, body: str):
+    """Сохраняет письмо в outbox и будит воркер доставки; SMTP запрос не ждет."""
+    EmailOutboxRepository(db).enqueue(to, subject, body)
+    email_outbox_worker.wake()
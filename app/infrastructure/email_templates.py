@@ -0,0 +1,38 @@
+import os
+import threading
+from jinja2 import Environment, FileSystemLoader, StrictUndefined, select_autoescape
+
+APP_URL = os.getenv('APP_URL', 'http://localhost:8000').rstrip('/')
+
+
+def reset_password_url(token: str) -> str:
+    # Ссылка строится без Request: письма рендерятся и в фоне, и из CLI
+    return f"{APP_URL}/admin/reset-password/{token}"
+
+
+class EmailTemplates:
+    """Шаблоны писем: компилируются один раз (при старте) и рендерятся из обычного dict.
+
+    Отдельное окружение без auto_reload и context processors админки, поэтому
+    рендер не зависит от Request и безопасен в любом потоке.
+    """
+
+    NAMES = ('welcome', 'reset_password')
+
+    def __init__(self, directory: str = 'templates/admin/emails'):
+        self.env = Environment(loader=FileSystemLoader(directory), autoescape=select_autoescape(['html']),
+                               auto_reload=False, undefined=StrictUndefined)
+        self._templates = {}
+        self._lock = threading.Lock()
+
+    def load(self):
+        with self._lock:
+            self._templates = {name: self.env.get_template(f'{name}.html') for name in self.NAMES}
+
+    def render(self, name: str, context: dict) -> str:
+        if not self._templates:
+            self.load()
+        return self._templates[name].render(context)
+
+
+email_templates = EmailTemplates()
@@ -2,7 +2,10 @@ from datetime import datetime, timedelta, UTC
 from jose import  jwt, JWTError
 from typing import Optional, Dict
 from dotenv import load_dotenv
+from app.infrastructure.ttl_cache import TTLCache
+import hashlib
 import os
+import time
 
 load_dotenv()
 
@@ -13,6 +16,10 @@ REFRESH_SECRET_KEY = os.getenv("API_REFRESH_SECRET_KEY", "astkit-refresh-secretk
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("API_ACCESS_TOKEN_EXPIRE_MINUTES", 60))
 REFRESH_TOKEN_EXPIRE_DAYS = int(os.getenv("API_REFRESH_TOKEN_EXPIRE_DAYS", 7))
 
+# Уже проверенные токены: ключ — sha256 токена, запись живет не дольше exp
+verified_tokens = TTLCache(ttl=ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+                           maxsize=int(os.getenv("API_VERIFIED_TOKENS_CACHE_SIZE", 10000)))
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     to_encode = data.copy()
     expire = datetime.now(UTC) + (expires_delta or timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES))
@@ -27,13 +34,24 @@ def create_refresh_token(data: dict, expires_delta: Optional[timedelta] = None)
     return jwt.encode(to_encode, REFRESH_SECRET_KEY, algorithm=ALGORITHM)
 
 def verify_token(token: str,  refresh: bool = False) -> Optional[Dict]:
+    # Пространства имен разделены: access-токен не пройдет проверку как refresh и наоборот
+    key = ("refresh" if refresh else "access", hashlib.sha256(token.encode()).digest())
+    payload = verified_tokens.get(key)
+    if payload is not None:
+        return dict(payload)
+
     try:
         secret = REFRESH_SECRET_KEY if refresh else SECRET_KEY
         payload = jwt.decode(token, secret, algorithms=[ALGORITHM])
-        return payload
     except JWTError:
         return None
 
+    if isinstance(payload.get("exp"), (int, float)):
+        ttl = payload["exp"] - time.time()
+        if ttl > 0:
+            verified_tokens.set(key, dict(payload), ttl=ttl)
+    return payload
+
 def refresh_access_token(refresh_token: str) -> Optional[Dict]:
     payload = verify_token(refresh_token, refresh=True)
     if not payload or payload.get('type') != "refresh":
@@ -0,0 +1,89 @@
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from passlib.context import CryptContext
+
+
+class PasswordHasherBusy(Exception):
+    """Очередь хеширования переполнена — запрос лучше отклонить, чем держать."""
+
+
+class PasswordHasher:
+    """Выделенный пул для bcrypt (на процесс).
+
+    bcrypt отпускает GIL, поэтому потоков достаточно: event loop не блокируется,
+    а число одновременных хешей ограничено max_workers. Если ожидающих задач
+    больше max_queue, новая сразу получает PasswordHasherBusy.
+    """
+
+    def __init__(self, max_workers: int = None, max_queue: int = None, context: CryptContext = None):
+        self.max_workers = max_workers or int(os.getenv('PASSWORD_HASHER_WORKERS', min(4, os.cpu_count() or 1)))
+        self.max_queue = max_queue if max_queue is not None else int(os.getenv('PASSWORD_HASHER_QUEUE', 32))
+        self.context = context or CryptContext(schemes=['bcrypt'], deprecated='auto')
+        self._executor = None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._metrics = {'completed': 0, 'rejected': 0, 'hash_seconds': 0.0, 'hash_max': 0.0,
+                         'wait_seconds': 0.0, 'wait_max': 0.0}
+
+    async def hash(self, password: str) -> str:
+        return await self._submit(self.context.hash, password)
+
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        return await self._submit(self.context.verify, password, hashed_password)
+
+    async def _submit(self, func, *args):
+        with self._lock:
+            if self._in_flight >= self.max_workers + self.max_queue:
+                self._metrics['rejected'] += 1
+                raise PasswordHasherBusy()
+            self._in_flight += 1
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix='password-hasher')
+        submitted_at = time.perf_counter()
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                self._executor, self._timed, func, args, submitted_at)
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+    def _timed(self, func, args, submitted_at):
+        started_at = time.perf_counter()
+        try:
+            return func(*args)
+        finally:
+            elapsed, waited = time.perf_counter() - started_at, started_at - submitted_at
+            with self._lock:
+                metrics = self._metrics
+                metrics['completed'] += 1
+                metrics['hash_seconds'] += elapsed
+                metrics['hash_max'] = max(metrics['hash_max'], elapsed)
+                metrics['wait_seconds'] += waited
+                metrics['wait_max'] = max(metrics['wait_max'], waited)
+
+    def stats(self) -> dict:
+        with self._lock:
+            metrics, completed = dict(self._metrics), self._metrics['completed'] or 1
+            return {
+                'workers': self.max_workers,
+                'max_queue': self.max_queue,
+                'in_flight': self._in_flight,
+                'completed': metrics['completed'],
+                'rejected': metrics['rejected'],
+                'hash_avg_ms': round(metrics['hash_seconds'] / completed * 1000, 1),
+                'hash_max_ms': round(metrics['hash_max'] * 1000, 1),
+                'wait_avg_ms': round(metrics['wait_seconds'] / completed * 1000, 1),
+                'wait_max_ms': round(metrics['wait_max'] * 1000, 1),
+            }
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+
+password_hasher = PasswordHasher()
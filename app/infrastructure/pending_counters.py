@@ -0,0 +1,65 @@
+import os
+import threading
+import time
+from sqlalchemy import select, func
+from app.models.user import Users
+from app.models.achievement import Achievement
+from app.models.enums import UserStatus, AchievementStatus
+
+
+class PendingCounters:
+    """Кэш счетчиков бокового меню (ожидающие пользователи и документы).
+
+    Сервисы сбрасывают счетчик при изменении статусов, TTL страхует от
+    изменений, сделанных другими воркерами.
+    """
+
+    USERS = 'pending_users_count'
+    ACHIEVEMENTS = 'pending_achievements_count'
+
+    def __init__(self, ttl: float = None):
+        self.ttl = ttl if ttl is not None else float(os.getenv('PENDING_COUNTERS_TTL', 30))
+        self._values = {}
+        self._expires_at = {}
+        self._lock = threading.Lock()
+
+    def get(self, db) -> dict:
+        now = time.monotonic()
+        with self._lock:
+            if all(self._expires_at.get(name, 0) > now for name in (self.USERS, self.ACHIEVEMENTS)):
+                return dict(self._values)
+
+        # Оба счетчика одним запросом
+        users_count, achievements_count = db.execute(select(
+            select(func.count()).select_from(Users).where(Users.status == UserStatus.PENDING).scalar_subquery(),
+            select(func.count()).select_from(Achievement).where(
+                Achievement.status == AchievementStatus.PENDING).scalar_subquery(),
+        )).one()
+
+        with self._lock:
+            expires_at = time.monotonic() + self.ttl
+            self._values = {self.USERS: users_count, self.ACHIEVEMENTS: achievements_count}
+            self._expires_at = {self.USERS: expires_at, self.ACHIEVEMENTS: expires_at}
+            return dict(self._values)
+
+    def invalidate(self, *names):
+        with self._lock:
+            for name in names or (self.USERS, self.ACHIEVEMENTS):
+                self._expires_at.pop(name, None)
+
+
+pending_counters = PendingCounters()
+
+
+def pending_counters_context(request) -> dict:
+    """Context processor шаблонов: счетчики нужны только модераторам в layout."""
+    if request.session.get('auth_role') not in ['moderator', 'super_admin']:
+        return {}
+
+    uow = getattr(request.state, 'uow', None)
+    if uow is None:
+        return {}
+
+    for name, value in pending_counters.get(uow.session).items():
+        setattr(request.state, name, value)
+    return {}
@@ -0,0 +1,126 @@
+import io
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+from app.infrastructure.database.unit_of_work import UnitOfWork
+from app.infrastructure.storage import file_storage
+from app.repositories.admin.achievement_repository import AchievementRepository
+
+PREVIEW_DIRECTORY = 'static/uploads/previews'
+PREVIEW_SIZE = int(os.getenv('PREVIEW_MAX_SIZE', 480))
+IMAGE_EXTENSIONS = ('jpg', 'jpeg', 'png', 'gif', 'webp', 'bmp', 'tif', 'tiff')
+
+
+def preview_path_for(file_path: str, directory: str = PREVIEW_DIRECTORY) -> str:
+    """Превью называется по имени оригинала: у файлов из file_blobs это хеш, одинаковые загрузки делят превью."""
+    name = os.path.splitext(os.path.basename(file_path))[0]
+    return f"{directory}/{name}.webp"
+
+
+def render_preview(file_path: str, target: str, size: int = PREVIEW_SIZE) -> Optional[str]:
+    """Рисует превью (изображение или первая страница PDF) в WebP не больше size×size.
+
+    Выполняется в отдельном процессе, поэтому функция модульного уровня; оригинал
+    читается и превью сохраняется через file_storage процесса. Возвращает ключ превью
+    или None, если формат не поддерживается или не установлены Pillow / pypdfium2.
+    """
+    extension = file_path.rsplit('.', 1)[-1].lower()
+    if extension not in IMAGE_EXTENSIONS and extension != 'pdf':
+        return None
+    if file_storage.exists(target):
+        return target
+    try:
+        from PIL import Image, ImageOps
+    except ImportError:
+        return None
+
+    with file_storage.local_path(file_path) as source_path:
+        if extension in IMAGE_EXTENSIONS:
+            with Image.open(source_path) as source:
+                # draft() позволяет JPEG декодироваться сразу в уменьшенном масштабе
+                source.draft('RGB', (size, size))
+                image = ImageOps.exif_transpose(source)
+                image.thumbnail((size, size))
+                image = image.convert('RGBA' if 'A' in image.getbands() else 'RGB')
+        else:
+            try:
+                import pypdfium2
+            except ImportError:
+                return None
+            pdf = pypdfium2.PdfDocument(source_path)
+            try:
+                page = pdf[0]
+                width, height = page.get_size()
+                image = page.render(scale=size / max(width, height)).to_pil()
+                page.close()
+            finally:
+                pdf.close()
+
+    buffer = io.BytesIO()
+    image.save(buffer, 'WEBP', quality=80, method=4)
+    file_storage.save_bytes(target, buffer.getvalue(), 'image/webp')
+    return target
+
+
+class PreviewGenerator:
+    """Фоновая генерация превью документов в пуле процессов.
+
+    Декодирование и масштабирование — CPU-работа, поэтому она идет в отдельных
+    процессах, а запрос загрузки только ставит задачу. Готовый путь записывается
+    в achievements.preview_path из колбэка завершения.
+    """
+
+    def __init__(self, max_workers: int = None, executor=None, renderer=render_preview, uow_factory=UnitOfWork):
+        self.max_workers = max_workers or int(os.getenv('PREVIEW_WORKERS', 1))
+        self.renderer = renderer
+        self.uow_factory = uow_factory
+        self._executor = executor
+        self._lock = threading.Lock()
+        self._pending = set()
+        self.generated = 0
+        self.failed = 0
+
+    def schedule(self, achievement_id: int, file_path: str):
+        with self._lock:
+            if self._executor is None:
+                # spawn, а не fork: форк многопоточного веб-процесса копирует пулы соединений,
+                # фоновые потоки и уже созданный клиент boto3, которые не переживают fork
+                self._executor = ProcessPoolExecutor(self.max_workers, mp_context=multiprocessing.get_context('spawn'))
+            future = self._executor.submit(self.renderer, file_path, preview_path_for(file_path))
+            self._pending.add(future)
+        future.add_done_callback(lambda done: self._finished(done, achievement_id, file_path))
+        return future
+
+    def _finished(self, future, achievement_id: int, file_path: str):
+        with self._lock:
+            self._pending.discard(future)
+        try:
+            preview_path = future.result()
+        except Exception as e:
+            self.failed += 1
+            print(f"Error generating preview for {file_path}: {e}")
+            return
+        if preview_path is None:
+            return
+        uow = self.uow_factory()
+        try:
+            AchievementRepository(uow.session).set_preview(achievement_id, preview_path)
+            self.generated += 1
+        finally:
+            uow.close()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {'workers': self.max_workers, 'pending': len(self._pending),
+                    'generated': self.generated, 'failed': self.failed}
+
+    def shutdown(self, wait: bool = True):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=not wait)
+
+
+preview_generator = PreviewGenerator()
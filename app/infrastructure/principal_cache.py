@@ -0,0 +1,59 @@
+import os
+from typing import NamedTuple, Optional
+from sqlalchemy import select
+from app.infrastructure.ttl_cache import TTLCache
+from app.models.enums import UserRole, UserStatus
+from app.models.user import Users
+
+
+class Principal(NamedTuple):
+    """Неизменяемый снимок пользователя для API: безопасно делить между запросами и потоками."""
+    id: int
+    email: Optional[str]
+    first_name: Optional[str]
+    last_name: Optional[str]
+    role: UserRole
+    status: Optional[UserStatus]
+    is_active: bool
+
+    @property
+    def is_allowed(self) -> bool:
+        return bool(self.is_active) and self.status not in (UserStatus.REJECTED, UserStatus.DELETED)
+
+
+class PrincipalCache:
+    """Кэш аутентифицированных пользователей API по id (на процесс).
+
+    UserRepository сбрасывает запись при смене роли/статуса и удалении, короткий
+    TTL (API_PRINCIPAL_CACHE_TTL) подхватывает изменения из других воркеров.
+    """
+
+    def __init__(self, ttl: float = None, maxsize: int = 10000):
+        self._cache = TTLCache(ttl if ttl is not None else float(os.getenv('API_PRINCIPAL_CACHE_TTL', 5)), maxsize)
+
+    def get(self, user_id: int, load_db) -> Optional[Principal]:
+        """load_db — функция без аргументов, возвращающая сессию; вызывается только при промахе."""
+        principal = self._cache.get(user_id)
+        if principal is None:
+            row = load_db().execute(
+                select(Users.id, Users.email, Users.first_name, Users.last_name, Users.role, Users.status,
+                       Users.is_active).where(Users.id == user_id)
+            ).first()
+            if row is None:
+                return None
+            principal = Principal(*row)
+            self._cache.set(user_id, principal)
+        return principal
+
+    def invalidate(self, *user_ids: int):
+        for user_id in user_ids:
+            self._cache.invalidate(user_id)
+
+    def clear(self):
+        self._cache.clear()
+
+    def stats(self) -> dict:
+        return self._cache.stats()
+
+
+principal_cache = PrincipalCache()
@@ -0,0 +1,73 @@
+import hashlib
+import os
+import threading
+from typing import Optional
+from jinja2 import pass_context
+
+ASSET_HASH_LENGTH = 12
+
+
+class AssetManifest:
+    """Манифест статики: каждому файлу из roots — адрес с хешем содержимого.
+
+    assets/css/style.css -> assets/css/style.3f2a9c0d1b7e.css. Такой адрес меняется
+    вместе с файлом, поэтому его можно кэшировать навсегда (immutable). Строится
+    один раз при старте (или при первом обращении) и не следит за изменениями.
+    """
+
+    def __init__(self, directory: str = 'static', roots: tuple = ('assets',)):
+        self.directory = directory
+        self.roots = roots
+        self._fingerprinted = None  # исходный путь -> путь с хешем
+        self._originals = {}  # путь с хешем -> исходный путь
+        self._lock = threading.Lock()
+
+    def build(self):
+        fingerprinted, originals = {}, {}
+        for root in self.roots:
+            for folder, _, files in os.walk(os.path.join(self.directory, root)):
+                for name in files:
+                    full_path = os.path.join(folder, name)
+                    path = os.path.relpath(full_path, self.directory).replace(os.sep, '/')
+                    hashed = self._fingerprint(path, self._digest(full_path))
+                    fingerprinted[path] = hashed
+                    originals[hashed] = path
+        with self._lock:
+            self._fingerprinted, self._originals = fingerprinted, originals
+        return self
+
+    @staticmethod
+    def _digest(full_path: str) -> str:
+        digest = hashlib.sha256()
+        with open(full_path, 'rb') as handle:
+            for chunk in iter(lambda: handle.read(1024 * 1024), b''):
+                digest.update(chunk)
+        return digest.hexdigest()[:ASSET_HASH_LENGTH]
+
+    @staticmethod
+    def _fingerprint(path: str, digest: str) -> str:
+        folder, name = path.rsplit('/', 1) if '/' in path else ('', path)
+        stem, dot, extension = name.rpartition('.')
+        name = f"{stem}.{digest}.{extension}" if dot else f"{name}.{digest}"
+        return f"{folder}/{name}" if folder else name
+
+    def path(self, path: str) -> str:
+        """Путь с хешем для файла; неизвестные файлы возвращаются как есть."""
+        if self._fingerprinted is None:
+            self.build()
+        return self._fingerprinted.get(path.lstrip('/'), path)
+
+    def resolve(self, path: str) -> Optional[str]:
+        """Исходный путь для адреса с хешем или None, если это не адрес из манифеста."""
+        if self._fingerprinted is None:
+            self.build()
+        return self._originals.get(path.replace(os.sep, '/'))
+
+
+asset_manifest = AssetManifest()
+
+
+@pass_context
+def asset(context, path: str) -> str:
+    """Jinja-хелпер: {{ asset('assets/css/style.css') }} — URL статики с хешем содержимого."""
+    return str(context['request'].url_for('static', path=asset_manifest.path(path)))
@@ -0,0 +1,178 @@
+import os
+import shutil
+import tempfile
+import uuid
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Optional
+
+
+class Storage(ABC):
+    """Хранилище загруженных файлов.
+
+    Ключ — строка, которая сохраняется в БД (например static/uploads/achievements/<sha>.png);
+    по нему файл можно записать, проверить, удалить и получить URL для скачивания.
+    """
+
+    @abstractmethod
+    def save(self, key: str, source_path: str, content_type: Optional[str] = None):
+        """Переносит локальный временный файл в хранилище (исходный файл больше не существует)."""
+
+    @abstractmethod
+    def save_bytes(self, key: str, data: bytes, content_type: Optional[str] = None):
+        pass
+
+    @abstractmethod
+    def exists(self, key: str) -> bool:
+        pass
+
+    @abstractmethod
+    def delete(self, key: str):
+        pass
+
+    @abstractmethod
+    def url(self, key: str) -> str:
+        pass
+
+    @abstractmethod
+    def local_path(self, key: str):
+        """Контекстный менеджер: путь к локальной копии файла для чтения (обработка превью и т.п.)."""
+
+
+class LocalStorage(Storage):
+    """Файлы на локальном диске; ключ — путь от корня проекта, раздается через /static."""
+
+    def __init__(self, root: str = '.'):
+        self.root = root
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, key)
+
+    def save(self, key: str, source_path: str, content_type: Optional[str] = None):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        os.replace(source_path, path)
+
+    def save_bytes(self, key: str, data: bytes, content_type: Optional[str] = None):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        # Запись во временный файл рядом и атомарное переименование — читатели не видят половину файла
+        tmp_path = f"{path}.{uuid.uuid4().hex}.part"
+        with open(tmp_path, 'wb') as handle:
+            handle.write(data)
+        os.replace(tmp_path, path)
+
+    def exists(self, key: str) -> bool:
+        return os.path.exists(self._path(key))
+
+    def delete(self, key: str):
+        try:
+            os.unlink(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def url(self, key: str) -> str:
+        return f"/{key}"
+
+    @contextmanager
+    def local_path(self, key: str):
+        yield self._path(key)
+
+
+class S3Storage(Storage):
+    """S3-совместимое хранилище (AWS S3, MinIO и т.п.).
+
+    Файлы отдаются по presigned-ссылкам прямо из бакета, байты не проходят
+    через воркеры приложения. Если задан public_url (CDN или публичный бакет),
+    ссылки строятся от него без подписи.
+    """
+
+    def __init__(self, bucket: str, prefix: str = '', endpoint_url: str = None, region: str = None,
+                 access_key: str = None, secret_key: str = None, url_ttl: int = 3600, public_url: str = None,
+                 client=None):
+        self.bucket = bucket
+        self.prefix = prefix.strip('/') + '/' if prefix.strip('/') else ''
+        self.endpoint_url = endpoint_url
+        self.region = region
+        self.access_key = access_key
+        self.secret_key = secret_key
+        self.url_ttl = url_ttl
+        self.public_url = public_url.rstrip('/') if public_url else None
+        self._client = client
+
+    @property
+    def client(self):
+        # boto3 импортируется и клиент создается только при первом обращении
+        if self._client is None:
+            import boto3
+            from botocore.config import Config
+            self._client = boto3.client('s3', endpoint_url=self.endpoint_url, region_name=self.region,
+                                        aws_access_key_id=self.access_key, aws_secret_access_key=self.secret_key,
+                                        config=Config(signature_version='s3v4'))
+        return self._client
+
+    def _object_key(self, key: str) -> str:
+        return self.prefix + key
+
+    def _put(self, key: str, body, content_type: Optional[str]):
+        extra = {'ContentType': content_type} if content_type else {}
+        self.client.put_object(Bucket=self.bucket, Key=self._object_key(key), Body=body, **extra)
+
+    def save(self, key: str, source_path: str, content_type: Optional[str] = None):
+        with open(source_path, 'rb') as handle:
+            self._put(key, handle, content_type)
+        os.unlink(source_path)
+
+    def save_bytes(self, key: str, data: bytes, content_type: Optional[str] = None):
+        self._put(key, data, content_type)
+
+    def exists(self, key: str) -> bool:
+        from botocore.exceptions import ClientError
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=self._object_key(key))
+            return True
+        except ClientError as e:
+            if e.response.get('Error', {}).get('Code') in ('404', 'NoSuchKey', 'NotFound'):
+                return False
+            raise
+
+    def delete(self, key: str):
+        self.client.delete_object(Bucket=self.bucket, Key=self._object_key(key))
+
+    def url(self, key: str) -> str:
+        if self.public_url:
+            return f"{self.public_url}/{self._object_key(key)}"
+        # Подпись считается локально, без обращения к S3
+        return self.client.generate_presigned_url(
+            'get_object', Params={'Bucket': self.bucket, 'Key': self._object_key(key)}, ExpiresIn=self.url_ttl)
+
+    @contextmanager
+    def local_path(self, key: str):
+        response = self.client.get_object(Bucket=self.bucket, Key=self._object_key(key))
+        suffix = os.path.splitext(key)[1]
+        with tempfile.NamedTemporaryFile(suffix=suffix) as handle:
+            shutil.copyfileobj(response['Body'], handle, 1024 * 1024)
+            handle.flush()
+            yield handle.name
+
+
+def create_storage() -> Storage:
+    """Бэкенд из STORAGE_BACKEND: local (по умолчанию) или s3."""
+    backend = os.getenv('STORAGE_BACKEND', 'local').lower()
+    if backend == 'local':
+        return LocalStorage()
+    if backend == 's3':
+        return S3Storage(
+            bucket=os.getenv('STORAGE_S3_BUCKET'),
+            prefix=os.getenv('STORAGE_S3_PREFIX', ''),
+            endpoint_url=os.getenv('STORAGE_S3_ENDPOINT') or None,
+            region=os.getenv('STORAGE_S3_REGION') or None,
+            access_key=os.getenv('STORAGE_S3_ACCESS_KEY') or None,
+            secret_key=os.getenv('STORAGE_S3_SECRET_KEY') or None,
+            url_ttl=int(os.getenv('STORAGE_URL_TTL', 3600)),
+            public_url=os.getenv('STORAGE_PUBLIC_URL') or None,
+        )
+    raise ValueError(f"Unknown STORAGE_BACKEND: {backend}")
+
+
+file_storage = create_storage()
@@ -0,0 +1,256 @@
+import hashlib
+import mimetypes
+import os
+import uuid
+from dataclasses import dataclass, field
+from typing import NamedTuple, Optional
+from python_multipart.multipart import MultipartParser, parse_options_header
+from starlette.concurrency import run_in_threadpool
+from starlette.requests import Request
+from app.infrastructure.storage import Storage, file_storage
+
+MB = 1024 * 1024
+
+
+def _env_mb(name: str, default: int) -> int:
+    return int(float(os.getenv(name, default)) * MB)
+
+
+class UploadRejected(ValueError):
+    """Загрузка отклонена (тип, размер, форма); роуты показывают текст пользователю."""
+
+
+class UploadTooLarge(UploadRejected):
+    pass
+
+
+@dataclass
+class UploadPolicy:
+    """Куда и что можно загружать: лимиты по префиксу MIME-типа; default_limit=None — остальное запрещено."""
+    directory: str
+    limits: dict
+    default_limit: Optional[int] = None
+    max_fields_size: int = 64 * 1024
+
+    def limit_for(self, content_type: str) -> Optional[int]:
+        for prefix, limit in self.limits.items():
+            if content_type.startswith(prefix):
+                return limit
+        return self.default_limit
+
+    @property
+    def max_request_size(self) -> int:
+        return max([*self.limits.values(), self.default_limit or 0]) + self.max_fields_size
+
+
+ACHIEVEMENT_UPLOADS = UploadPolicy(
+    directory='static/uploads/achievements',
+    limits={'image/': _env_mb('UPLOAD_MAX_IMAGE_MB', 10), 'application/pdf': _env_mb('UPLOAD_MAX_PDF_MB', 25)},
+    default_limit=_env_mb('UPLOAD_MAX_OTHER_MB', 5),
+)
+AVATAR_UPLOADS = UploadPolicy(
+    directory='static/uploads/avatars',
+    limits={'image/': _env_mb('UPLOAD_MAX_AVATAR_MB', 5)},
+)
+
+
+class StoredFile(NamedTuple):
+    path: str
+    size: int
+    sha256: str
+    content_type: str
+    filename: str
+
+
+UPLOAD_SPOOL_SIZE = _env_mb('UPLOAD_SPOOL_MB', 1)
+
+
+class PendingUpload:
+    """Файл из формы, принятый потоком: SHA-256 и размер считаются по мере записи.
+
+    Первые UPLOAD_SPOOL_SIZE байт держатся в памяти, дальше данные идут во
+    временный файл в папке directory. commit() передает файл в хранилище под
+    ключом directory/name; discard() (или любая ошибка до commit) удаляет его, так что
+    недописанные файлы не остаются на диске, а небольшой дубликат не пишется вовсе.
+    Дубликат больше UPLOAD_SPOOL_SIZE один раз пишется во временный файл: хеш известен
+    только в конце загрузки, а держать в памяти файлы до лимита типа (25 МБ для PDF)
+    на каждый параллельный запрос дороже.
+    """
+
+    def __init__(self, directory: str, filename: str, content_type: str, limit: int,
+                 spool_size: int = UPLOAD_SPOOL_SIZE, storage: Storage = None):
+        self.directory = directory
+        self.storage = storage or file_storage
+        self.filename = filename
+        self.content_type = content_type
+        self.limit = limit
+        self.spool_size = spool_size
+        self.size = 0
+        self._hash = hashlib.sha256()
+        self._buffer = bytearray()
+        self._tmp_path = os.path.join(directory, f".upload-{uuid.uuid4().hex}.part")
+        self._file = None
+        self.committed = None
+
+    @property
+    def extension(self) -> str:
+        return self.filename.rsplit('.', 1)[-1].lower() if '.' in self.filename else 'dat'
+
+    @property
+    def sha256(self) -> str:
+        return self._hash.hexdigest()
+
+    def write(self, chunk: bytes):
+        self.size += len(chunk)
+        if self.size > self.limit:
+            raise UploadTooLarge(f"File is too large (max {self.limit // MB} MB).")
+        self._hash.update(chunk)
+        if self._file is None and self.size <= self.spool_size:
+            self._buffer += chunk
+            return
+        self._spill()
+        self._file.write(chunk)
+
+    def _spill(self):
+        if self._file is None:
+            os.makedirs(self.directory, exist_ok=True)
+            self._file = open(self._tmp_path, 'wb')
+            self._file.write(self._buffer)
+            self._buffer = bytearray()
+
+    def finish(self):
+        if self._file is not None:
+            self._file.close()
+
+    def commit(self, name: str) -> StoredFile:
+        key = os.path.join(self.directory, name).replace(os.sep, '/')
+        if self._file is None:
+            # Небольшой файл целиком в памяти — на локальный диск он попадает только в LocalStorage
+            self.storage.save_bytes(key, bytes(self._buffer), self.content_type)
+            self._buffer = bytearray()
+        else:
+            self.finish()
+            self.storage.save(key, self._tmp_path, self.content_type)
+        self.committed = StoredFile(key, self.size, self.sha256, self.content_type, self.filename)
+        return self.committed
+
+    def discard(self):
+        self._buffer = bytearray()
+        if self.committed is None and self._file is not None:
+            self._file.close()
+            try:
+                os.unlink(self._tmp_path)
+            except FileNotFoundError:
+                pass
+
+
+@dataclass
+class UploadForm:
+    fields: dict = field(default_factory=dict)
+    files: dict = field(default_factory=dict)
+
+    def discard(self):
+        for upload in self.files.values():
+            upload.discard()
+
+
+class _StreamingFormParser:
+    """Колбэки python-multipart: поля копятся в памяти, файлы пишутся сразу в PendingUpload."""
+
+    def __init__(self, policy: UploadPolicy, file_fields: tuple, charset: str):
+        self.policy = policy
+        self.file_fields = file_fields
+        self.charset = charset
+        self.form = UploadForm()
+        self._fields_size = 0
+        self._header_name = b''
+        self._header_value = b''
+        self._headers = {}
+        self._name = None
+        self._data = bytearray()
+        self._upload = None
+        self._skip = False
+
+    def callbacks(self) -> dict:
+        return {name: getattr(self, name) for name in (
+            'on_part_begin', 'on_part_data', 'on_part_end', 'on_header_field', 'on_header_value',
+            'on_header_end', 'on_headers_finished')}
+
+    def on_part_begin(self):
+        self._headers, self._name, self._upload, self._skip = {}, None, None, False
+        self._data = bytearray()
+
+    def on_header_field(self, data: bytes, start: int, end: int):
+        self._header_name += data[start:end]
+
+    def on_header_value(self, data: bytes, start: int, end: int):
+        self._header_value += data[start:end]
+
+    def on_header_end(self):
+        self._headers[self._header_name.lower()] = self._header_value
+        self._header_name, self._header_value = b'', b''
+
+    def on_headers_finished(self):
+        _, options = parse_options_header(self._headers.get(b'content-disposition', b''))
+        if b'name' not in options:
+            raise UploadRejected("Malformed form data.")
+        self._name = options[b'name'].decode(self.charset, errors='replace')
+        if b'filename' not in options:
+            return
+
+        filename = os.path.basename(options[b'filename'].decode(self.charset, errors='replace'))
+        # Пустой input type=file или неожиданное поле — данные пропускаем
+        if not filename or self._name not in self.file_fields:
+            self._skip = True
+            return
+        content_type = (self._headers.get(b'content-type', b'').decode('latin-1').strip()
+                        or mimetypes.guess_type(filename)[0] or 'application/octet-stream')
+        limit = self.policy.limit_for(content_type)
+        if limit is None:
+            raise UploadRejected(f"File type {content_type} is not allowed.")
+        self._upload = PendingUpload(self.policy.directory, filename, content_type, limit)
+        self.form.files[self._name] = self._upload
+
+    def on_part_data(self, data: bytes, start: int, end: int):
+        if self._upload is not None:
+            self._upload.write(data[start:end])
+        elif not self._skip:
+            self._fields_size += end - start
+            if self._fields_size > self.policy.max_fields_size:
+                raise UploadTooLarge("Form fields are too large.")
+            self._data += data[start:end]
+
+    def on_part_end(self):
+        if self._upload is not None:
+            self._upload.finish()
+        elif not self._skip:
+            self.form.fields[self._name] = self._data.decode(self.charset, errors='replace')
+
+
+async def receive_upload(request: Request, policy: UploadPolicy, file_fields: tuple = ('file',)) -> UploadForm:
+    """Читает multipart-запрос потоком: файлы пишутся на диск по мере прихода чанков.
+
+    Разбор и запись идут в пуле потоков, event loop только передает чанки.
+    Лимиты проверяются на лету; при любой ошибке частичные файлы удаляются.
+    Вызывающий код обязан вызвать commit() нужных файлов и form.discard() в finally.
+    """
+    content_type, params = parse_options_header(request.headers.get('content-type', ''))
+    if content_type != b'multipart/form-data' or b'boundary' not in params:
+        raise UploadRejected("Expected multipart/form-data.")
+    content_length = request.headers.get('content-length')
+    if content_length and content_length.isdigit() and int(content_length) > policy.max_request_size:
+        raise UploadTooLarge(f"Request is too large (max {policy.max_request_size // MB} MB).")
+
+    charset = params.get(b'charset', b'utf-8').decode('latin-1')
+    handler = _StreamingFormParser(policy, file_fields, charset)
+    parser = MultipartParser(params[b'boundary'], handler.callbacks())
+    try:
+        async for chunk in request.stream():
+            if chunk:
+                await run_in_threadpool(parser.write, chunk)
+        parser.finalize()
+    except BaseException:
+        # Ошибка, лимит или обрыв соединения: недописанные файлы удаляем
+        handler.form.discard()
+        raise
+    return handler.form
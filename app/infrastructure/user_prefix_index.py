@@ -0,0 +1,160 @@
+import os
+import threading
+import time
+from bisect import bisect_left, insort
+from typing import NamedTuple, Optional
+from sqlalchemy import select
+from app.infrastructure.database.unit_of_work import UnitOfWork
+from app.models.user import Users
+
+
+class IndexedUser(NamedTuple):
+    id: int
+    first_name: Optional[str]
+    last_name: Optional[str]
+    email: Optional[str]
+    avatar_path: Optional[str]
+
+
+def _normalize(value: Optional[str]) -> str:
+    return ' '.join((value or '').lower().split())
+
+
+def _keys(user: IndexedUser) -> set:
+    first, last, email = _normalize(user.first_name), _normalize(user.last_name), _normalize(user.email)
+    keys = {first, last, email, f"{first} {last}".strip(), f"{last} {first}".strip()}
+    keys.discard('')
+    return keys
+
+
+class UserPrefixIndex:
+    """Префиксный индекс пользователей для автодополнения (на воркер).
+
+    Отсортированный массив ключей (имя, фамилия, «имя фамилия», email) и bisect
+    по префиксу. Изменения из этого воркера применяются сразу, изменения других
+    воркеров подтягиваются полной перезагрузкой раз в USER_PREFIX_INDEX_TTL секунд.
+    Перезагрузка идет в фоновом потоке со своей сессией, а запросы автодополнения
+    до ее окончания отвечают по устаревшему индексу.
+    """
+
+    def __init__(self, ttl: float = None, uow_factory=UnitOfWork):
+        self.ttl = ttl if ttl is not None else float(os.getenv('USER_PREFIX_INDEX_TTL', 300))
+        self.uow_factory = uow_factory
+        self._entries = []
+        self._users = {}
+        self._user_keys = {}
+        self._loaded_at = None
+        self._refreshing = False
+        # Изменения, пришедшие во время перезагрузки: id -> пользователь (None — удален)
+        self._changes = None
+        self._warming = 0
+        self._lock = threading.Lock()
+
+    @property
+    def is_fresh(self) -> bool:
+        return self._loaded_at is not None and time.monotonic() - self._loaded_at < self.ttl
+
+    def warm(self, db):
+        # upsert/remove между SELECT и подменой индекса записываются и применяются
+        # поверх нового снимка, иначе они пропали бы до следующей перезагрузки
+        with self._lock:
+            if self._warming == 0:
+                self._changes = {}
+            self._warming += 1
+        try:
+            rows = db.execute(select(Users.id, Users.first_name, Users.last_name, Users.email,
+                                     Users.avatar_path)).all()
+            users = {row.id: IndexedUser(*row) for row in rows}
+            user_keys = {user_id: _keys(user) for user_id, user in users.items()}
+            entries = sorted((key, user_id) for user_id, keys in user_keys.items() for key in keys)
+            with self._lock:
+                self._users, self._user_keys, self._entries = users, user_keys, entries
+                for user_id, user in self._changes.items():
+                    self._remove(user_id)
+                    if user is not None:
+                        self._add(user)
+                self._loaded_at = time.monotonic()
+        finally:
+            with self._lock:
+                self._warming -= 1
+                if self._warming == 0:
+                    self._changes = None
+
+    def ensure_fresh(self, db) -> Optional[threading.Thread]:
+        """Первая загрузка — синхронно через db; устаревший индекс перезагружается в фоне.
+
+        Возвращает поток перезагрузки, если он был запущен этим вызовом.
+        """
+        if self.is_fresh:
+            return None
+        if self._loaded_at is None:
+            self.warm(db)
+            return None
+        with self._lock:
+            if self._refreshing:
+                return None
+            self._refreshing = True
+        thread = threading.Thread(target=self._refresh, name='user-prefix-index-refresh', daemon=True)
+        thread.start()
+        return thread
+
+    def _refresh(self):
+        uow = self.uow_factory()
+        try:
+            self.warm(uow.session)
+        except Exception as e:
+            print(f"Error refreshing user prefix index: {e}")
+        finally:
+            uow.close()
+            with self._lock:
+                self._refreshing = False
+
+    def upsert(self, user):
+        indexed = IndexedUser(user.id, user.first_name, user.last_name, user.email, user.avatar_path)
+        with self._lock:
+            if self._changes is not None:
+                self._changes[user.id] = indexed
+            if self._loaded_at is not None:
+                self._remove(user.id)
+                self._add(indexed)
+
+    def remove(self, user_id: int):
+        with self._lock:
+            if self._changes is not None:
+                self._changes[user_id] = None
+            self._remove(user_id)
+
+    def _add(self, user: IndexedUser):
+        self._users[user.id] = user
+        self._user_keys[user.id] = _keys(user)
+        for key in self._user_keys[user.id]:
+            insort(self._entries, (key, user.id))
+
+    def _remove(self, user_id: int):
+        for key in self._user_keys.pop(user_id, ()):
+            position = bisect_left(self._entries, (key, user_id))
+            if position < len(self._entries) and self._entries[position] == (key, user_id):
+                del self._entries[position]
+        self._users.pop(user_id, None)
+
+    def search(self, term: str, limit: int = 5) -> list:
+        prefix = _normalize(term)
+        if not prefix:
+            return []
+        found = []
+        with self._lock:
+            position = bisect_left(self._entries, (prefix,))
+            while position < len(self._entries) and len(found) < limit:
+                key, user_id = self._entries[position]
+                if not key.startswith(prefix):
+                    break
+                if user_id not in found:
+                    found.append(user_id)
+                position += 1
+            return [self._users[user_id] for user_id in found]
+
+    def __len__(self):
+        return len(self._users)
+
+
+user_prefix_index = UserPrefixIndex()
@@ -1,18 +1,31 @@
-from starlette.middleware.base import BaseHTTPMiddleware
-from fastapi import Request, Response
+from fastapi import Request
+from starlette.types import ASGIApp, Scope, Receive, Send, Message
 from app.infrastructure.tranaslations import current_locale
-from app.infrastructure.database.connection import get_database_connection
-from app.models.user import Users
-from app.models.achievement import Achievement
-from app.models.enums import UserStatus, AchievementStatus
+from app.infrastructure.database.unit_of_work import UnitOfWork
 
 
-class GlobalContextMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
+class GlobalContextMiddleware:
+    """Чистый ASGI middleware: локаль, request.state для шаблонов и сессия БД на запрос.
+
+    В отличие от BaseHTTPMiddleware не создает отдельную задачу и не буферизует
+    потоковые ответы (статика, выгрузки).
+    """
+
+    SKIP_PREFIXES = ('/static', '/api')
+
+    def __init__(self, app: ASGIApp, skip_prefixes: tuple = None):
+        self.app = app
+        self.skip_prefixes = tuple(skip_prefixes if skip_prefixes is not None else self.SKIP_PREFIXES)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope['type'] != 'http' or scope['path'].startswith(self.skip_prefixes):
+            await self.app(scope, receive, send)
+            return
+
         # 1. Пытаемся получить локаль из сессии
-        try:
-            locale = request.session.get('locale', 'en')
-        except AssertionError:
+        if 'session' in scope:
+            locale = scope['session'].get('locale', 'en')
+        else:
             # Если SessionMiddleware еще не отработал (ошибка конфигурации)
             print("DEBUG: SessionMiddleware not accessible yet, defaulting to 'en'")
             locale = 'en'
@@ -20,25 +33,32 @@ class GlobalContextMiddleware(BaseHTTPMiddleware):
         # 2. Устанавливаем контекстную переменную
         token = current_locale.set(locale)
 
-        # print(f"DEBUG: Middleware set locale to: {locale} for path: {request.url.path}")
+        # Единая сессия на запрос: ее переиспользуют get_db, auth-зависимости и сервисы.
+        # Счетчики для меню заполняет context processor шаблонов (pending_counters_context)
+        # только при рендере layout; здесь — значения по умолчанию
+        uow = UnitOfWork()
+        state = scope.setdefault('state', {})
+        state['uow'] = uow
+        state['app_name'] = "Sirius Achievements"
+        state['pending_users_count'] = 0
+        state['pending_achievements_count'] = 0
 
-        db_conn = get_database_connection()
-        db = db_conn.get_session()
+        async def send_wrapper(message: Message):
+            if message['type'] == 'http.response.start':
+                # Фиксируем транзакцию до того, как клиент получит ответ
+                if message['status'] < 400:
+                    uow.commit()
+                else:
+                    uow.rollback()
+            await send(message)
 
         try:
-            # Получаем счетчики для меню
-            pending_users = db.query(Users).filter(Users.status == UserStatus.PENDING).count()
-            pending_achievements = db.query(Achievement).filter(Achievement.status == AchievementStatus.PENDING).count()
-
-            request.state.app_name = "Sirius Achievements"
-            request.state.pending_users_count = pending_users
-            request.state.pending_achievements_count = pending_achievements
-
-            response = await call_next(request)
-            return response
-
+            await self.app(scope, receive, send_wrapper)
+        except Exception:
+            uow.rollback()
+            raise
         finally:
-            db.close()
+            uow.close()
             # 3. Сбрасываем контекст
             current_locale.reset(token)
 
@@ -50,4 +70,4 @@ async def auth(request: Request):
             raise HTTPException(status_code=401, detail="Unauthorized")
 
         from fastapi.responses import RedirectResponse
-        raise HTTPException(status_code=302, headers={"Location": "/admin/login"})
\ No newline at end of file
+        raise HTTPException(status_code=302, headers={"Location": "/admin/login"})
@@ -1,8 +1,8 @@
 from fastapi import HTTPException, Request
 from app.infrastructure.jwt_handler import verify_token
 from app.infrastructure.tranaslations import TranslationManager
-from app.models.user import Users
-from app.infrastructure.database.connection import get_database_connection
+from app.infrastructure.database.unit_of_work import UnitOfWork
+from app.infrastructure.principal_cache import principal_cache
 from app.models.enums import UserRole
 
 translation_manager = TranslationManager()
@@ -17,14 +17,23 @@ def auth(request: Request):
     if not payload:
         raise HTTPException(status_code=401, detail=translation_manager.gettext('api.auth.invalid_token'))
 
-    db_connection = get_database_connection()
-    db = db_connection.get_session()
-    user_id = payload.get("sub")
-    user = db.query(Users).filter(Users.id == int(user_id)).first()
+    # Сессия открывается только при промахе кэша: у горячих запросов ноль обращений к БД
+    uow = getattr(request.state, 'uow', None)
+    own_uow = None
+    if uow is None:
+        uow = own_uow = UnitOfWork()
+    try:
+        user = principal_cache.get(int(payload.get("sub")), lambda: uow.session)
+    finally:
+        if own_uow is not None:
+            own_uow.close()
+
     if not user:
         raise HTTPException(status_code=401, detail=translation_manager.gettext('api.auth.user_not_found'))
+    if not user.is_allowed:
+        raise HTTPException(status_code=401, detail=translation_manager.gettext('api.auth.user_inactive'))
 
     request.state.user = user
     request.state.user_role = UserRole(user.role)
 
-    return user
\ No newline at end of file
+    return user
@@ -9,6 +9,8 @@ from app.models.user import Users
 from app.models.user_token import UserToken
 from app.models.page import Page
 from app.models.achievement import Achievement
+from app.models.email_outbox import EmailOutbox
+from app.models.file_blob import FileBlob
 
 target_metadata = Base.metadata
 config = context.config
@@ -0,0 +1,24 @@
+
+from alembic import op
+
+revision = 'add_achievements_search_index'
+down_revision = 'add_users_search_index'
+branch_labels = None
+depends_on = None
+
+# Выражение должно совпадать с ACHIEVEMENT_SEARCH_DOCUMENT в app/repositories/admin/achievement_search.py
+ACHIEVEMENT_SEARCH_DOCUMENT = "lower(coalesce(achievements.title, '') || ' ' || coalesce(achievements.description, ''))"
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute("CREATE INDEX IF NOT EXISTS ix_achievements_search_trgm ON achievements "
+               f"USING gin (({ACHIEVEMENT_SEARCH_DOCUMENT}) gin_trgm_ops)")
+    op.create_index(op.f('ix_achievements_user_id'), 'achievements', ['user_id'], unique=False)
+    op.create_index('ix_achievements_status_created_at', 'achievements', ['status', 'created_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_achievements_status_created_at', table_name='achievements')
+    op.drop_index(op.f('ix_achievements_user_id'), table_name='achievements')
+    op.execute("DROP INDEX IF EXISTS ix_achievements_search_trgm")
@@ -0,0 +1,62 @@
+import hashlib
+import mimetypes
+import os
+from alembic import op
+import sqlalchemy as sa
+
+revision = 'add_file_blobs'
+down_revision = 'add_email_outbox'
+branch_labels = None
+depends_on = None
+
+
+def _sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as handle:
+        for chunk in iter(lambda: handle.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def upgrade() -> None:
+    op.create_table(
+        'file_blobs',
+        sa.Column('sha256', sa.String(length=64), nullable=False),
+        sa.Column('path', sa.String(), nullable=False),
+        sa.Column('size', sa.Integer(), nullable=False),
+        sa.Column('content_type', sa.String(), nullable=True),
+        sa.Column('ref_count', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('sha256')
+    )
+    op.add_column('achievements', sa.Column('file_sha256', sa.String(length=64), nullable=True))
+    op.create_index(op.f('ix_achievements_file_sha256'), 'achievements', ['file_sha256'], unique=False)
+
+    # Бэкфилл: хешируем существующие файлы (пути относительно корня проекта, как в file_path).
+    # Одинаковые файлы начинают ссылаться на первую копию; лишние копии на диске не удаляются,
+    # их можно убрать вручную после проверки.
+    connection = op.get_bind()
+    blobs = {}
+    rows = connection.execute(sa.text("SELECT id, file_path FROM achievements WHERE file_path IS NOT NULL ORDER BY id"))
+    for achievement_id, file_path in rows.fetchall():
+        if not os.path.isfile(file_path):
+            continue
+        sha256 = _sha256(file_path)
+        blob = blobs.setdefault(sha256, {'sha256': sha256, 'path': file_path, 'size': os.path.getsize(file_path),
+                                         'content_type': mimetypes.guess_type(file_path)[0], 'ref_count': 0})
+        blob['ref_count'] += 1
+        connection.execute(sa.text("UPDATE achievements SET file_sha256 = :sha256, file_path = :path WHERE id = :id"),
+                           {'sha256': sha256, 'path': blob['path'], 'id': achievement_id})
+    if blobs:
+        connection.execute(sa.text("INSERT INTO file_blobs (sha256, path, size, content_type, ref_count, created_at) "
+                                   "VALUES (:sha256, :path, :size, :content_type, :ref_count, now())"),
+                           list(blobs.values()))
+
+    op.create_foreign_key('fk_achievements_file_sha256', 'achievements', 'file_blobs', ['file_sha256'], ['sha256'])
+
+
+def downgrade() -> None:
+    op.drop_constraint('fk_achievements_file_sha256', 'achievements', type_='foreignkey')
+    op.drop_index(op.f('ix_achievements_file_sha256'), table_name='achievements')
+    op.drop_column('achievements', 'file_sha256')
+    op.drop_table('file_blobs')
@@ -0,0 +1,20 @@
+
+from alembic import op
+
+revision = 'add_users_search_index'
+down_revision = 'add_rejection_reason'
+branch_labels = None
+depends_on = None
+
+# Выражение должно совпадать с USER_SEARCH_DOCUMENT в app/repositories/admin/user_search.py
+USER_SEARCH_DOCUMENT = ("lower(coalesce(users.first_name, '') || ' ' || coalesce(users.last_name, '') || ' ' || "
+                        "coalesce(users.email, '') || ' ' || coalesce(users.phone_number, ''))")
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute(f"CREATE INDEX IF NOT EXISTS ix_users_search_trgm ON users USING gin (({USER_SEARCH_DOCUMENT}) gin_trgm_ops)")
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_users_search_trgm")
@@ -1,22 +1,30 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Enum as SQLAlchemyEnum, DateTime
+from sqlalchemy import Column, Integer, String, ForeignKey, Enum as SQLAlchemyEnum, DateTime, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func  # Импорт func
 from app.infrastructure.database.connection import Base
 from app.models.enums import AchievementStatus
+from app.models.file_blob import FileBlob  # noqa: F401 — таблица для внешнего ключа file_sha256
 
 
 class Achievement(Base):
     __tablename__ = "achievements"
 
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"))
+    user_id = Column(Integer, ForeignKey("users.id"), index=True)
     title = Column(String)
     description = Column(String)
     file_path = Column(String)
+    # Ссылка на file_blobs: одинаковые файлы хранятся один раз (NULL — старые файлы без хеша)
+    file_sha256 = Column(String(64), ForeignKey("file_blobs.sha256"), nullable=True, index=True)
+    # Уменьшенная копия для списков; заполняется фоновым генератором превью
+    preview_path = Column(String, nullable=True)
     status = Column(SQLAlchemyEnum(AchievementStatus), default=AchievementStatus.PENDING)
     rejection_reason = Column(String, nullable=True)
 
     # Поле для сортировки
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
-    user = relationship("Users", back_populates="achievements")
\ No newline at end of file
+    user = relationship("Users", back_populates="achievements")
+
+    # Очереди модерации и архив документов фильтруются по статусу и сортируются по дате
+    __table_args__ = (Index('ix_achievements_status_created_at', 'status', 'created_at'),)
\ No newline at end of file
@@ -19,4 +19,10 @@ class AchievementStatus(str, Enum):
 
 class UserTokenType(str, Enum):
     RESET_PASSWORD = "reset_password"
-    EMAIL_VERIFICATION = "email_verification"
\ No newline at end of file
+    EMAIL_VERIFICATION = "email_verification"
+
+class EmailOutboxStatus(str, Enum):
+    PENDING = "pending"
+    SENDING = "sending"
+    SENT = "sent"
+    FAILED = "failed"
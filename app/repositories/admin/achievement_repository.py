@@ -1,13 +1,126 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session, contains_eager
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.repositories.admin.crud_repository import CrudRepository
+from app.repositories.admin.async_crud_repository import AsyncCrudRepository
+from app.repositories.admin.achievement_search import get_achievement_search, parse_status
+from app.repositories.admin.counting import TotalCount, CAPPED
+from app.repositories.admin.user_search import get_user_search
+from app.repositories.admin.filters import filter_created_between
 from app.models.achievement import Achievement
+from app.models.user import Users
+from app.models.enums import AchievementStatus
 
 
 class AchievementRepository(CrudRepository):
+    SEARCH_LIMIT = 100
+
+    # Только то, что выводит список документов, без загрузки ORM-объектов
+    DOCUMENT_COLUMNS = (Achievement.id, Achievement.title, Achievement.file_path, Achievement.status,
+                        Achievement.created_at, Achievement.user_id, Users.first_name, Users.last_name, Users.email)
+    # Карточки документов на странице профиля
+    PROFILE_ITEMS_PER_PAGE = 12
+    PROFILE_COLUMNS = (Achievement.id, Achievement.title, Achievement.file_path, Achievement.preview_path,
+                       Achievement.status, Achievement.created_at)
+
     def __init__(self, db: Session):
         super().__init__(db, Achievement)
 
+    def get_user_documents_page(self, user_id: int, cursor: str = None):
+        """Документы на странице профиля: срез по курсору и только выводимые колонки."""
+        query = self.db.query(*self.PROFILE_COLUMNS).filter(self.model.user_id == user_id)
+        return self.keyset_paginate(query, 'created_at', 'desc', cursor, limit=self.PROFILE_ITEMS_PER_PAGE)
+
+    def count_by_user(self, user_id: int) -> int:
+        return self.count_query(self.db.query(self.model.id).filter(self.model.user_id == user_id)).value
+
+    def documents_query(self, status: str = None):
+        query = self.db.query(*self.DOCUMENT_COLUMNS).outerjoin(Users, Users.id == self.model.user_id)
+        if parse_status(status):
+            query = query.filter(self.model.status == parse_status(status))
+        return query
+
+    def get_documents_page(self, status: str = None, sort_by: str = 'created_at', sort_order: str = 'desc',
+                           cursor: str = None):
+        return self.keyset_paginate(self.documents_query(status), sort_by, sort_order, cursor)
+
+    def count_documents(self, status: str = None) -> TotalCount:
+        query = self.db.query(self.model.id)
+        if parse_status(status):
+            query = query.filter(self.model.status == parse_status(status))
+        return self.count_query(query, CAPPED)
+
+    def search_documents(self, term: str, status: str = None, sort_by: str = None, sort_order: str = 'desc',
+                         limit: int = None) -> list:
+        """Ранжированные id из поискового индекса, затем только нужные шаблону колонки."""
+        term = term.strip()
+        if not term:
+            return []
+        ids = get_achievement_search(self.db).search_ids(self.db, term, status, limit or self.SEARCH_LIMIT)
+        if not ids:
+            return []
+
+        rows = self.documents_query().filter(self.model.id.in_(ids))
+        if sort_by and sort_by in self.model.__table__.columns:
+            sort_attr = self.get_sort_attr(sort_by)
+            return rows.order_by(sort_attr.asc() if sort_order == 'asc' else sort_attr.desc(), self.model.id).all()
+
+        # Без явной сортировки — порядок релевантности из индекса
+        position = {item_id: index for index, item_id in enumerate(ids)}
+        return sorted(rows.all(), key=lambda row: position[row.id])
+
+    def search_total(self, found: int, limit: int = None) -> TotalCount:
+        limit = limit or self.SEARCH_LIMIT
+        return TotalCount(limit, CAPPED, False) if found >= limit else TotalCount(found)
+
+    def set_preview(self, id: int, preview_path: str):
+        self.db.execute(update(self.model).where(self.model.id == id).values(preview_path=preview_path))
+        self.db.commit()
+
+    def without_preview(self, limit: int = None) -> list:
+        """(id, file_path) документов, для которых превью еще не построено."""
+        query = select(self.model.id, self.model.file_path).where(
+            self.model.preview_path.is_(None), self.model.file_path.isnot(None)).order_by(self.model.id)
+        return list(self.db.execute(query.limit(limit) if limit else query))
+
     def get_by_user(self, user_id: int, page: int = 1):
         query = self.db.query(self.model).filter(self.model.user_id == user_id)
         query = query.order_by(self.model.created_at.desc())
-        return self.paginate(query, {'page': page}).all()
\ No newline at end of file
+        return self.paginate(query, {'page': page}).all()
+
+    def pending_query(self, filters: dict = None):
+        """Очередь модерации: владелец подгружается тем же запросом (без N+1 в шаблоне)."""
+        query = (self.db.query(self.model)
+                 .outerjoin(Users, Users.id == self.model.user_id)
+                 .options(contains_eager(self.model.user))
+                 .filter(self.model.status == AchievementStatus.PENDING))
+
+        if filters is not None:
+            if filters.get('owner'):
+                query = get_user_search(self.db).filter(query, filters['owner'].strip())
+            query = filter_created_between(query, self.model.created_at, filters)
+        return query
+
+    def get_pending_page(self, cursor: str = None, filters: dict = None):
+        return self.keyset_paginate(self.pending_query(filters), 'created_at', 'desc', cursor)
+
+    def count_pending(self, filters: dict = None) -> TotalCount:
+        return self.count_query(self.pending_query(filters), CAPPED)
+
+
+class AsyncAchievementRepository(AsyncCrudRepository):
+    def __init__(self, db: AsyncSession):
+        super().__init__(db, Achievement)
+
+    async def get_by_user(self, user_id: int, page: int = 1):
+        query = select(self.model).filter(self.model.user_id == user_id)
+        query = query.order_by(self.model.created_at.desc())
+        result = await self.db.scalars(self.paginate(query, {'page': page}))
+        return result.all()
+
+    async def get_page_by_user(self, user_id: int, cursor: str = None):
+        query = select(self.model).filter(self.model.user_id == user_id)
+        return await self.keyset_paginate(query, 'created_at', 'desc', cursor)
+
+    async def count_by_user(self, user_id: int) -> int:
+        return await self.count(select(self.model).filter(self.model.user_id == user_id))
@@ -0,0 +1,99 @@
+from sqlalchemy import or_, case, desc, func, literal_column, select
+from app.models.achievement import Achievement
+from app.models.user import Users
+from app.models.enums import AchievementStatus
+from app.repositories.admin.sqlite_fts import SQLiteFtsIndex
+from app.repositories.admin.user_search import USER_SEARCH_DOCUMENT, like_pattern
+
+# То же выражение, что и в индексе ix_achievements_search_trgm (миграция add_achievements_search_index)
+ACHIEVEMENT_SEARCH_DOCUMENT = "lower(coalesce(achievements.title, '') || ' ' || coalesce(achievements.description, ''))"
+
+SEARCH_FIELDS = (Achievement.title, Achievement.description, Users.first_name, Users.last_name, Users.email)
+
+
+def parse_status(status):
+    try:
+        return AchievementStatus(status) if status else None
+    except ValueError:
+        return None
+
+
+class LikeAchievementSearch:
+    """Запасной вариант без индекса: ILIKE по документу и владельцу, совпадения в названии выше."""
+
+    def search_ids(self, db, term: str, status=None, limit: int = 50) -> list:
+        pattern = like_pattern(term)
+        query = (select(Achievement.id).outerjoin(Users, Users.id == Achievement.user_id)
+                 .where(or_(*(field.ilike(pattern, escape='\\') for field in SEARCH_FIELDS))))
+        if parse_status(status):
+            query = query.where(Achievement.status == parse_status(status))
+        in_title = Achievement.title.ilike(pattern, escape='\\')
+        query = query.order_by(case((in_title, 0), else_=1), desc(Achievement.id)).limit(limit)
+        return list(db.execute(query).scalars())
+
+
+class PostgresAchievementSearch(LikeAchievementSearch):
+    """pg_trgm по названию/описанию и по индексу пользователей для имени владельца."""
+
+    document = literal_column(ACHIEVEMENT_SEARCH_DOCUMENT)
+    owner = literal_column(USER_SEARCH_DOCUMENT)
+
+    def search_ids(self, db, term: str, status=None, limit: int = 50) -> list:
+        term = term.lower()
+        pattern = like_pattern(term)
+        owners = select(Users.id).where(self.owner.like(pattern, escape='\\'))
+        query = (select(Achievement.id).outerjoin(Users, Users.id == Achievement.user_id)
+                 .where(or_(self.document.like(pattern, escape='\\'), Achievement.user_id.in_(owners))))
+        if parse_status(status):
+            query = query.where(Achievement.status == parse_status(status))
+        relevance = func.greatest(func.similarity(self.document, term),
+                                  func.coalesce(func.similarity(self.owner, term), 0))
+        query = query.order_by(desc(relevance), desc(Achievement.id)).limit(limit)
+        return list(db.execute(query).scalars())
+
+
+class SQLiteAchievementSearch(LikeAchievementSearch):
+    """FTS5 (trigram) по названию, описанию и имени владельца; статус хранится в индексе без токенизации."""
+
+    MIN_TERM_LENGTH = 3
+
+    _row = ("SELECT a.id, a.title, a.description, "
+            "trim(coalesce(u.first_name, '') || ' ' || coalesce(u.last_name, '') || ' ' || coalesce(u.email, '')), "
+            "a.status FROM achievements a LEFT JOIN users u ON u.id = a.user_id")
+
+    index = SQLiteFtsIndex('achievements_fts', ddl=(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS achievements_fts USING fts5("
+        "title, description, owner, status UNINDEXED, tokenize='trigram')",
+        "CREATE TRIGGER IF NOT EXISTS achievements_fts_ai AFTER INSERT ON achievements BEGIN "
+        f"INSERT INTO achievements_fts(rowid, title, description, owner, status) {_row} WHERE a.id = new.id; END",
+        "CREATE TRIGGER IF NOT EXISTS achievements_fts_ad AFTER DELETE ON achievements BEGIN "
+        "DELETE FROM achievements_fts WHERE rowid = old.id; END",
+        "CREATE TRIGGER IF NOT EXISTS achievements_fts_au AFTER UPDATE ON achievements BEGIN "
+        "DELETE FROM achievements_fts WHERE rowid = old.id; "
+        f"INSERT INTO achievements_fts(rowid, title, description, owner, status) {_row} WHERE a.id = new.id; END",
+        # Переименование владельца меняет текст всех его документов
+        "CREATE TRIGGER IF NOT EXISTS achievements_fts_owner AFTER UPDATE OF first_name, last_name, email ON users "
+        "BEGIN DELETE FROM achievements_fts WHERE rowid IN (SELECT id FROM achievements WHERE user_id = new.id); "
+        f"INSERT INTO achievements_fts(rowid, title, description, owner, status) {_row} WHERE a.user_id = new.id; END",
+    ), rebuild=f"INSERT INTO achievements_fts(rowid, title, description, owner, status) {_row}", columns=('status',))
+
+    def search_ids(self, db, term: str, status=None, limit: int = 50) -> list:
+        if len(term) < self.MIN_TERM_LENGTH:
+            return super().search_ids(db, term, status, limit)
+        query = self.index.matches(db, term)
+        if parse_status(status):
+            # В индексе статус лежит так же, как в таблице — именем члена enum
+            query = query.where(self.index.table.c.status == parse_status(status).name)
+        query = query.order_by(self.index.table.c.rank).limit(limit)
+        return [row.rowid for row in db.execute(query)]
+
+
+_backends = {
+    'postgresql': PostgresAchievementSearch(),
+    'sqlite': SQLiteAchievementSearch(),
+}
+_default_backend = LikeAchievementSearch()
+
+
+def get_achievement_search(db):
+    return _backends.get(db.get_bind().dialect.name, _default_backend)
@@ -0,0 +1,78 @@
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from .base import AbstractRepository
+from .pagination import KeysetPage, decode_cursor, keyset_filter, keyset_order, build_page
+
+
+class AsyncCrudRepository(AbstractRepository):
+    ITEMS_PER_PAGE = 20
+
+    def __init__(self, db: AsyncSession, model):
+        self.db = db
+        self.model = model
+
+    def getDb(self) -> AsyncSession:
+        return self.db
+
+    async def find(self, id: int):
+        return await self.db.get(self.model, id)
+
+    async def get(self, filters: dict = None):
+        query = self.paginate(select(self.model), filters)
+        result = await self.db.scalars(query)
+        return result.all()
+
+    async def count(self, query=None):
+        query = query if query is not None else select(self.model)
+        return await self.db.scalar(select(func.count()).select_from(query.order_by(None).subquery()))
+
+    async def create(self, obj_in):
+        obj_data = obj_in if isinstance(obj_in, dict) else obj_in.dict()
+        db_obj = self.model(**obj_data)
+        self.db.add(db_obj)
+        await self.db.commit()
+        await self.db.refresh(db_obj)
+        return db_obj
+
+    async def update(self, id: int, obj_in):
+        db_obj = await self.find(id)
+        if isinstance(obj_in, dict):
+            update_data = obj_in
+        else:
+            update_data = obj_in.dict(exclude_unset=True)
+
+        for field, value in update_data.items():
+            setattr(db_obj, field, value)
+
+        await self.db.commit()
+        await self.db.refresh(db_obj)
+        return db_obj
+
+    async def delete(self, id: int):
+        db_obj = await self.find(id)
+        await self.db.delete(db_obj)
+        await self.db.commit()
+
+    def paginate(self, query, filters):
+        if filters is not None and 'page' in filters and filters['page'] > 0:
+            query = query.limit(self.ITEMS_PER_PAGE).offset(self.ITEMS_PER_PAGE * (filters['page'] - 1))
+        return query
+
+    async def keyset_paginate(self, query, sort_by: str = 'id', sort_order: str = 'desc', cursor: str = None,
+                              limit: int = None) -> KeysetPage:
+        limit = limit or self.ITEMS_PER_PAGE
+        sort_attr = self.get_sort_attr(sort_by)
+        descending = sort_order != 'asc'
+        decoded = decode_cursor(sort_attr, cursor)
+
+        if decoded is not None:
+            query = query.filter(keyset_filter(sort_attr, self.model.id, descending, decoded))
+        backwards = decoded is not None and decoded.direction == 'prev'
+        query = query.order_by(None).order_by(*keyset_order(sort_attr, self.model.id, descending, backwards))
+
+        result = await self.db.scalars(query.limit(limit + 1))
+        return build_page(list(result.all()), limit, sort_attr, decoded)
+
+    def get_sort_attr(self, sort_by: str):
+        column = self.model.__table__.columns.get(sort_by)
+        return getattr(self.model, sort_by) if column is not None else self.model.id
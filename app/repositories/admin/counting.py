@@ -0,0 +1,65 @@
+from typing import NamedTuple
+from sqlalchemy import select, func
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ClauseElement, Executable
+
+EXACT = 'exact'
+CAPPED = 'capped'
+ESTIMATE = 'estimate'
+STRATEGIES = (EXACT, CAPPED, ESTIMATE)
+
+
+class TotalCount(NamedTuple):
+    """Итог для счетчика в шапке списка; в шаблоне выводится как '42', '1000+' или '~12345'."""
+    value: int
+    strategy: str = EXACT
+    is_exact: bool = True
+
+    def __str__(self):
+        if self.is_exact:
+            return str(self.value)
+        return f"{self.value}+" if self.strategy == CAPPED else f"~{self.value}"
+
+
+class _Explain(Executable, ClauseElement):
+    inherit_cache = False
+
+    def __init__(self, statement):
+        self.statement = statement
+
+
+@compiles(_Explain, 'postgresql')
+def _compile_explain(element, compiler, **kw):
+    return 'EXPLAIN (FORMAT JSON) ' + compiler.process(element.statement, **kw)
+
+
+def exact_count(db, statement) -> TotalCount:
+    total = db.execute(select(func.count()).select_from(statement.order_by(None).subquery())).scalar()
+    return TotalCount(total)
+
+
+def capped_count(db, statement, cap: int) -> TotalCount:
+    # Считаем не дальше cap + 1 строки: для больших выборок достаточно «1000+»
+    limited = statement.order_by(None).limit(cap + 1).subquery()
+    total = db.execute(select(func.count()).select_from(limited)).scalar()
+    if total > cap:
+        return TotalCount(cap, CAPPED, False)
+    return TotalCount(total, CAPPED)
+
+
+def estimated_count(db, statement, cap: int) -> TotalCount:
+    # Оценка планировщика есть только в Postgres, на других БД — ограниченный подсчет
+    if db.get_bind().dialect.name != 'postgresql':
+        return capped_count(db, statement, cap)
+    plan = db.execute(_Explain(statement.order_by(None))).scalar()
+    return TotalCount(int(plan[0]['Plan']['Plan Rows']), ESTIMATE, False)
+
+
+def count_rows(db, statement, strategy: str = EXACT, cap: int = 1000) -> TotalCount:
+    # ORM Query -> Select, чтобы все стратегии работали с одним типом
+    statement = getattr(statement, 'statement', statement)
+    if strategy == CAPPED:
+        return capped_count(db, statement, cap)
+    if strategy == ESTIMATE:
+        return estimated_count(db, statement, cap)
+    return exact_count(db, statement)
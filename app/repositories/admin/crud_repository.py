@@ -1,9 +1,13 @@
+from sqlalchemy import select, update
 from sqlalchemy.orm import Session
 from .base import AbstractRepository
+from .pagination import KeysetPage, decode_cursor, keyset_filter, keyset_order, build_page
+from .counting import TotalCount, count_rows, EXACT
 
 
 class CrudRepository(AbstractRepository):
     ITEMS_PER_PAGE = 20
+    COUNT_CAP = 1000
 
     def __init__(self, db: Session, model):
         self.db = db
@@ -47,7 +51,63 @@ class CrudRepository(AbstractRepository):
         self.db.delete(db_obj)
         self.db.commit()
 
+    def bulk_update(self, ids, values: dict, *conditions, returning: tuple = ()) -> list:
+        """Один UPDATE ... WHERE id IN (...) для пачки записей.
+
+        Возвращает строки (id, *returning) реально обновленных записей; записи,
+        не прошедшие conditions, не меняются.
+        """
+        ids = sorted(set(ids))
+        if not ids:
+            return []
+        columns = (self.model.id, *returning)
+        where = (self.model.id.in_(ids), *conditions)
+
+        if self.db.get_bind().dialect.update_returning:
+            rows = self.db.execute(update(self.model).where(*where).values(values).returning(*columns)).all()
+        else:
+            # Без UPDATE ... RETURNING (MySQL): блокируем подходящие строки и обновляем их
+            rows = self.db.execute(select(*columns).where(*where).with_for_update()).all()
+            if rows:
+                self.db.execute(update(self.model).where(self.model.id.in_([row.id for row in rows])).values(values))
+        self.db.commit()
+        return rows
+
+    def bulk_results(self, ids, rows) -> dict:
+        """Итог по каждому id: updated, skipped (запись есть, но не подошла под условие) или not_found."""
+        updated = {row.id for row in rows}
+        missing = set(ids) - updated
+        existing = set()
+        if missing:
+            existing = set(self.db.execute(select(self.model.id).where(self.model.id.in_(missing))).scalars())
+        return {item_id: 'updated' if item_id in updated else 'skipped' if item_id in existing else 'not_found'
+                for item_id in sorted(set(ids))}
+
     def paginate(self, items, filters):
         if filters is not None and 'page' in filters and filters['page'] > 0:
             items = items.limit(self.ITEMS_PER_PAGE).offset(self.ITEMS_PER_PAGE * (filters['page'] - 1))
-        return items
\ No newline at end of file
+        return items
+
+    def count_query(self, items, strategy: str = EXACT) -> TotalCount:
+        """Количество строк выборки: exact, capped (не дальше COUNT_CAP) или estimate (планировщик Postgres)."""
+        return count_rows(self.db, items, strategy, self.COUNT_CAP)
+
+    def keyset_paginate(self, items, sort_by: str = 'id', sort_order: str = 'desc', cursor: str = None,
+                        limit: int = None) -> KeysetPage:
+        """Постраничный вывод по курсору (sort column, id) вместо LIMIT/OFFSET."""
+        limit = limit or self.ITEMS_PER_PAGE
+        sort_attr = self.get_sort_attr(sort_by)
+        descending = sort_order != 'asc'
+        decoded = decode_cursor(sort_attr, cursor)
+
+        if decoded is not None:
+            items = items.filter(keyset_filter(sort_attr, self.model.id, descending, decoded))
+        backwards = decoded is not None and decoded.direction == 'prev'
+        items = items.order_by(None).order_by(*keyset_order(sort_attr, self.model.id, descending, backwards))
+
+        return build_page(items.limit(limit + 1).all(), limit, sort_attr, decoded)
+
+    def get_sort_attr(self, sort_by: str):
+        # Сортировать можно только по колонкам модели
+        column = self.model.__table__.columns.get(sort_by)
+        return getattr(self.model, sort_by) if column is not None else self.model.id
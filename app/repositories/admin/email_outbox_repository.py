@@ -0,0 +1,71 @@
+from datetime import datetime, timedelta
+from sqlalchemy import select, update, func
+from sqlalchemy.orm import Session
+from app.models.email_outbox import EmailOutbox
+from app.models.enums import EmailOutboxStatus
+
+
+class EmailOutboxRepository:
+    def __init__(self, db: Session):
+        self.db = db
+        self.model = EmailOutbox
+
+    def enqueue(self, to: str, subject: str, body: str, commit: bool = True) -> EmailOutbox:
+        db_obj = self.model(to=to, subject=subject, body=body, status=EmailOutboxStatus.PENDING,
+                            attempts=0, next_attempt_at=datetime.utcnow())
+        self.db.add(db_obj)
+        if commit:
+            self.db.commit()
+        return db_obj
+
+    def claim(self, limit: int, lease_seconds: float) -> list:
+        """Забирает пачку писем к отправке.
+
+        Письмо переводится в SENDING до now + lease_seconds: если воркер упадет,
+        по истечении аренды его заберет другой. На Postgres строки блокируются
+        через SKIP LOCKED, поэтому несколько воркеров не делят одну пачку.
+        """
+        now = datetime.utcnow()
+        due = (self.model.status.in_([EmailOutboxStatus.PENDING, EmailOutboxStatus.SENDING])
+               & (self.model.next_attempt_at <= now))
+        ids = list(self.db.execute(
+            select(self.model.id).where(due).order_by(self.model.next_attempt_at, self.model.id)
+            .limit(limit).with_for_update(skip_locked=True)
+        ).scalars())
+        if not ids:
+            self.db.commit()
+            return []
+
+        self.db.execute(
+            update(self.model).where(self.model.id.in_(ids), due)
+            .values(status=EmailOutboxStatus.SENDING, next_attempt_at=now + timedelta(seconds=lease_seconds),
+                    attempts=self.model.attempts + 1)
+        )
+        self.db.commit()
+        return list(self.db.execute(
+            select(self.model.id, self.model.to, self.model.subject, self.model.body, self.model.attempts)
+            .where(self.model.id.in_(ids), self.model.status == EmailOutboxStatus.SENDING)
+        ))
+
+    def mark_sent(self, ids: list):
+        # Тело письма (ссылки со сбросом пароля) после отправки не храним
+        if ids:
+            self.db.execute(update(self.model).where(self.model.id.in_(ids))
+                            .values(status=EmailOutboxStatus.SENT, sent_at=datetime.utcnow(), last_error=None,
+                                    body=''))
+            self.db.commit()
+
+    def mark_failed(self, id: int, error: str, retry_in: float = None):
+        """retry_in=None — попытки исчерпаны, письмо остается FAILED для разбора вручную."""
+        values = {'last_error': error[:2000]}
+        if retry_in is None:
+            values.update(status=EmailOutboxStatus.FAILED, body='')
+        else:
+            values.update(status=EmailOutboxStatus.PENDING,
+                          next_attempt_at=datetime.utcnow() + timedelta(seconds=retry_in))
+        self.db.execute(update(self.model).where(self.model.id == id).values(**values))
+        self.db.commit()
+
+    def count_by_status(self) -> dict:
+        rows = self.db.execute(select(self.model.status, func.count()).group_by(self.model.status))
+        return {status.value: count for status, count in rows}
@@ -0,0 +1,75 @@
+from typing import Optional
+from sqlalchemy import update, delete, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.models.file_blob import FileBlob
+from app.infrastructure.uploads import PendingUpload
+
+
+class FileBlobRepository:
+    """Хранилище по содержимому: один файл на SHA-256, ссылки считаются в file_blobs.ref_count.
+
+    Методы не коммитят — изменение счетчика попадает в транзакцию записи,
+    которая ссылается на файл (создание или удаление документа).
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.model = FileBlob
+
+    def acquire(self, upload: PendingUpload) -> tuple:
+        """Возвращает (blob, created) для загруженного файла, увеличив число ссылок.
+
+        Если такой файл уже есть, загрузка отбрасывается без записи в хранилище
+        (файлы до UPLOAD_SPOOL_SIZE до этого момента лежат только в памяти). created=True —
+        файл и запись созданы этим вызовом; при откате транзакции файл нужно удалить.
+        """
+        sha256 = upload.sha256
+        # Проверка файла в хранилище (в S3 — HEAD-запрос) идет до блокировки строки,
+        # чтобы не держать блокировку на время сетевого запроса
+        blob = self.db.get(self.model, sha256)
+        restore = blob is not None
+        if blob is not None and upload.storage.exists(blob.path):
+            blob = self._lock(sha256)
+            if blob is not None:
+                blob.ref_count += 1
+                upload.discard()
+                return blob, False
+            # Последнюю ссылку успели снять и запись удалили — загружаем заново
+            restore = False
+
+        stored = upload.commit(f"{sha256}.{upload.extension}")
+        blob = self._lock(sha256)
+        if blob is not None:
+            if restore:
+                # Запись осталась, а файл пропал — восстанавливаем из новой загрузки
+                blob.path = stored.path
+            blob.ref_count += 1
+            return blob, False
+
+        blob = self.model(sha256=sha256, path=stored.path, size=stored.size, content_type=stored.content_type,
+                          ref_count=1)
+        try:
+            with self.db.begin_nested():
+                self.db.add(blob)
+        except IntegrityError:
+            # Тот же файл параллельно загрузил кто-то еще — просто добавляем ссылку
+            blob = self._lock(sha256)
+            blob.ref_count += 1
+            return blob, False
+        return blob, True
+
+    def _lock(self, sha256: str) -> Optional[FileBlob]:
+        return self.db.get(self.model, sha256, with_for_update=True, populate_existing=True)
+
+    def release(self, sha256: str) -> Optional[str]:
+        """Снимает одну ссылку. Если она была последней, удаляет запись и возвращает путь файла —
+        его нужно удалить после коммита."""
+        self.db.execute(update(self.model).where(self.model.sha256 == sha256)
+                        .values(ref_count=self.model.ref_count - 1))
+        path = self.db.execute(
+            select(self.model.path).where(self.model.sha256 == sha256, self.model.ref_count <= 0)
+        ).scalar()
+        if path is not None:
+            self.db.execute(delete(self.model).where(self.model.sha256 == sha256))
+        return path
@@ -0,0 +1,23 @@
+from datetime import date, datetime, time, timedelta
+from typing import Optional
+
+
+def parse_date(value) -> Optional[date]:
+    """Дата из query-параметра (YYYY-MM-DD); пустое или битое значение — без фильтра."""
+    if isinstance(value, date):
+        return value
+    try:
+        return date.fromisoformat(value) if value else None
+    except ValueError:
+        return None
+
+
+def filter_created_between(query, column, filters: dict):
+    """Диапазон дат включительно: date_from <= column < date_to + 1 день (индекс по колонке работает)."""
+    date_from = parse_date(filters.get('date_from'))
+    date_to = parse_date(filters.get('date_to'))
+    if date_from:
+        query = query.filter(column >= datetime.combine(date_from, time.min))
+    if date_to:
+        query = query.filter(column < datetime.combine(date_to + timedelta(days=1), time.min))
+    return query
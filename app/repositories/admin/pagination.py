@@ -0,0 +1,124 @@
+import base64
+import binascii
+import enum
+import json
+from datetime import datetime, date
+from typing import Any, List, NamedTuple, Optional
+from sqlalchemy import and_, or_, asc, desc
+
+NEXT = 'next'
+PREV = 'prev'
+
+
+class KeysetPage(NamedTuple):
+    items: List[Any]
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
+
+
+class Cursor(NamedTuple):
+    value: Any
+    id: int
+    direction: str
+
+
+def _dump_value(value):
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def _load_value(column, value):
+    if value is None:
+        return None
+    column_type = column.type
+    enum_class = getattr(column_type, 'enum_class', None)
+    if enum_class is not None:
+        return enum_class(value)
+    python_type = column_type.python_type
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    if python_type is date:
+        return date.fromisoformat(value)
+    return python_type(value)
+
+
+def encode_cursor(sort_attr, item, direction: str) -> str:
+    payload = [_dump_value(getattr(item, sort_attr.key)), item.id, direction]
+    raw = json.dumps(payload, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(sort_attr, cursor: Optional[str]) -> Optional[Cursor]:
+    """Разбирает курсор; битый или чужой курсор означает первую страницу."""
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        value, item_id, direction = json.loads(raw)
+        if direction not in (NEXT, PREV):
+            return None
+        return Cursor(_load_value(sort_attr, value), int(item_id), direction)
+    except (ValueError, TypeError, KeyError, binascii.Error):
+        return None
+
+
+def _is_nullable(sort_attr) -> bool:
+    column = sort_attr.property.columns[0]
+    return bool(column.nullable) and not column.primary_key
+
+
+def keyset_order(sort_attr, key_attr, descending: bool, backwards: bool = False) -> list:
+    """ORDER BY (sort, id) в порядке просмотра; NULL-значения всегда в конце списка."""
+    scan_desc = descending != backwards
+    direction = desc if scan_desc else asc
+    order = []
+    if _is_nullable(sort_attr):
+        order.append(desc(sort_attr.is_(None)) if backwards else asc(sort_attr.is_(None)))
+    if sort_attr is not key_attr:
+        order.append(direction(sort_attr))
+    order.append(direction(key_attr))
+    return order
+
+
+def keyset_filter(sort_attr, key_attr, descending: bool, cursor: Cursor):
+    """Условие «строго после» (next) или «строго перед» (prev) курсором в порядке просмотра."""
+    forward = cursor.direction == NEXT
+    scan_desc = descending == forward
+
+    def beyond(attr, value):
+        return attr < value if scan_desc else attr > value
+
+    if sort_attr is key_attr:
+        return beyond(key_attr, cursor.id)
+
+    nullable = _is_nullable(sort_attr)
+    if cursor.value is None:
+        after_null = and_(sort_attr.is_(None), beyond(key_attr, cursor.id))
+        return after_null if forward else or_(sort_attr.isnot(None), after_null)
+
+    after_value = or_(beyond(sort_attr, cursor.value),
+                      and_(sort_attr == cursor.value, beyond(key_attr, cursor.id)))
+    if not nullable:
+        return after_value
+    return or_(sort_attr.is_(None), after_value) if forward else and_(sort_attr.isnot(None), after_value)
+
+
+def build_page(rows: list, limit: int, sort_attr, cursor: Optional[Cursor]) -> KeysetPage:
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    backwards = cursor is not None and cursor.direction == PREV
+    if backwards:
+        rows.reverse()
+    if not rows:
+        return KeysetPage(rows)
+
+    has_next = has_more if not backwards else True
+    has_prev = cursor is not None if not backwards else has_more
+    return KeysetPage(
+        rows,
+        next_cursor=encode_cursor(sort_attr, rows[-1], NEXT) if has_next else None,
+        prev_cursor=encode_cursor(sort_attr, rows[0], PREV) if has_prev else None,
+    )
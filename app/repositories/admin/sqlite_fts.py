@@ -0,0 +1,38 @@
+import threading
+from sqlalchemy import literal_column, select, table, column, text
+
+
+class SQLiteFtsIndex:
+    """FTS5-таблица рядом с основной: создается при первом обращении и заполняется из rebuild."""
+
+    def __init__(self, name: str, ddl: tuple, rebuild: str, columns: tuple = ()):
+        self.name = name
+        self.ddl = ddl
+        self.rebuild = rebuild
+        self.table = table(name, column('rowid'), column('rank'), *(column(field) for field in columns))
+        self._ready = set()
+        self._lock = threading.Lock()
+
+    def ensure(self, db):
+        """Создает таблицу и триггеры для уже существующей базы и заполняет индекс."""
+        engine = db.get_bind().engine
+        if engine in self._ready:
+            return
+        with self._lock:
+            if engine in self._ready:
+                return
+            with engine.begin() as connection:
+                exists = connection.execute(
+                    text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"), {'name': self.name}
+                ).first()
+                for statement in self.ddl:
+                    connection.execute(text(statement))
+                if not exists:
+                    connection.execute(text(self.rebuild))
+            self._ready.add(engine)
+
+    def matches(self, db, term: str):
+        """Подзапрос (rowid, rank) по фразе; rank — bm25, чем меньше, тем релевантнее."""
+        self.ensure(db)
+        phrase = '"' + term.replace('"', '""') + '"'
+        return select(self.table.c.rowid, self.table.c.rank).where(literal_column(self.name).op('MATCH')(phrase))
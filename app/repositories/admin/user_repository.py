@@ -1,8 +1,21 @@
+import os
 from app.models.user import Users
 from app.repositories.admin.crud_repository import CrudRepository
+from app.repositories.admin.counting import TotalCount, CAPPED
+from app.repositories.admin.filters import filter_created_between
+from app.repositories.admin.user_search import get_user_search
 from sqlalchemy.orm import Session
-from sqlalchemy import or_, desc, asc  # <-- Добавили импорты
+from sqlalchemy import desc, asc, insert, select  # <-- Добавили импорты
+from sqlalchemy.dialects.postgresql import insert as postgres_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from app.schemas.admin.users import UserCreate
+from app.models.enums import UserStatus
+from app.infrastructure.ttl_cache import TTLCache
+from app.infrastructure.user_prefix_index import user_prefix_index
+from app.infrastructure.principal_cache import principal_cache
+
+# Общее число пользователей без фильтров (ключ — стратегия подсчета)
+users_count_cache = TTLCache(ttl=float(os.getenv('USERS_COUNT_CACHE_TTL', 60)), maxsize=8)
 
 
 class UserRepository(CrudRepository):
@@ -11,25 +24,7 @@ class UserRepository(CrudRepository):
 
     # Обновленный метод с сортировкой
     def get(self, filters: dict = None, sort_by: str = 'id', sort_order: str = 'desc'):
-        users = self.db.query(self.model)
-
-        if filters is not None:
-            if 'query' in filters and filters['query'] != '':
-                like_term = f"%{filters['query']}%"
-                users = users.filter(
-                    or_(
-                        self.model.first_name.ilike(like_term),
-                        self.model.last_name.ilike(like_term),
-                        self.model.email.ilike(like_term),
-                        self.model.phone_number.ilike(like_term),
-                    )
-                )
-
-            if 'role' in filters and filters['role']:
-                users = users.filter(self.model.role == filters['role'])
-
-            if 'status' in filters and filters['status']:
-                users = users.filter(self.model.status == filters['status'])
+        users = self.filtered_query(filters)
 
         # --- ЛОГИКА СОРТИРОВКИ ---
         # Проверяем, есть ли такое поле в модели, чтобы избежать ошибок
@@ -48,14 +43,103 @@ class UserRepository(CrudRepository):
 
         return users.all()
 
+    def count(self, filters: dict = None, strategy: str = None) -> TotalCount:
+        """Количество пользователей по тем же фильтрам, что и у списка."""
+        strategy = strategy or os.getenv('USERS_COUNT_STRATEGY', 'capped')
+        if self.has_filters(filters):
+            return self.count_query(self.filtered_query(filters), strategy)
+        return users_count_cache.get_or_set(strategy, lambda: self.count_query(self.filtered_query(), strategy))
+
+    @staticmethod
+    def has_filters(filters: dict = None) -> bool:
+        return bool(filters) and any(filters.get(name) for name in ('query', 'role', 'status', 'date_from', 'date_to'))
+
+    @staticmethod
+    def invalidate_counts():
+        users_count_cache.clear()
+
+    def search(self, term: str, limit: int = 5):
+        """Поиск для автодополнения: сначала префиксный индекс в памяти, затем индексный бэкенд БД."""
+        term = term.strip()
+        if not term:
+            return []
+        user_prefix_index.ensure_fresh(self.db)
+        found = user_prefix_index.search(term, limit)
+        if found:
+            return found
+        # Подстрока в середине слова или пользователь, добавленный другим воркером
+        return get_user_search(self.db).ranked(self.db.query(self.model), term).limit(limit).all()
+
+    def get_page(self, filters: dict = None, sort_by: str = 'id', sort_order: str = 'desc', cursor: str = None):
+        return self.keyset_paginate(self.filtered_query(filters), sort_by, sort_order, cursor)
+
+    def get_pending_page(self, cursor: str = None, filters: dict = None):
+        return self.get_page({**(filters or {}), 'status': UserStatus.PENDING}, 'created_at', 'desc', cursor)
+
+    def count_pending(self, filters: dict = None) -> TotalCount:
+        return self.count_query(self.filtered_query({**(filters or {}), 'status': UserStatus.PENDING}), CAPPED)
+
+    def filtered_query(self, filters: dict = None):
+        users = self.db.query(self.model)
+
+        if filters is not None:
+            if 'query' in filters and filters['query']:
+                users = get_user_search(self.db).filter(users, filters['query'].strip())
+
+            if 'role' in filters and filters['role']:
+                users = users.filter(self.model.role == filters['role'])
+
+            if 'status' in filters and filters['status']:
+                users = users.filter(self.model.status == filters['status'])
+
+            users = filter_created_between(users, self.model.created_at, filters)
+
+        return users
+
     def create(self, obj_in: UserCreate):
         user_dict = obj_in.model_dump(exclude={"password"})
         db_obj = self.model(**user_dict)
         self.db.add(db_obj)
         self.db.commit()
         self.db.refresh(db_obj)
+        self.invalidate_counts()
+        user_prefix_index.upsert(db_obj)
+        return db_obj
+
+    def update(self, id: int, obj_in):
+        db_obj = super().update(id, obj_in)
+        user_prefix_index.upsert(db_obj)
+        principal_cache.invalidate(id)
         return db_obj
 
+    def existing_emails(self, emails: list) -> set:
+        if not emails:
+            return set()
+        return set(self.db.execute(select(self.model.email).where(self.model.email.in_(emails))).scalars())
+
+    def bulk_insert_ignore_existing(self, values: list) -> list:
+        """Многострочный INSERT; строки с уже занятым email пропускаются. Возвращает (id, email) созданных."""
+        if not values:
+            return []
+        dialect = self.db.get_bind().dialect.name
+        if dialect in ('postgresql', 'sqlite'):
+            insert_for = postgres_insert if dialect == 'postgresql' else sqlite_insert
+            statement = (insert_for(self.model).values(values)
+                         .on_conflict_do_nothing(index_elements=[self.model.email])
+                         .returning(self.model.id, self.model.email))
+            rows = self.db.execute(statement).all()
+        else:
+            taken = self.existing_emails([item['email'] for item in values])
+            fresh = [item for item in values if item['email'] not in taken]
+            if fresh:
+                self.db.execute(insert(self.model).values(fresh))
+            rows = self.db.execute(select(self.model.id, self.model.email).where(
+                self.model.email.in_([item['email'] for item in fresh]))).all() if fresh else []
+        self.db.commit()
+        if rows:
+            self.invalidate_counts()
+        return rows
+
     def update_password(self, id: int, password: str):
         db_obj = self.db.query(Users).filter(Users.id == id).first()
         db_obj.hashed_password = password
@@ -67,5 +151,8 @@ class UserRepository(CrudRepository):
         if db_obj:
             self.db.delete(db_obj)
             self.db.commit()
+            self.invalidate_counts()
+            user_prefix_index.remove(id)
+            principal_cache.invalidate(id)
             return True
         return False
\ No newline at end of file
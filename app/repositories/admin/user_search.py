@@ -0,0 +1,86 @@
+from sqlalchemy import or_, case, desc, func, literal_column
+from app.models.user import Users
+from app.repositories.admin.sqlite_fts import SQLiteFtsIndex
+
+SEARCH_FIELDS = (Users.first_name, Users.last_name, Users.email, Users.phone_number)
+
+# То же выражение, что и в индексе ix_users_search_trgm (миграция add_users_search_index):
+# планировщик использует индекс, только если текст выражения совпадает
+USER_SEARCH_DOCUMENT = ("lower(coalesce(users.first_name, '') || ' ' || coalesce(users.last_name, '') || ' ' || "
+                        "coalesce(users.email, '') || ' ' || coalesce(users.phone_number, ''))")
+
+
+def like_pattern(term: str) -> str:
+    escaped = term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    return f"%{escaped}%"
+
+
+class LikeUserSearch:
+    """Запасной вариант без индекса: ILIKE по всем полям, совпадения с начала слова выше."""
+
+    def filter(self, query, term: str):
+        pattern = like_pattern(term)
+        return query.filter(or_(*(field.ilike(pattern, escape='\\') for field in SEARCH_FIELDS)))
+
+    def ranked(self, query, term: str):
+        prefix = like_pattern(term)[1:]
+        starts_with = or_(*(field.ilike(prefix, escape='\\') for field in SEARCH_FIELDS))
+        return self.filter(query, term).order_by(case((starts_with, 0), else_=1), Users.id)
+
+
+class PostgresUserSearch(LikeUserSearch):
+    """pg_trgm: подстрочный поиск по GIN-индексу, ранжирование по similarity()."""
+
+    document = literal_column(USER_SEARCH_DOCUMENT)
+
+    def filter(self, query, term: str):
+        return query.filter(self.document.like(like_pattern(term.lower()), escape='\\'))
+
+    def ranked(self, query, term: str):
+        return self.filter(query, term).order_by(desc(func.similarity(self.document, term.lower())), Users.id)
+
+
+class SQLiteUserSearch(LikeUserSearch):
+    """FTS5 с токенизатором trigram; таблица users_fts синхронизируется триггерами."""
+
+    # trigram находит подстроки не короче трех символов
+    MIN_TERM_LENGTH = 3
+
+    index = SQLiteFtsIndex('users_fts', ddl=(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS users_fts USING fts5("
+        "first_name, last_name, email, phone_number, content='users', content_rowid='id', tokenize='trigram')",
+        "CREATE TRIGGER IF NOT EXISTS users_fts_ai AFTER INSERT ON users BEGIN "
+        "INSERT INTO users_fts(rowid, first_name, last_name, email, phone_number) "
+        "VALUES (new.id, new.first_name, new.last_name, new.email, new.phone_number); END",
+        "CREATE TRIGGER IF NOT EXISTS users_fts_ad AFTER DELETE ON users BEGIN "
+        "INSERT INTO users_fts(users_fts, rowid, first_name, last_name, email, phone_number) "
+        "VALUES ('delete', old.id, old.first_name, old.last_name, old.email, old.phone_number); END",
+        "CREATE TRIGGER IF NOT EXISTS users_fts_au AFTER UPDATE ON users BEGIN "
+        "INSERT INTO users_fts(users_fts, rowid, first_name, last_name, email, phone_number) "
+        "VALUES ('delete', old.id, old.first_name, old.last_name, old.email, old.phone_number); "
+        "INSERT INTO users_fts(rowid, first_name, last_name, email, phone_number) "
+        "VALUES (new.id, new.first_name, new.last_name, new.email, new.phone_number); END",
+    ), rebuild="INSERT INTO users_fts(users_fts) VALUES ('rebuild')")
+
+    def filter(self, query, term: str):
+        if len(term) < self.MIN_TERM_LENGTH:
+            return super().filter(query, term)
+        matches = self.index.matches(query.session, term).subquery('user_matches')
+        return query.join(matches, Users.id == matches.c.rowid)
+
+    def ranked(self, query, term: str):
+        if len(term) < self.MIN_TERM_LENGTH:
+            return super().ranked(query, term)
+        matches = self.index.matches(query.session, term).subquery('user_matches')
+        return query.join(matches, Users.id == matches.c.rowid).order_by(matches.c.rank, Users.id)
+
+
+_backends = {
+    'postgresql': PostgresUserSearch(),
+    'sqlite': SQLiteUserSearch(),
+}
+_default_backend = LikeUserSearch()
+
+
+def get_user_search(db):
+    return _backends.get(db.get_bind().dialect.name, _default_backend)
@@ -1,12 +1,15 @@
-from fastapi import Request, Depends, Form, UploadFile, File
+from fastapi import Request, Depends
 from fastapi.responses import HTMLResponse, RedirectResponse
+from typing import Optional
 from sqlalchemy.orm import Session
-from app.routers.admin.admin import guard_router, templates, get_db
-from app.repositories.admin.achievement_repository import AchievementRepository
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+from app.routers.admin.admin import guard_router, templates, get_db, get_async_db
+from app.repositories.admin.achievement_repository import AchievementRepository, AsyncAchievementRepository
 from app.services.admin.achievement_service import AchievementService
 from app.schemas.admin.achievements import AchievementCreate
-from app.models.achievement import Achievement
 from app.infrastructure.tranaslations import TranslationManager
+from app.infrastructure.uploads import receive_upload, UploadRejected, ACHIEVEMENT_UPLOADS
 
 router = guard_router
 
@@ -15,14 +18,19 @@ def get_service(db: Session = Depends(get_db)):
     return AchievementService(AchievementRepository(db))
 
 
+def get_async_repository(db: AsyncSession = Depends(get_async_db)):
+    return AsyncAchievementRepository(db)
+
+
 @router.get('/achievements', response_class=HTMLResponse, name="admin.achievements.index")
-async def index(request: Request, page: int = 1, service: AchievementService = Depends(get_service),
-                db: Session = Depends(get_db)):
+async def index(request: Request, cursor: Optional[str] = None,
+                repo: AsyncAchievementRepository = Depends(get_async_repository)):
     current_user_id = request.session['auth_id']
-    achievements = service.get_user_achievements(current_user_id, page)
-    total_count = db.query(Achievement).filter(Achievement.user_id == current_user_id).count()
+    page = await repo.get_page_by_user(current_user_id, cursor)
+    total_count = await repo.count_by_user(current_user_id)
     return templates.TemplateResponse('achievements/index.html',
-                                      {'request': request, 'achievements': achievements, 'total_count': total_count})
+                                      {'request': request, 'achievements': page.items, 'page': page,
+                                       'total_count': total_count})
 
 
 @router.get('/achievements/create', response_class=HTMLResponse, name='admin.achievements.create')
@@ -31,12 +39,17 @@ async def create(request: Request):
 
 
 @router.post('/achievements', response_class=HTMLResponse, name='admin.achievements.store')
-async def store(request: Request, title: str = Form(...), description: str = Form(None), file: UploadFile = File(...),
-                service: AchievementService = Depends(get_service)):
+async def store(request: Request, service: AchievementService = Depends(get_service)):
+    form = None
     try:
         user_id = request.session['auth_id']
-        achievement_data = AchievementCreate(title=title, description=description)
-        service.create(user_id, achievement_data, file)
+        # Файл пишется на диск потоком, без промежуточного SpooledTemporaryFile
+        form = await receive_upload(request, ACHIEVEMENT_UPLOADS)
+        if 'file' not in form.files:
+            raise UploadRejected("File is required.")
+        achievement_data = AchievementCreate(title=form.fields.get('title'), description=form.fields.get('description'))
+        # Запись в хранилище (в S3 — сетевые запросы boto3) идет вне event loop
+        await run_in_threadpool(service.create, user_id, achievement_data, form.files['file'])
 
         translator = TranslationManager()
         url = request.url_for('admin.achievements.index').include_query_params(
@@ -45,13 +58,16 @@ async def store(request: Request, title: str = Form(...), description: str = For
     except Exception as e:
         return templates.TemplateResponse('achievements/create.html',
                                           {'request': request, 'error_msg': f"Error uploading: {str(e)}"})
+    finally:
+        if form is not None:
+            form.discard()
 
 
 @router.post('/achievements/{id}/delete', name='admin.achievements.delete')
 async def delete(id: int, request: Request, service: AchievementService = Depends(get_service)):
     user_id = request.session['auth_id']
     user_role = request.session.get('auth_role', 'guest')
-    service.delete(id, user_id, user_role)
+    await run_in_threadpool(service.delete, id, user_id, user_role)
 
     translator = TranslationManager()
     url = request.url_for('admin.achievements.index').include_query_params(
@@ -3,22 +3,27 @@ from fastapi.responses import RedirectResponse
 from fastapi.templating import Jinja2Templates
 from app.middlewares.admin_middleware import auth
 from app.infrastructure.database.connection import get_database_connection
+from app.infrastructure.database.unit_of_work import get_db
 from app.infrastructure.tranaslations import TranslationManager
+from app.infrastructure.pending_counters import pending_counters_context
+from app.infrastructure.storage import file_storage
+from app.infrastructure.static_assets import asset
 
 public_router = APIRouter(prefix='/admin', tags=['admin'], include_in_schema=False)
 guard_router = APIRouter(prefix='/admin', tags=['admin'], include_in_schema=False, dependencies=[Depends(auth)])
-templates = Jinja2Templates(directory='templates/admin')
+templates = Jinja2Templates(directory='templates/admin', context_processors=[pending_counters_context])
 translation_manager = TranslationManager()
 templates.env.globals['gettext'] = translation_manager.gettext
+# Ссылки на загруженные файлы: /static/... локально или presigned URL в S3
+templates.env.globals['file_url'] = file_storage.url
+# Статика с хешем в имени — кэшируется браузером навсегда
+templates.env.globals['asset'] = asset
 db_connection = get_database_connection()
 
 
-def get_db():
-    db = db_connection.get_session()
-    try:
+async def get_async_db():
+    async with db_connection.get_async_session() as db:
         yield db
-    finally:
-        db.close()
 
 
 @public_router.get('/')
@@ -5,6 +5,8 @@ from app.routers.admin.admin import templates, get_db
 from app.services.auth_service import AuthService
 from app.services.admin.user_service import UserService
 from app.repositories.admin.user_repository import UserRepository
+from app.repositories.admin.user_token_repository import UserTokenRepository
+from app.services.admin.user_token_service import UserTokenService
 from app.infrastructure.tranaslations import TranslationManager
 from app.models.enums import UserStatus
 from passlib.context import CryptContext
@@ -20,6 +22,10 @@ def get_user_service(db: Session = Depends(get_db)):
     return UserService(UserRepository(db))
 
 
+def get_auth_service(db: Session = Depends(get_db)):
+    return AuthService(db)
+
+
 # --- LOGIN ---
 
 @router.get('/login', response_class=HTMLResponse, name='admin.auth.login.form')
@@ -33,7 +39,8 @@ async def show_login(request: Request):
 async def login(
         request: Request,
         email: str = Form(...),
-        password: str = Form(...)
+        password: str = Form(...),
+        auth_service: AuthService = Depends(get_auth_service)
 ):
     last_attempt = request.session.get('last_login_attempt')
     current_time = time.time()
@@ -47,8 +54,7 @@ async def login(
 
     request.session['last_login_attempt'] = current_time
 
-    auth_service = AuthService()
-    user = auth_service.authenticate(email, password, role="admin")
+    user = await auth_service.authenticate(email, password, role="admin")
 
     translator = TranslationManager()
 
@@ -138,7 +144,7 @@ async def register_store(
         })
 
     try:
-        service.register_user(first_name, last_name, email, password)
+        await service.register_user(first_name, last_name, email, password)
 
         return templates.TemplateResponse('auth/sign-in.html', {
             'request': request,
@@ -167,4 +173,58 @@ async def register_store(
 
 @router.get('/forgot-password', response_class=HTMLResponse, name='admin.auth.forgot_password.form')
 async def show_forgot_password(request: Request):
-    return templates.TemplateResponse('auth/forgot-password.html', {'request': request})
\ No newline at end of file
+    return templates.TemplateResponse('auth/forgot-password.html', {'request': request})
+
+@router.post('/forgot-password', response_class=HTMLResponse, name='admin.auth.forgot_password')
+async def forgot_password(
+        request: Request,
+        email: str = Form(...),
+        auth_service: AuthService = Depends(get_auth_service)
+):
+    auth_service.reset_password(email.strip().lower(), request)
+    translator = TranslationManager()
+    # Ответ одинаковый для любого email — по нему нельзя узнать, зарегистрирован ли адрес
+    return templates.TemplateResponse('auth/sign-in.html', {
+        'request': request,
+        'success_msg': translator.gettext("admin.toast.reset_link_sent")
+    })
+
+
+# --- RESET PASSWORD (ссылка из писем welcome / reset_password) ---
+
+@router.get('/reset-password/{token}', response_class=HTMLResponse, name='admin.reset-password.form')
+async def show_reset_password(request: Request, token: str, service: UserService = Depends(get_user_service)):
+    user_token_service = UserTokenService(UserTokenRepository(service.repository.getDb()))
+    user_token = user_token_service.getResetPasswordToken(token)
+    return templates.TemplateResponse('auth/reset-password.html', {'request': request, 'user_token': user_token})
+
+
+@router.post('/reset-password', response_class=HTMLResponse, name='admin.reset-password.store')
+async def reset_password(
+        request: Request,
+        token: str = Form(...),
+        password: str = Form(...),
+        password_confirm: str = Form(...),
+        service: UserService = Depends(get_user_service)
+):
+    translator = TranslationManager()
+    error_msg = None
+    if password != password_confirm:
+        error_msg = translator.gettext("admin.auth.password_mismatch")
+    else:
+        try:
+            await service.reset_password(token, password)
+        except ValueError as e:
+            error_msg = translator.gettext(str(e))
+
+    if error_msg:
+        return templates.TemplateResponse('auth/reset-password.html', {
+            'request': request,
+            'user_token': {'token': token},
+            'error_msg': error_msg
+        })
+
+    return templates.TemplateResponse('auth/sign-in.html', {
+        'request': request,
+        'success_msg': translator.gettext("admin.toast.password_reset")
+    })
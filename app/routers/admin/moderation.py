@@ -1,7 +1,7 @@
 from fastapi import Request, Depends, HTTPException, Form
-from fastapi.responses import HTMLResponse, RedirectResponse
+from fastapi.responses import HTMLResponse, RedirectResponse, JSONResponse
 from sqlalchemy.orm import Session
-from typing import Optional
+from typing import List, Optional
 from app.routers.admin.admin import guard_router, templates, get_db
 from app.repositories.admin.user_repository import UserRepository
 from app.services.admin.user_service import UserService
@@ -10,6 +10,7 @@ from app.services.admin.achievement_service import AchievementService
 from app.models.user import Users
 from app.models.enums import UserRole
 from app.infrastructure.tranaslations import TranslationManager
+from app.infrastructure.pending_counters import pending_counters, PendingCounters
 
 router = guard_router
 
@@ -25,20 +26,55 @@ def get_achievement_service(db: Session = Depends(get_db)):
 async def ensure_moderator(request: Request, db: Session = Depends(get_db)):
     user_id = request.session.get('auth_id')
     if not user_id: raise HTTPException(status_code=403, detail="Not authenticated")
-    user = db.query(Users).get(user_id)
+    user = db.get(Users, user_id)
     if not user: raise HTTPException(status_code=403, detail="User not found")
     if user.role not in [UserRole.MODERATOR, UserRole.SUPER_ADMIN]: raise HTTPException(status_code=403,
                                                                                         detail="Access denied")
     return user
 
 
+def bulk_response(request: Request, results: dict, route_name: str):
+    updated = sum(1 for result in results.values() if result == 'updated')
+    # fetch-запрос получает итог по каждому id, обычная форма — редирект с сообщением
+    if request.headers.get('x-requested-with') == 'XMLHttpRequest':
+        return JSONResponse({'updated': updated, 'results': {str(key): value for key, value in results.items()}})
+
+    translator = TranslationManager()
+    if not results:
+        # Форму отправили, ничего не отметив
+        url = request.url_for(route_name).include_query_params(
+            toast_msg=translator.gettext("admin.toast.bulk_nothing_selected"), toast_type="warning")
+        return RedirectResponse(url=url, status_code=302)
+    url = request.url_for(route_name).include_query_params(
+        toast_msg=translator.gettext("admin.toast.bulk_processed", count=updated), toast_type="success")
+    return RedirectResponse(url=url, status_code=302)
+
+
 @router.get('/moderation/users', response_class=HTMLResponse, name='admin.moderation.users')
-async def pending_users(request: Request, service: UserService = Depends(get_user_service),
-                        admin=Depends(ensure_moderator)):
-    users = service.get_pending_users()
-    total_count = len(users) if users else 0
+async def pending_users(request: Request, cursor: Optional[str] = None, query: Optional[str] = None,
+                        date_from: Optional[str] = None, date_to: Optional[str] = None,
+                        service: UserService = Depends(get_user_service),
+                        admin=Depends(ensure_moderator), db: Session = Depends(get_db)):
+    filters = {'query': query, 'date_from': date_from, 'date_to': date_to}
+    page = service.get_pending_page(cursor, filters)
+    if any(filters.values()):
+        total_count = service.count_pending(filters)
+    else:
+        total_count = pending_counters.get(db)[PendingCounters.USERS]
     return templates.TemplateResponse('moderation/users.html',
-                                      {'request': request, 'users': users, 'total_count': total_count})
+                                      {'request': request, 'users': page.items, 'page': page,
+                                       'total_count': total_count, 'filters': filters})
+
+
+@router.post('/moderation/users/bulk', name='admin.moderation.users.bulk')
+async def bulk_moderate_users(request: Request, ids: List[int] = Form([]), action: str = Form(...),
+                              service: UserService = Depends(get_user_service), admin=Depends(ensure_moderator)):
+    if action not in ('approve', 'reject'):
+        raise HTTPException(status_code=400, detail="Unknown action")
+    if not ids:
+        return bulk_response(request, {}, 'admin.moderation.users')
+    results = service.bulk_moderate(ids, approve=action == 'approve')
+    return bulk_response(request, results, 'admin.moderation.users')
 
 
 @router.post('/moderation/users/{id}/approve', name='admin.moderation.users.approve')
@@ -64,12 +100,33 @@ async def reject_user(id: int, request: Request, service: UserService = Depends(
 
 
 @router.get('/moderation/achievements', response_class=HTMLResponse, name='admin.moderation.achievements')
-async def pending_achievements(request: Request, service: AchievementService = Depends(get_achievement_service),
-                               admin=Depends(ensure_moderator)):
-    achievements = service.get_all_pending()
-    total_count = len(achievements) if achievements else 0
+async def pending_achievements(request: Request, cursor: Optional[str] = None, owner: Optional[str] = None,
+                               date_from: Optional[str] = None, date_to: Optional[str] = None,
+                               service: AchievementService = Depends(get_achievement_service),
+                               admin=Depends(ensure_moderator), db: Session = Depends(get_db)):
+    filters = {'owner': owner, 'date_from': date_from, 'date_to': date_to}
+    page = service.get_pending_page(cursor, filters)
+    if any(filters.values()):
+        total_count = service.count_pending(filters)
+    else:
+        total_count = pending_counters.get(db)[PendingCounters.ACHIEVEMENTS]
     return templates.TemplateResponse('moderation/achievements.html',
-                                      {'request': request, 'achievements': achievements, 'total_count': total_count})
+                                      {'request': request, 'achievements': page.items, 'page': page,
+                                       'total_count': total_count, 'filters': filters})
+
+
+@router.post('/moderation/achievements/bulk', name='admin.moderation.achievements.bulk')
+async def bulk_update_achievements(request: Request, ids: List[int] = Form([]), status: str = Form(...),
+                                   rejection_reason: Optional[str] = Form(None),
+                                   service: AchievementService = Depends(get_achievement_service),
+                                   admin=Depends(ensure_moderator)):
+    if not ids:
+        return bulk_response(request, {}, 'admin.moderation.achievements')
+    try:
+        results = service.bulk_update_status(ids, status, rejection_reason)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Unknown status")
+    return bulk_response(request, results, 'admin.moderation.achievements')
 
 
 @router.post('/moderation/achievements/{id}/update', name='admin.moderation.achievements.update')
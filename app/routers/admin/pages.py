@@ -1,11 +1,9 @@
 from fastapi import Request, Depends, HTTPException
 from fastapi.responses import HTMLResponse, JSONResponse, RedirectResponse
 from sqlalchemy.orm import Session
-from sqlalchemy import or_, asc, desc
+from starlette.concurrency import run_in_threadpool
 from typing import Optional
 from app.routers.admin.admin import guard_router, templates, get_db
-from app.models.achievement import Achievement
-from app.models.user import Users
 from app.models.enums import UserRole, AchievementStatus
 from app.services.admin.achievement_service import AchievementService
 from app.repositories.admin.achievement_repository import AchievementRepository
@@ -28,34 +26,31 @@ def check_access(request: Request):
 async def search_documents(request: Request, query: str, status: Optional[str] = None, db: Session = Depends(get_db)):
     check_access(request)
     if not query: return []
-    base_query = db.query(Achievement).join(Users)
-    base_query = base_query.filter(or_(Achievement.title.ilike(f"%{query}%"), Users.first_name.ilike(f"%{query}%"),
-                                       Users.last_name.ilike(f"%{query}%"), Users.email.ilike(f"%{query}%")))
-    if status: base_query = base_query.filter(Achievement.status == status)
-    documents = base_query.limit(10).all()
-    return [{"id": doc.user_id, "title": doc.title, "user": f"{doc.user.first_name} {doc.user.last_name}",
+    documents = AchievementRepository(db).search_documents(query, status, limit=10)
+    return [{"id": doc.user_id, "title": doc.title, "user": f"{doc.first_name} {doc.last_name}",
              "status": doc.status.value} for doc in documents]
 
 
 @router.get('/pages', response_class=HTMLResponse, name="admin.pages.index")
 async def index(request: Request, query: Optional[str] = "", status: Optional[str] = None,
-                sort: Optional[str] = "created_at", order: Optional[str] = "desc", db: Session = Depends(get_db)):
+                sort: Optional[str] = None, order: Optional[str] = "desc", cursor: Optional[str] = None,
+                db: Session = Depends(get_db)):
     check_access(request)
-    base_query = db.query(Achievement).join(Users)
-    if query: base_query = base_query.filter(
-        or_(Achievement.title.ilike(f"%{query}%"), Users.first_name.ilike(f"%{query}%"),
-            Users.last_name.ilike(f"%{query}%")))
-    if status: base_query = base_query.filter(Achievement.status == status)
-    if hasattr(Achievement, sort):
-        field = getattr(Achievement, sort)
-        base_query = base_query.order_by(asc(field) if order == 'asc' else desc(field))
+    repository = AchievementRepository(db)
+    page = None
+    if query:
+        # Поиск: без явной сортировки результаты идут по релевантности
+        documents = repository.search_documents(query, status, sort, order)
+        total_count = repository.search_total(len(documents))
     else:
-        base_query = base_query.order_by(desc(Achievement.created_at))
+        sort = sort or 'created_at'
+        page = repository.get_documents_page(status, sort, order, cursor)
+        documents = page.items
+        total_count = repository.count_documents(status)
 
-    total_count = base_query.count()
-    documents = base_query.limit(50).all()
     return templates.TemplateResponse('pages/index.html', {'request': request, 'query': query, 'documents': documents,
-                                                           'total_count': total_count, 'selected_status': status,
+                                                           'page': page, 'total_count': total_count,
+                                                           'selected_status': status,
                                                            'statuses': list(AchievementStatus), 'current_sort': sort,
                                                            'current_order': order})
 
@@ -65,7 +60,7 @@ async def delete_document(id: int, request: Request, service: AchievementService
     check_access(request)
     user_id = request.session['auth_id']
     user_role = request.session.get('auth_role')
-    service.delete(id, user_id, user_role)
+    await run_in_threadpool(service.delete, id, user_id, user_role)
 
     locale = request.session.get('locale', 'en')
     translator = TranslationManager()
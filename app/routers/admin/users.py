@@ -3,13 +3,16 @@ from fastapi.responses import HTMLResponse, RedirectResponse, JSONResponse
 from typing import Optional
 from app.routers.admin.admin import guard_router, templates, get_db
 from app.repositories.admin.user_repository import UserRepository
+from app.repositories.admin.achievement_repository import AchievementRepository
 from app.services.admin.user_service import UserService
 from sqlalchemy.orm import Session
-from sqlalchemy import or_
+from starlette.concurrency import run_in_threadpool
 from app.models.enums import UserRole, UserStatus
 from app.models.user import Users
 from app.schemas.admin.users import UserCreate, UserUpdate
 from app.infrastructure.tranaslations import TranslationManager
+from app.infrastructure.uploads import receive_upload, AVATAR_UPLOADS
+from app.infrastructure.storage import file_storage
 
 router = guard_router
 
@@ -18,6 +21,16 @@ def get_service(db: Session = Depends(get_db)):
     return UserService(UserRepository(db))
 
 
+def get_achievement_repository(db: Session = Depends(get_db)):
+    return AchievementRepository(db)
+
+
+def profile_documents(repository: AchievementRepository, user_id: int, cursor: str = None) -> dict:
+    # COUNT и одна страница документов вместо загрузки всех user.achievements
+    page = repository.get_user_documents_page(user_id, cursor)
+    return {'achievements': page.items, 'page': page, 'total_docs': repository.count_by_user(user_id)}
+
+
 def check_access(request: Request):
     role = request.session.get('auth_role')
     if role not in [UserRole.MODERATOR, UserRole.SUPER_ADMIN]:
@@ -25,25 +38,19 @@ def check_access(request: Request):
 
 
 @router.get('/users/search', response_class=JSONResponse, name='admin.users.search_api')
-async def search_users(request: Request, query: str, db: Session = Depends(get_db)):
+async def search_users(request: Request, query: str, service: UserService = Depends(get_service)):
     check_access(request)
     if not query:
         return []
 
-    users = db.query(Users).filter(
-        or_(
-            Users.first_name.ilike(f"%{query}%"),
-            Users.last_name.ilike(f"%{query}%"),
-            Users.email.ilike(f"%{query}%")
-        )
-    ).limit(5).all()
+    users = service.repository.search(query, limit=5)
 
     return [
         {
             "id": u.id,
             "name": f"{u.first_name} {u.last_name}",
             "email": u.email,
-            "avatar": u.avatar_path
+            "avatar": file_storage.url(u.avatar_path) if u.avatar_path else None
         }
         for u in users
     ]
@@ -55,35 +62,23 @@ async def index(
         query: Optional[str] = "",
         role: Optional[str] = None,
         status: Optional[str] = None,
-        page: Optional[int] = 1,
+        cursor: Optional[str] = None,
         sort: Optional[str] = "id",
         order: Optional[str] = "desc",
-        service: UserService = Depends(get_service),
-        db: Session = Depends(get_db)):
+        service: UserService = Depends(get_service)):
     check_access(request)
 
-    filters = {'query': query, 'role': role, 'status': status, 'page': page}
+    filters = {'query': query, 'role': role, 'status': status}
 
-    users = service.repository.get(filters, sort_by=sort, sort_order=order)
+    page = service.repository.get_page(filters, sort_by=sort, sort_order=order, cursor=cursor)
 
-    count_query = db.query(Users)
-    if query:
-        count_query = count_query.filter(
-            or_(
-                Users.first_name.ilike(f"%{query}%"),
-                Users.last_name.ilike(f"%{query}%"),
-                Users.email.ilike(f"%{query}%")
-            )
-        )
-    if role: count_query = count_query.filter(Users.role == role)
-    if status: count_query = count_query.filter(Users.status == status)
-
-    total_count = count_query.count()
+    total_count = service.repository.count(filters)
 
     return templates.TemplateResponse('users/index.html', {
         'request': request,
         'query': query,
-        'users': users,
+        'users': page.items,
+        'page': page,
         'total_count': total_count,
         'selected_role': role,
         'selected_status': status,
@@ -95,18 +90,17 @@ async def index(
 
 
 @router.get('/users/{id}', response_class=HTMLResponse, name='admin.users.show')
-async def show(id: int, request: Request, service: UserService = Depends(get_service)):
+async def show(id: int, request: Request, cursor: Optional[str] = None,
+               service: UserService = Depends(get_service),
+               achievements: AchievementRepository = Depends(get_achievement_repository)):
     check_access(request)
     user = service.find(id)
 
-    total_docs = len(user.achievements)
-
     return templates.TemplateResponse('users/show.html', {
         'request': request,
         'user': user,
         'roles': list(UserRole),
-        'achievements': user.achievements,
-        'total_docs': total_docs
+        **profile_documents(achievements, id, cursor)
     })
 
 
@@ -148,7 +142,7 @@ async def store(request: Request, db: Session = Depends(get_db), service: UserSe
         user_data = UserCreate(**form_data)
         UserCreate.validate_unique_email(user_data.email, db)
         service.set_request(request)
-        service.create(user_data)
+        await service.create(user_data)
 
         translator = TranslationManager()
         url = request.url_for('admin.users.index').include_query_params(
@@ -162,19 +156,19 @@ async def store(request: Request, db: Session = Depends(get_db), service: UserSe
 
 
 @router.get('/users/{id}/edit', response_class=HTMLResponse, name='admin.users.edit')
-async def edit(id: int, request: Request, service: UserService = Depends(get_service)):
+async def edit(id: int, request: Request, cursor: Optional[str] = None,
+               service: UserService = Depends(get_service),
+               achievements: AchievementRepository = Depends(get_achievement_repository)):
     if id != request.session.get('auth_id'):
         return RedirectResponse(url=request.url_for('admin.users.show', id=id), status_code=302)
 
     user = service.find(id)
-    total_docs = len(user.achievements)
 
     return templates.TemplateResponse('users/edit.html', {
         'request': request,
         'user': user,
         'roles': list(UserRole),
-        'total_docs': total_docs,
-        'achievements': user.achievements
+        **profile_documents(achievements, id, cursor)
     })
 
 
@@ -183,15 +177,17 @@ async def update(
         id: int,
         request: Request,
         db: Session = Depends(get_db),
-        service: UserService = Depends(get_service)
+        service: UserService = Depends(get_service),
+        achievements: AchievementRepository = Depends(get_achievement_repository)
 ):
     if id != request.session.get('auth_id'):
         raise HTTPException(status_code=403, detail="You cannot edit other users.")
 
+    form = None
     try:
-        form = await request.form()
-        form_data = dict(form)
-        avatar_file = form_data.pop('avatar', None)
+        form = await receive_upload(request, AVATAR_UPLOADS, file_fields=('avatar',))
+        form_data = dict(form.fields)
+        avatar_file = form.files.get('avatar')
         form_data.pop('role', None)
 
         user_data = UserUpdate(**form_data)
@@ -202,8 +198,8 @@ async def update(
 
         update_payload = user_data.dict(exclude_unset=True)
 
-        if avatar_file and hasattr(avatar_file, 'filename') and avatar_file.filename:
-            avatar_path = service.save_avatar(id, avatar_file)
+        if avatar_file:
+            avatar_path = await run_in_threadpool(service.save_avatar, id, avatar_file)
             update_payload["avatar_path"] = avatar_path
 
         service.repository.update(id, update_payload)
@@ -216,15 +212,16 @@ async def update(
         return RedirectResponse(url=url, status_code=302)
     except ValueError as e:
         user = service.find(id)
-        total_docs = len(user.achievements)
         return templates.TemplateResponse('users/edit.html', {
             'request': request,
             'user': user,
             'roles': list(UserRole),
-            'total_docs': total_docs,
-            'achievements': user.achievements,
+            **profile_documents(achievements, id),
             'error_msg': str(e)
         })
+    finally:
+        if form is not None:
+            form.discard()
 
 
 @router.post('/users/{user_id}/delete', name='admin.users.delete')
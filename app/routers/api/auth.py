@@ -1,13 +1,19 @@
-from fastapi import HTTPException, status, Form
+from fastapi import HTTPException, status, Form, Depends
+from sqlalchemy.orm import Session
+from app.infrastructure.database.unit_of_work import get_db
 from app.models.enums import UserRole
 from app.routers.api.api import public_router as router, translation_manager
 from app.services.auth_service import AuthService
 
-auth_service = AuthService()
+
+def get_auth_service(db: Session = Depends(get_db)):
+    return AuthService(db)
+
 
 @router.post("/login", name='api.auth.authentication')
-async def login(email: str = Form(...), password: str = Form(...)):
-    result = auth_service.api_authenticate(email, password, UserRole.USER)
+async def login(email: str = Form(...), password: str = Form(...),
+                auth_service: AuthService = Depends(get_auth_service)):
+    result = await auth_service.api_authenticate(email, password, UserRole.USER)
     if not result:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -17,7 +23,7 @@ async def login(email: str = Form(...), password: str = Form(...)):
 
 
 @router.post("/refresh",  name='api.auth.refresh')
-def refresh(refresh_token: str = Form(...)):
+def refresh(refresh_token: str = Form(...), auth_service: AuthService = Depends(get_auth_service)):
     result = auth_service.api_refresh_token(refresh_token)
     if not result:
         raise HTTPException(
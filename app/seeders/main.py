@@ -1,6 +1,6 @@
 from dotenv import load_dotenv
 load_dotenv()
-from app.infrastructure.database.connection import get_database_connection
+from app.infrastructure.database.connection import get_database_connection, dispose_database_connections
 from app.seeders import users_table_seeder
 from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
@@ -22,6 +22,7 @@ def seed():
         print(f"An error occurred during seeding: {e}")
     finally:
         db.close()
+        dispose_database_connections()
 
 
 if __name__ == "__main__":
@@ -1,15 +1,16 @@
 from typing import List
-from fastapi import UploadFile
-import shutil
-from pathlib import Path
-import uuid
-import os
 from datetime import datetime  # <-- Импорт для работы с датой
 
 from app.repositories.admin.achievement_repository import AchievementRepository
 from app.models.achievement import Achievement
 from app.models.enums import AchievementStatus
 from app.schemas.admin.achievements import AchievementCreate
+from app.infrastructure.pending_counters import pending_counters, PendingCounters
+from app.services.admin.dashboard_service import dashboard_cache, student_key
+from app.infrastructure.uploads import PendingUpload
+from app.repositories.admin.file_blob_repository import FileBlobRepository
+from app.infrastructure.previews import preview_generator, preview_path_for
+from app.infrastructure.storage import file_storage
 
 
 class AchievementService:
@@ -19,19 +20,32 @@ class AchievementService:
     def get_user_achievements(self, user_id: int, page: int = 1):
         return self.repo.get_by_user(user_id, page)
 
-    def create(self, user_id: int, obj_in: AchievementCreate, file: UploadFile):
-        file_path = self._save_file(file)
+    def create(self, user_id: int, obj_in: AchievementCreate, file: PendingUpload):
+        blob, file_created = self._save_file(file)
+        file_path = blob.path
 
         achievement_data = {
             "user_id": user_id,
             "title": obj_in.title,
             "description": obj_in.description,
             "file_path": file_path,
+            "file_sha256": blob.sha256,
             "status": AchievementStatus.PENDING,
             "created_at": datetime.now()  # <-- Явная установка текущего времени
         }
 
-        return self.repo.create(achievement_data)
+        try:
+            achievement = self.repo.create(achievement_data)
+        except Exception:
+            self.repo.db.rollback()
+            if file_created:
+                file_storage.delete(file_path)
+            raise
+        # Превью строится в фоне; до готовности списки показывают заглушку
+        preview_generator.schedule(achievement.id, achievement.file_path)
+        pending_counters.invalidate(PendingCounters.ACHIEVEMENTS)
+        dashboard_cache.invalidate(student_key(user_id))
+        return achievement
 
     def delete(self, id: int, user_id: int, user_role: str):
         achievement = self.repo.find(id)
@@ -42,20 +56,38 @@ class AchievementService:
         is_admin = (user_role in ['moderator', 'super_admin'])
 
         if is_owner or is_admin:
+            file_path, file_sha256 = achievement.file_path, achievement.file_sha256
+            db = self.repo.db
             try:
-                full_path = Path(achievement.file_path)
-                if full_path.exists():
-                    full_path.unlink()
-            except Exception as e:
-                print(f"Error deleting file {achievement.file_path}: {e}")
-
-            self.repo.delete(id)
+                db.delete(achievement)
+                if file_sha256:
+                    # Файл общий для одинаковых загрузок — удаляем только вместе с последней ссылкой;
+                    # счетчик меняется в той же транзакции, что и удаление документа
+                    file_path = FileBlobRepository(db).release(file_sha256)
+                db.commit()
+            except Exception:
+                db.rollback()
+                raise
+            # Файл удаляется только после коммита
+            if file_path:
+                # Превью удаляется вместе с оригиналом (одинаковые загрузки делят и его)
+                for path in (file_path, preview_path_for(file_path)):
+                    try:
+                        file_storage.delete(path)
+                    except Exception as e:
+                        print(f"Error deleting file {path}: {e}")
+
+            pending_counters.invalidate(PendingCounters.ACHIEVEMENTS)
+            dashboard_cache.invalidate(student_key(achievement.user_id))
             return True
 
         return False
 
-    def get_all_pending(self):
-        return self.repo.getDb().query(Achievement).filter(Achievement.status == AchievementStatus.PENDING).all()
+    def get_pending_page(self, cursor: str = None, filters: dict = None):
+        return self.repo.get_pending_page(cursor, filters)
+
+    def count_pending(self, filters: dict = None):
+        return self.repo.count_pending(filters)
 
     def update_status(self, id: int, status: str, rejection_reason: str = None):
         """Меняет статус и записывает причину отказа (если есть)"""
@@ -66,17 +98,31 @@ class AchievementService:
         elif status == "approved":
             data["rejection_reason"] = None
 
-        self.repo.update(id, data)
-
-    def _save_file(self, file: UploadFile) -> str:
-        upload_dir = Path("static/uploads/achievements")
-        upload_dir.mkdir(parents=True, exist_ok=True)
+        achievement = self.repo.update(id, data)
+        pending_counters.invalidate(PendingCounters.ACHIEVEMENTS)
+        if achievement is not None:
+            dashboard_cache.invalidate(student_key(achievement.user_id))
 
-        file_extension = file.filename.split('.')[-1] if '.' in file.filename else "dat"
-        unique_name = f"{uuid.uuid4()}.{file_extension}"
-        file_path = upload_dir / unique_name
+    def bulk_update_status(self, ids: List[int], status: str, rejection_reason: str = None) -> dict:
+        """Одобряет или отклоняет пачку документов из очереди одним UPDATE."""
+        status = AchievementStatus(status)
+        if status == AchievementStatus.PENDING:
+            raise ValueError("Bulk moderation expects approved or rejected status")
 
-        with file_path.open("wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
+        data = {"status": status}
+        if status == AchievementStatus.REJECTED:
+            data["rejection_reason"] = rejection_reason or None
+        else:
+            data["rejection_reason"] = None
 
-        return f"static/uploads/achievements/{unique_name}"
\ No newline at end of file
+        # Обрабатываем только то, что еще ждет проверки
+        rows = self.repo.bulk_update(ids, data, Achievement.status == AchievementStatus.PENDING,
+                                     returning=(Achievement.user_id,))
+        pending_counters.invalidate(PendingCounters.ACHIEVEMENTS)
+        for user_id in {row.user_id for row in rows}:
+            dashboard_cache.invalidate(student_key(user_id))
+        return self.repo.bulk_results(ids, rows)
+
+    def _save_file(self, file: PendingUpload) -> tuple:
+        # Имя файла — хеш содержимого: повторная загрузка того же файла не занимает места
+        return FileBlobRepository(self.repo.db).acquire(file)
\ No newline at end of file
@@ -0,0 +1,84 @@
+import os
+from datetime import datetime, timedelta
+from sqlalchemy import select, func, case, true
+from sqlalchemy.orm import Session
+from app.models.user import Users
+from app.models.achievement import Achievement
+from app.models.enums import UserStatus, AchievementStatus
+from app.infrastructure.ttl_cache import TTLCache
+
+# Снимок статистики: общий для модераторов/админов и отдельный для каждого студента
+dashboard_cache = TTLCache(ttl=float(os.getenv('DASHBOARD_CACHE_TTL', 15)), maxsize=4096)
+
+STAFF_KEY = 'staff'
+
+
+def student_key(user_id: int):
+    return ('student', user_id)
+
+
+def _count_where(condition):
+    return func.count(case((condition, 1)))
+
+
+class DashboardService:
+    CHART_DAYS = 7
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_staff_snapshot(self) -> dict:
+        return dashboard_cache.get_or_set(STAFF_KEY, self._build_staff_snapshot)
+
+    def get_student_snapshot(self, user_id: int) -> dict:
+        return dashboard_cache.get_or_set(student_key(user_id), lambda: self._build_student_snapshot(user_id))
+
+    def _build_staff_snapshot(self) -> dict:
+        users = select(
+            func.count().label('users_total'),
+            _count_where(Users.status == UserStatus.ACTIVE).label('users_active'),
+            _count_where(Users.status == UserStatus.PENDING).label('users_pending'),
+            _count_where(Users.status == UserStatus.REJECTED).label('users_rejected'),
+            _count_where(Users.status == UserStatus.DELETED).label('users_deleted'),
+        ).select_from(Users).subquery()
+
+        docs = select(
+            func.count().label('docs_total'),
+            _count_where(Achievement.status == AchievementStatus.PENDING).label('docs_pending'),
+            _count_where(Achievement.status == AchievementStatus.APPROVED).label('docs_approved'),
+            _count_where(Achievement.status == AchievementStatus.REJECTED).label('docs_rejected'),
+        ).select_from(Achievement).subquery()
+
+        # Обе агрегации — один round-trip (каждый подзапрос возвращает ровно одну строку)
+        row = self.db.execute(select(users, docs).select_from(users.join(docs, true()))).mappings().one()
+
+        return {'stats': dict(row), 'chart_data': self._registrations_chart()}
+
+    def _registrations_chart(self) -> dict:
+        # [ГРАФИК] Регистрации за последние 7 дней, группировка по дню на стороне БД
+        today = datetime.now()
+        first_day = (today - timedelta(days=self.CHART_DAYS - 1)).replace(hour=0, minute=0, second=0, microsecond=0)
+
+        day = func.date(Users.created_at)
+        rows = self.db.execute(
+            select(day, func.count()).where(Users.created_at >= first_day).group_by(day)
+        ).all()
+        daily_counts = {str(value)[:10]: count for value, count in rows}
+
+        date_labels = [(first_day + timedelta(days=i)).strftime("%Y-%m-%d") for i in range(self.CHART_DAYS)]
+        return {
+            "labels": date_labels,
+            "data": [daily_counts.get(label, 0) for label in date_labels]
+        }
+
+    def _build_student_snapshot(self, user_id: int) -> dict:
+        row = self.db.execute(
+            select(
+                func.count().label('my_total'),
+                _count_where(Achievement.status == AchievementStatus.APPROVED).label('my_approved'),
+                _count_where(Achievement.status == AchievementStatus.PENDING).label('my_pending'),
+                _count_where(Achievement.status == AchievementStatus.REJECTED).label('my_rejected'),
+            ).where(Achievement.user_id == user_id)
+        ).mappings().one()
+
+        return {'stats': dict(row), 'chart_data': {}}
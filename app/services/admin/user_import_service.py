@@ -0,0 +1,161 @@
+import csv
+import json
+import os
+import secrets
+import string
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, UTC
+from itertools import islice
+from typing import Iterable, Iterator
+from passlib.context import CryptContext
+from pydantic import ValidationError
+from sqlalchemy import insert
+from app.models.enums import UserRole, UserStatus, UserTokenType
+from app.models.user_token import UserToken
+from app.repositories.admin.user_repository import UserRepository
+from app.repositories.admin.email_outbox_repository import EmailOutboxRepository
+from app.infrastructure.email_templates import email_templates, reset_password_url
+from app.schemas.admin.users import UserCreate
+
+IMPORT_BATCH_SIZE = int(os.getenv('IMPORT_BATCH_SIZE', 500))
+
+bcrypt_context = CryptContext(schemes=['bcrypt'], deprecated='auto')
+
+
+def hash_password(password: str) -> str:
+    # Функция модульного уровня — ее можно передать в ProcessPoolExecutor
+    return bcrypt_context.hash(password)
+
+
+def generate_password() -> str:
+    return ''.join(secrets.choice(string.ascii_letters + string.digits) for _ in range(8))
+
+
+def read_rows(path: str, file_format: str = None) -> Iterator[dict]:
+    """Построчно читает CSV (с заголовком) или NDJSON, не загружая файл целиком."""
+    file_format = file_format or ('ndjson' if path.endswith(('.ndjson', '.jsonl')) else 'csv')
+    with open(path, newline='', encoding='utf-8') as handle:
+        if file_format == 'csv':
+            yield from csv.DictReader(handle)
+        else:
+            for line in handle:
+                if line.strip():
+                    yield json.loads(line)
+
+
+@dataclass
+class ImportReport:
+    read: int = 0
+    created: int = 0
+    duplicates: int = 0
+    invalid: int = 0
+    emails_queued: int = 0
+    errors: list = field(default_factory=list)
+    started_at: float = field(default_factory=time.perf_counter)
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started_at
+
+    @property
+    def rate(self) -> float:
+        return self.read / self.elapsed if self.elapsed else 0.0
+
+    def summary(self) -> str:
+        return (f"{self.read} read, {self.created} created, {self.duplicates} duplicates, {self.invalid} invalid, "
+                f"{self.emails_queued} emails queued — {self.elapsed:.1f}s, {self.rate:.0f} rows/s")
+
+
+class UserImportService:
+    """Массовый импорт пользователей: валидация UserCreate, хеширование в пуле процессов, пакетные INSERT."""
+
+    MAX_ERRORS = 20
+
+    def __init__(self, repo: UserRepository, executor, send_welcome: bool = False,
+                 batch_size: int = IMPORT_BATCH_SIZE):
+        self.repository = repo
+        self.executor = executor
+        self.send_welcome = send_welcome
+        self.batch_size = batch_size
+        self._seen_emails = set()
+
+    def run(self, rows: Iterable[dict], on_progress=None) -> ImportReport:
+        report = ImportReport()
+        iterator = iter(rows)
+        line = 1  # строка заголовка CSV / первая строка NDJSON
+        while batch := list(islice(iterator, self.batch_size)):
+            self._import_batch(batch, line, report)
+            line += len(batch)
+            if on_progress:
+                on_progress(report)
+        return report
+
+    def _import_batch(self, batch: list, first_line: int, report: ImportReport):
+        report.read += len(batch)
+        users, passwords = [], []
+        for offset, row in enumerate(batch):
+            try:
+                user, password = self._validate(row)
+            except (ValidationError, ValueError) as e:
+                report.invalid += 1
+                if len(report.errors) < self.MAX_ERRORS:
+                    report.errors.append(f"row {first_line + offset}: {e}")
+                continue
+            if user.email in self._seen_emails:
+                report.duplicates += 1
+                continue
+            self._seen_emails.add(user.email)
+            users.append(user)
+            passwords.append(password)
+
+        # Уже зарегистрированные email отсекаем до bcrypt — повторный импорт файла почти бесплатен
+        taken = self.repository.existing_emails([user.email for user in users])
+        if taken:
+            report.duplicates += len(taken)
+            fresh = [(user, password) for user, password in zip(users, passwords) if user.email not in taken]
+            users, passwords = [user for user, _ in fresh], [password for _, password in fresh]
+        if not users:
+            return
+
+        chunksize = max(1, len(passwords) // 32)
+        hashes = list(self.executor.map(hash_password, passwords, chunksize=chunksize))
+        values = [{**user.model_dump(), 'hashed_password': hashed, 'status': UserStatus.ACTIVE}
+                  for user, hashed in zip(users, hashes)]
+
+        created = self.repository.bulk_insert_ignore_existing(values)
+        report.created += len(created)
+        report.duplicates += len(users) - len(created)
+
+        if self.send_welcome and created:
+            report.emails_queued += self._queue_welcome_emails(created, users)
+
+    def _validate(self, row: dict):
+        data = {key.strip(): (value.strip() if isinstance(value, str) else value)
+                for key, value in row.items() if key}
+        data = {key: value for key, value in data.items() if value not in (None, '')}
+        password = data.pop('password', None) or generate_password()
+        data.setdefault('role', UserRole.STUDENT)
+        user = UserCreate(**data)
+        user.email = user.email.lower()
+        return user, password
+
+    def _queue_welcome_emails(self, created: list, users: list) -> int:
+        by_email = {user.email: user for user in users}
+        expires_at = datetime.now(UTC) + timedelta(hours=2)
+        tokens = [{'user_id': row.id, 'token': secrets.token_urlsafe(32), 'type': UserTokenType.RESET_PASSWORD,
+                   'expires_at': expires_at} for row in created]
+        # Токены и письма outbox — одной транзакцией; доставкой займется воркер приложения
+        db = self.repository.getDb()
+        db.execute(insert(UserToken), tokens)
+        outbox = EmailOutboxRepository(db)
+        for row, token in zip(created, tokens):
+            user = by_email[row.email]
+            # Пароль в письмо не кладем — тело хранится в outbox; пароль пользователь задает по ссылке
+            body = email_templates.render('welcome', {
+                'user': {'first_name': user.first_name},
+                'url': reset_password_url(token['token'])
+            })
+            outbox.enqueue(to=user.email, subject="Welcome", body=body, commit=False)
+        db.commit()
+        return len(created)
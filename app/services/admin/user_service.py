@@ -1,8 +1,5 @@
 import uuid
 from typing import List
-from fastapi import UploadFile
-import shutil
-from pathlib import Path
 from app.schemas.admin.users import UserCreate, UserUpdate, UserOut
 from app.schemas.admin.user_tokens import UserTokenCreate, UserTokenType
 from app.services.admin.base_crud_service import BaseCrudService, ModelType, CreateSchemaType
@@ -10,25 +7,18 @@ from app.services.admin.user_token_service import UserTokenService
 from app.repositories.admin.user_repository import UserRepository
 from app.repositories.admin.user_token_repository import UserTokenRepository
 from app.models.user import Users
-from passlib.context import CryptContext
-from mailbridge import MailBridge
-from app.routers.admin.admin import templates
 from starlette.requests import Request
 import secrets
 import string
-import os
 import re  # <-- Добавили RE для проверки паролей
 from app.models.enums import UserStatus, UserRole
-
-bcrypt_context = CryptContext(schemes=['bcrypt'], deprecated='auto')
-mailer = MailBridge(provider='smtp',
-                    host=os.getenv('MAIL_HOST'),
-                    port=os.getenv('MAIL_PORT'),
-                    username=os.getenv('MAIL_USERNAME'),
-                    password=os.getenv('MAIL_PASSWORD'),
-                    use_tls=True,
-                    from_email=os.getenv('MAIL_USERNAME')
-                    )
+from app.infrastructure.pending_counters import pending_counters, PendingCounters
+from app.infrastructure.user_prefix_index import user_prefix_index
+from app.infrastructure.password_hasher import password_hasher
+from app.infrastructure.email_outbox import queue_email
+from app.infrastructure.email_templates import email_templates, reset_password_url
+from app.infrastructure.principal_cache import principal_cache
+from app.infrastructure.uploads import PendingUpload
 
 
 class UserService(BaseCrudService[Users, UserCreate, UserUpdate]):
@@ -43,43 +33,35 @@ class UserService(BaseCrudService[Users, UserCreate, UserUpdate]):
         users = super().get(filters)
         return [UserOut.model_validate(user) for user in users]
 
-    def create(self, obj_in: CreateSchemaType) -> ModelType:
+    async def create(self, obj_in: CreateSchemaType) -> ModelType:
         # Логика создания АДМИНОМ (генерирует пароль)
         result = ''.join(secrets.choice(string.ascii_letters + string.digits) for _ in range(8))
-        obj_in.hashed_password = bcrypt_context.hash(result)
+        obj_in.hashed_password = await password_hasher.hash(result)
         user = self.repository.create(obj_in)
         user_token = self._create_user_token_for_reset_password(user_id=user.id)
-        self._send_welcome_email(user, result, user_token)
+        self._send_welcome_email(user, user_token)
         return user
 
     # --- МЕТОД РЕГИСТРАЦИИ (С ВАЛИДАЦИЕЙ ПАРОЛЯ) ---
-    def register_user(self, first_name: str, last_name: str, email: str, password: str) -> Users:
+    async def register_user(self, first_name: str, last_name: str, email: str, password: str) -> Users:
         """
         Регистрирует студента. Проверяет уникальность Email и сложность пароля.
         """
 
         # 1. Проверка сложности пароля
-        if len(password) < 8:
-            raise ValueError("admin.auth.password_too_short")
-        if not re.search(r"[A-Z]", password):
-            raise ValueError("admin.auth.password_no_upper")
-        if not re.search(r"[a-z]", password):
-            raise ValueError("admin.auth.password_no_lower")
-        if not re.search(r"\d", password):
-            raise ValueError("admin.auth.password_no_digit")
-        if not re.search(r"[!@#$%^&*(),.?\":{}|<>]", password):
-            raise ValueError("admin.auth.password_no_special")
+        self._validate_password(password)
 
         # 2. Проверка уникальности Email
         if self.repository.getDb().query(Users).filter(Users.email == email).first():
             raise ValueError("admin.auth.email_registered")
 
         # 3. Создание пользователя
+        hashed_password = await password_hasher.hash(password)
         new_user = Users(
             first_name=first_name,
             last_name=last_name,
             email=email,
-            hashed_password=bcrypt_context.hash(password),
+            hashed_password=hashed_password,
             role=UserRole.STUDENT,
             status=UserStatus.PENDING,
             is_active=True
@@ -87,13 +69,37 @@ class UserService(BaseCrudService[Users, UserCreate, UserUpdate]):
 
         self.repository.db.add(new_user)
         self.repository.db.commit()
+        pending_counters.invalidate(PendingCounters.USERS)
+        self.repository.invalidate_counts()
+        user_prefix_index.upsert(new_user)
 
         return new_user
 
     # -------------------------------------------------
 
-    def update_password(self, id: str, password: str):
-        self.repository.update_password(id, bcrypt_context.hash(password))
+    async def update_password(self, id: str, password: str):
+        self.repository.update_password(id, await password_hasher.hash(password))
+
+    async def reset_password(self, token: str, password: str):
+        """Новый пароль по ссылке из письма: токен одноразовый и удаляется после смены пароля."""
+        user_token_service = UserTokenService(UserTokenRepository(self.repository.getDb()))
+        user_token = user_token_service.getResetPasswordToken(token)
+        self._validate_password(password)
+        await self.update_password(user_token.user_id, password)
+        user_token_service.delete(user_token.id)
+
+    @staticmethod
+    def _validate_password(password: str):
+        if len(password) < 8:
+            raise ValueError("admin.auth.password_too_short")
+        if not re.search(r"[A-Z]", password):
+            raise ValueError("admin.auth.password_no_upper")
+        if not re.search(r"[a-z]", password):
+            raise ValueError("admin.auth.password_no_lower")
+        if not re.search(r"\d", password):
+            raise ValueError("admin.auth.password_no_digit")
+        if not re.search(r"[!@#$%^&*(),.?\":{}|<>]", password):
+            raise ValueError("admin.auth.password_no_special")
 
     def delete(self, id: int) -> bool:
         user = self.repository.find(id)
@@ -104,60 +110,72 @@ class UserService(BaseCrudService[Users, UserCreate, UserUpdate]):
             "status": "deleted",
             "is_active": False
         })
+        pending_counters.invalidate(PendingCounters.USERS)
         return True
 
     def force_delete(self, id: int) -> bool:
-        return self.repository.hard_delete(id)
+        deleted = self.repository.hard_delete(id)
+        pending_counters.invalidate()
+        return deleted
 
     def reject_registration(self, user_id: int):
         self.repository.update(user_id, {
             "status": "rejected",
             "is_active": False
         })
+        pending_counters.invalidate(PendingCounters.USERS)
 
-    def save_avatar(self, user_id: int, file: UploadFile) -> str:
-        upload_dir = Path("static/uploads/avatars")
-        upload_dir.mkdir(parents=True, exist_ok=True)
-
-        filename_parts = file.filename.split('.')
-        file_extension = filename_parts[-1] if len(filename_parts) > 1 else "png"
-
+    def save_avatar(self, user_id: int, file: PendingUpload) -> str:
+        user = self.repository.find(user_id)
+        old_avatar = user.avatar_path if user else None
         unique_code = uuid.uuid4().hex[:8]
-        filename = f"avatar_{user_id}_{unique_code}.{file_extension}"
-        file_path = upload_dir / filename
+        stored = file.commit(f"avatar_{user_id}_{unique_code}.{file.extension}")
 
-        for old_file in upload_dir.glob(f"avatar_{user_id}_*"):
+        # Старый аватар удаляем по пути из профиля — хранилище может быть и не локальным
+        if old_avatar and old_avatar != stored.path:
             try:
-                old_file.unlink()
-            except:
-                pass
+                file.storage.delete(old_avatar)
+            except Exception as e:
+                print(f"Error deleting file {old_avatar}: {e}")
 
-        with file_path.open("wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
+        return stored.path
 
-        return f"static/uploads/avatars/{filename}"
+    def get_pending_page(self, cursor: str = None, filters: dict = None):
+        return self.repository.get_pending_page(cursor, filters)
 
-    def get_pending_users(self):
-        return self.repository.getDb().query(Users).filter(Users.status == UserStatus.PENDING).all()
+    def count_pending(self, filters: dict = None):
+        return self.repository.count_pending(filters)
 
     def approve_user(self, user_id: int):
         self.repository.update(user_id, {
             "status": UserStatus.ACTIVE,
             "role": UserRole.STUDENT
         })
+        pending_counters.invalidate(PendingCounters.USERS)
+
+    def bulk_moderate(self, ids: List[int], approve: bool) -> dict:
+        """Одобряет или отклоняет пачку заявок на регистрацию одним UPDATE."""
+        if approve:
+            data = {"status": UserStatus.ACTIVE, "role": UserRole.STUDENT}
+        else:
+            data = {"status": UserStatus.REJECTED, "is_active": False}
+
+        rows = self.repository.bulk_update(ids, data, Users.status == UserStatus.PENDING)
+        pending_counters.invalidate(PendingCounters.USERS)
+        principal_cache.invalidate(*(row.id for row in rows))
+        return self.repository.bulk_results(ids, rows)
 
     def _create_user_token_for_reset_password(self, user_id: int):
         user_token_data = UserTokenCreate(user_id=user_id, type=UserTokenType.RESET_PASSWORD)
         user_token_service = UserTokenService(UserTokenRepository(self.repository.getDb()))
         return user_token_service.create(data=user_token_data)
 
-    def _send_welcome_email(self, user, password: str, user_token):
-        template = templates.env.get_template('emails/welcome.html')
-        mailer.send(to=user.email,
+    def _send_welcome_email(self, user, user_token):
+        # Пароль в письмо не попадает: тело хранится в email_outbox, пароль задается по ссылке
+        queue_email(self.repository.getDb(),
+                    to=user.email,
                     subject="Welcome",
-                    body=template.render({
-                        'request': self.request,
-                        'user': user,
-                        'password': password,
-                        'url': self.request.url_for('admin.reset-password.form', token=user_token.token)
+                    body=email_templates.render('welcome', {
+                        'user': {'first_name': user.first_name},
+                        'url': reset_password_url(user_token.token)
                     }))
\ No newline at end of file
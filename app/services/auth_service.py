@@ -1,50 +1,40 @@
 from sqlalchemy.orm import Session
 from fastapi import Request
-from passlib.context import CryptContext
-from app.infrastructure.database.connection import get_database_connection
 from app.models.enums import UserTokenType, UserRole, UserStatus
 from app.models.user import Users
 from app.repositories.admin.user_token_repository import UserTokenRepository
 from app.schemas.admin.user_tokens import UserTokenCreate
 from app.schemas.admin.auth import RegisterSchema
 from app.services.admin.user_token_service import UserTokenService
-from app.routers.admin.admin import templates
-from mailbridge import MailBridge
 from app.infrastructure.jwt_handler import create_access_token, create_refresh_token, refresh_access_token
-import os
-
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-db_connection = get_database_connection()
-mailer = MailBridge(provider='smtp',
-                    host=os.getenv('MAIL_HOST'),
-                    port=os.getenv('MAIL_PORT'),
-                    username=os.getenv('MAIL_USERNAME'),
-                    password=os.getenv('MAIL_PASSWORD'),
-                    use_tls=True,
-                    from_email=os.getenv('MAIL_USERNAME')
-                    )
+from app.infrastructure.pending_counters import pending_counters, PendingCounters
+from app.repositories.admin.user_repository import users_count_cache
+from app.infrastructure.user_prefix_index import user_prefix_index
+from app.infrastructure.password_hasher import password_hasher
+from app.infrastructure.email_outbox import queue_email
+from app.infrastructure.email_templates import email_templates, reset_password_url
 
 
 class AuthService:
-    def __init__(self):
-        self.db: Session = db_connection.get_session()
+    def __init__(self, db: Session):
+        self.db: Session = db
         self.model = self.db.query(Users)
 
-    def authenticate(self, email: str, password: str, role: str):
+    async def authenticate(self, email: str, password: str, role: str):
         user = self.model.filter(Users.email == email).first()
 
         if not user:
             return None
 
-        if not self.verify_password(password, user.hashed_password):
+        if not await self.verify_password(password, user.hashed_password):
             return None
 
         # Проверка BANNED удалена
 
         return user
 
-    def api_authenticate(self, email: str, password: str, role: str = "User"):
-        user = self.authenticate(email, password, role)
+    async def api_authenticate(self, email: str, password: str, role: str = "User"):
+        user = await self.authenticate(email, password, role)
         if not user:
             return None
 
@@ -65,11 +55,11 @@ class AuthService:
             }
         }
 
-    def register(self, data: RegisterSchema) -> bool:
+    async def register(self, data: RegisterSchema) -> bool:
         if self.model.filter(Users.email == data.email).first():
             return False
 
-        hashed_pw = pwd_context.hash(data.password)
+        hashed_pw = await password_hasher.hash(data.password)
 
         new_user = Users(
             first_name=data.first_name,
@@ -83,10 +73,13 @@ class AuthService:
 
         self.db.add(new_user)
         self.db.commit()
+        pending_counters.invalidate(PendingCounters.USERS)
+        users_count_cache.clear()
+        user_prefix_index.upsert(new_user)
         return True
 
-    def verify_password(self, plain_password: str, hashed_password: str) -> bool:
-        return pwd_context.verify(plain_password, hashed_password)
+    async def verify_password(self, plain_password: str, hashed_password: str) -> bool:
+        return await password_hasher.verify(plain_password, hashed_password)
 
     def user(self, request: Request):
         if 'auth_id' in request.session:
@@ -105,7 +98,7 @@ class AuthService:
         user_token_data = UserTokenCreate(user_id=user.id, type=UserTokenType.RESET_PASSWORD)
         user_token_service = UserTokenService(UserTokenRepository(self.db))
         user_token = user_token_service.create(data=user_token_data)
-        self._send_reset_password_email(user, user_token, request)
+        self._send_reset_password_email(user, user_token)
 
         return True
 
@@ -115,12 +108,11 @@ class AuthService:
             return None
         return new_token
 
-    def _send_reset_password_email(self, user, user_token, request):
-        template = templates.env.get_template('emails/reset_password.html')
-        mailer.send(to=user.email,
+    def _send_reset_password_email(self, user, user_token):
+        queue_email(self.db,
+                    to=user.email,
                     subject="Reset Password",
-                    body=template.render({
-                        'request': request,
-                        'user': user,
-                        'url': request.url_for('admin.reset-password.form', token=user_token.token)
+                    body=email_templates.render('reset_password', {
+                        'user': {'first_name': user.first_name},
+                        'url': reset_password_url(user_token.token)
                     }))
\ No newline at end of file
@@ -0,0 +1,77 @@
+import pytest
+from datetime import datetime, timedelta
+
+from app.repositories.admin.achievement_repository import AchievementRepository
+from app.models.user import Users
+from app.models.achievement import Achievement
+
+
+@pytest.fixture
+def repo(sqlite_session):
+    sqlite_session.add_all([Users(id=1, email="a@example.com"), Users(id=2, email="b@example.com")])
+    started = datetime(2025, 1, 1)
+    for i in range(30):
+        sqlite_session.add(Achievement(user_id=1, title=f"Doc {i}", file_path=f"static/{i}.png",
+                                       created_at=started + timedelta(hours=i)))
+    sqlite_session.add(Achievement(user_id=2, title="Other", file_path="static/other.png", created_at=started))
+    sqlite_session.commit()
+    return AchievementRepository(sqlite_session)
+
+
+def test_user_documents_are_paginated_and_projected(repo):
+    first = repo.get_user_documents_page(1)
+    second = repo.get_user_documents_page(1, first.next_cursor)
+
+    assert len(first.items) == repo.PROFILE_ITEMS_PER_PAGE
+    assert first.items[0].title == "Doc 29"
+    assert not isinstance(first.items[0], Achievement)
+    assert set(first.items[0]._fields) == {"id", "title", "file_path", "preview_path", "status", "created_at"}
+    assert second.items[0].title == "Doc 17"
+
+
+def test_count_by_user(repo):
+    assert repo.count_by_user(1) == 30
+    assert repo.count_by_user(2) == 1
+    assert repo.count_by_user(3) == 0
+
+
+def test_pending_queue_loads_owner_in_same_query(repo):
+    from sqlalchemy import event
+
+    statements = []
+    engine = repo.db.get_bind()
+    listener = lambda *args: statements.append(args[2])
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        page = repo.get_pending_page()
+        owners = {item.user.email for item in page.items}
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+
+    assert owners == {"a@example.com"}
+    assert len(statements) == 1
+
+
+def test_pending_queue_filters_by_owner_and_date(repo):
+    filters = {"owner": "a@example", "date_from": "2025-01-01", "date_to": "2025-01-01"}
+    page = repo.get_pending_page(filters=filters)
+
+    assert len(page.items) == 20 and {item.user_id for item in page.items} == {1}
+    assert repo.count_pending(filters).value == 24
+    assert repo.count_pending({"date_from": "2025-01-02"}).value == 6
+    assert repo.count_pending({"date_to": "not-a-date"}).value == 31
+
+
+def test_bulk_update_status_reports_each_id(repo):
+    from app.services.admin.achievement_service import AchievementService
+    from app.models.enums import AchievementStatus
+
+    service = AchievementService(repo)
+    first = service.bulk_update_status([1, 2, 999], "rejected", "Blurry scan")
+    second = service.bulk_update_status([2, 3], "approved")
+
+    assert first == {1: "updated", 2: "updated", 999: "not_found"}
+    assert second == {2: "skipped", 3: "updated"}
+    repo.db.expire_all()
+    assert repo.find(1).rejection_reason == "Blurry scan"
+    assert repo.find(3).status == AchievementStatus.APPROVED and repo.find(3).rejection_reason is None
@@ -0,0 +1,89 @@
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.repositories.admin.achievement_repository import AchievementRepository
+from app.repositories.admin.achievement_search import PostgresAchievementSearch
+from app.models.user import Users
+from app.models.achievement import Achievement
+from app.models.enums import AchievementStatus
+
+
+@pytest.fixture
+def db(sqlite_session):
+    sqlite_session.add_all([
+        Users(id=1, email="ivan@example.com", first_name="Ivan", last_name="Petrov"),
+        Users(id=2, email="maria@example.com", first_name="Maria", last_name="Sokolova"),
+    ])
+    sqlite_session.add_all([
+        Achievement(id=1, user_id=1, title="Olympiad diploma", description="Regional physics",
+                    file_path="static/1.pdf", status=AchievementStatus.APPROVED),
+        Achievement(id=2, user_id=2, title="Hackathon", description="Winner of olympiad track",
+                    file_path="static/2.pdf", status=AchievementStatus.PENDING),
+        Achievement(id=3, user_id=2, title="Chess tournament", description=None,
+                    file_path="static/3.pdf", status=AchievementStatus.PENDING),
+    ])
+    sqlite_session.commit()
+    return sqlite_session
+
+
+def test_search_title_description_and_owner(db):
+    repo = AchievementRepository(db)
+
+    assert {row.id for row in repo.search_documents("olympiad")} == {1, 2}
+    assert {row.id for row in repo.search_documents("sokolova")} == {2, 3}
+
+
+def test_search_filters_by_status_and_projects_columns(db):
+    repo = AchievementRepository(db)
+
+    rows = repo.search_documents("olympiad", status="pending")
+
+    assert [row.id for row in rows] == [2]
+    assert rows[0].first_name == "Maria" and rows[0].status == AchievementStatus.PENDING
+    assert not isinstance(rows[0], Achievement)
+
+
+def test_index_follows_writes(db):
+    repo = AchievementRepository(db)
+    repo.search_documents("warm-up")
+
+    db.add(Achievement(id=4, user_id=1, title="Robotics cup", file_path="static/4.pdf"))
+    db.get(Achievement, 3).status = AchievementStatus.APPROVED
+    db.get(Users, 2).last_name = "Orlova"
+    db.commit()
+
+    assert [row.id for row in repo.search_documents("robotics")] == [4]
+    assert [row.id for row in repo.search_documents("chess", status="approved")] == [3]
+    assert {row.id for row in repo.search_documents("orlova")} == {2, 3}
+    assert repo.search_documents("sokolova") == []
+
+    db.delete(db.get(Achievement, 4))
+    db.commit()
+    assert repo.search_documents("robotics") == []
+
+
+def test_search_total_is_capped(db):
+    repo = AchievementRepository(db)
+
+    assert str(repo.search_total(3)) == "3"
+    assert str(repo.search_total(100)) == "100+"
+
+
+def test_documents_page_without_query(db):
+    page = AchievementRepository(db).get_documents_page(status="pending", sort_by="title", sort_order="asc")
+
+    assert [row.title for row in page.items] == ["Chess tournament", "Hackathon"]
+
+
+def test_postgres_query_uses_trigram_expressions():
+    captured = []
+
+    class FakeSession:
+        def execute(self, query):
+            captured.append(str(query.compile(dialect=postgresql.dialect())))
+            return type("Result", (), {"scalars": lambda self: []})()
+
+    PostgresAchievementSearch().search_ids(FakeSession(), "Olympiad", "pending")
+
+    assert "lower(coalesce(achievements.title, '')" in captured[0]
+    assert "similarity(" in captured[0]
@@ -0,0 +1,43 @@
+import pytest
+
+from app.repositories.admin.achievement_repository import AsyncAchievementRepository
+from app.models.user import Users
+from app.models.achievement import Achievement
+from app.models.enums import AchievementStatus
+
+
+@pytest.mark.asyncio
+async def test_get_by_user_and_count(sqlite_connection):
+    async with sqlite_connection.get_async_session() as db:
+        repo = AsyncAchievementRepository(db)
+        db.add(Users(id=1, email="student@example.com", first_name="John", last_name="Doe"))
+        await db.commit()
+        for i in range(25):
+            await repo.create({"user_id": 1, "title": f"Doc {i}", "file_path": f"static/{i}.png",
+                               "status": AchievementStatus.PENDING})
+
+        first_page = await repo.get_by_user(1, page=1)
+        second_page = await repo.get_by_user(1, page=2)
+        total = await repo.count_by_user(1)
+
+    await sqlite_connection.dispose_async()
+
+    assert len(first_page) == 20
+    assert len(second_page) == 5
+    assert total == 25
+    assert all(isinstance(item, Achievement) for item in first_page)
+
+
+@pytest.mark.asyncio
+async def test_update_and_delete(sqlite_connection):
+    async with sqlite_connection.get_async_session() as db:
+        repo = AsyncAchievementRepository(db)
+        achievement = await repo.create({"title": "Doc", "file_path": "static/doc.png"})
+
+        updated = await repo.update(achievement.id, {"status": AchievementStatus.APPROVED})
+        assert updated.status == AchievementStatus.APPROVED
+
+        await repo.delete(achievement.id)
+        assert await repo.find(achievement.id) is None
+
+    await sqlite_connection.dispose_async()
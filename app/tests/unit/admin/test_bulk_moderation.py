@@ -0,0 +1,40 @@
+import pytest
+
+from app.repositories.admin.user_repository import UserRepository
+from app.services.admin.user_service import UserService
+from app.models.user import Users
+from app.models.enums import UserRole, UserStatus
+
+
+@pytest.fixture
+def service(sqlite_session):
+    for i in range(1, 5):
+        sqlite_session.add(Users(id=i, email=f"user{i}@example.com", role=UserRole.GUEST,
+                                 status=UserStatus.ACTIVE if i == 4 else UserStatus.PENDING))
+    sqlite_session.commit()
+    return UserService(UserRepository(sqlite_session))
+
+
+def test_bulk_approve_users(service):
+    results = service.bulk_moderate([1, 2, 4, 5], approve=True)
+
+    assert results == {1: "updated", 2: "updated", 4: "skipped", 5: "not_found"}
+    service.repository.db.expire_all()
+    approved = service.repository.find(1)
+    assert approved.status == UserStatus.ACTIVE and approved.role == UserRole.STUDENT
+
+
+def test_bulk_reject_users_uses_single_update(service):
+    from sqlalchemy import event
+
+    statements = []
+    engine = service.repository.db.get_bind()
+    listener = lambda *args: statements.append(args[2])
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        results = service.bulk_moderate([1, 2, 3], approve=False)
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+
+    assert set(results.values()) == {"updated"}
+    assert len(statements) == 1 and statements[0].startswith("UPDATE users")
@@ -0,0 +1,53 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.models.user import Users
+from app.models.achievement import Achievement
+from app.models.enums import UserStatus, AchievementStatus
+from app.services.admin.dashboard_service import DashboardService, dashboard_cache
+
+
+@pytest.fixture
+def db(sqlite_session):
+    now = datetime.now()
+    sqlite_session.add_all([
+        Users(id=1, email="a@example.com", status=UserStatus.ACTIVE, created_at=now),
+        Users(id=2, email="b@example.com", status=UserStatus.PENDING, created_at=now - timedelta(days=1)),
+        Users(id=3, email="c@example.com", status=UserStatus.PENDING, created_at=now - timedelta(days=30)),
+        Achievement(user_id=1, title="A", file_path="a", status=AchievementStatus.APPROVED),
+        Achievement(user_id=1, title="B", file_path="b", status=AchievementStatus.PENDING),
+        Achievement(user_id=2, title="C", file_path="c", status=AchievementStatus.REJECTED),
+    ])
+    sqlite_session.commit()
+    dashboard_cache.clear()
+    yield sqlite_session
+    dashboard_cache.clear()
+
+
+def test_staff_snapshot(db):
+    snapshot = DashboardService(db).get_staff_snapshot()
+
+    assert snapshot['stats'] == {
+        'users_total': 3, 'users_active': 1, 'users_pending': 2, 'users_rejected': 0, 'users_deleted': 0,
+        'docs_total': 3, 'docs_pending': 1, 'docs_approved': 1, 'docs_rejected': 1,
+    }
+    assert len(snapshot['chart_data']['labels']) == 7
+    assert snapshot['chart_data']['data'][-2:] == [1, 1]
+    assert sum(snapshot['chart_data']['data']) == 2
+
+
+def test_student_snapshot(db):
+    snapshot = DashboardService(db).get_student_snapshot(1)
+
+    assert snapshot['stats'] == {'my_total': 2, 'my_approved': 1, 'my_pending': 1, 'my_rejected': 0}
+
+
+def test_snapshot_is_cached(db):
+    service = DashboardService(db)
+    first = service.get_student_snapshot(1)
+
+    db.add(Achievement(user_id=1, title="D", file_path="d", status=AchievementStatus.PENDING))
+    db.commit()
+
+    assert service.get_student_snapshot(1) is first
@@ -0,0 +1,69 @@
+import os
+
+import pytest
+
+from app.infrastructure.previews import preview_generator
+from app.infrastructure.uploads import PendingUpload
+from app.models.file_blob import FileBlob
+from app.models.user import Users
+from app.repositories.admin.achievement_repository import AchievementRepository
+from app.repositories.admin.file_blob_repository import FileBlobRepository
+from app.schemas.admin.achievements import AchievementCreate
+from app.services.admin.achievement_service import AchievementService
+
+
+@pytest.fixture
+def service(sqlite_session, monkeypatch):
+    monkeypatch.setattr(preview_generator, "schedule", lambda achievement_id, file_path: None)
+    sqlite_session.add(Users(id=1, email="a@example.com"))
+    sqlite_session.commit()
+    return AchievementService(AchievementRepository(sqlite_session))
+
+
+def upload(tmp_path, content: bytes, spool_size: int = 1024) -> PendingUpload:
+    pending = PendingUpload(str(tmp_path / "uploads"), "scan.png", "image/png", limit=1 << 20, spool_size=spool_size)
+    pending.write(content)
+    pending.finish()
+    return pending
+
+
+def test_duplicate_uploads_share_one_file(service, tmp_path):
+    content = os.urandom(4096)  # больше spool_size — файл уже во временном файле на диске
+
+    first = service.create(1, AchievementCreate(title="One"), upload(tmp_path, content))
+    second = service.create(1, AchievementCreate(title="Two"), upload(tmp_path, content))
+
+    assert first.file_path == second.file_path
+    assert first.file_sha256 == second.file_sha256
+    assert os.listdir(tmp_path / "uploads") == [os.path.basename(first.file_path)]
+    assert service.repo.db.get(FileBlob, first.file_sha256).ref_count == 2
+
+
+def test_file_is_removed_with_last_reference(service, tmp_path):
+    content = b"same scan"
+    first = service.create(1, AchievementCreate(title="One"), upload(tmp_path, content))
+    second = service.create(1, AchievementCreate(title="Two"), upload(tmp_path, content))
+
+    assert service.delete(first.id, 1, "student")
+    assert os.path.exists(second.file_path)
+    assert service.repo.db.get(FileBlob, second.file_sha256).ref_count == 1
+
+    assert service.delete(second.id, 1, "student")
+    assert not os.path.exists(second.file_path)
+    assert service.repo.db.get(FileBlob, second.file_sha256) is None
+
+
+def test_failed_release_keeps_document_and_reference(service, tmp_path, monkeypatch):
+    achievement = service.create(1, AchievementCreate(title="One"), upload(tmp_path, b"scan"))
+
+    def broken_release(self, sha256):
+        raise RuntimeError("connection lost")
+
+    monkeypatch.setattr(FileBlobRepository, "release", broken_release)
+    with pytest.raises(RuntimeError):
+        service.delete(achievement.id, 1, "student")
+
+    # Удаление документа и счетчик ссылок откатываются вместе
+    assert service.repo.find(achievement.id) is not None
+    assert service.repo.db.get(FileBlob, achievement.file_sha256).ref_count == 1
+    assert os.path.exists(achievement.file_path)
@@ -0,0 +1,83 @@
+import pytest
+from datetime import datetime, timedelta
+
+from app.repositories.admin.user_repository import UserRepository
+from app.repositories.admin.pagination import encode_cursor, decode_cursor, NEXT
+from app.models.user import Users
+from app.models.enums import UserStatus
+
+
+@pytest.fixture
+def db(sqlite_session):
+    started = datetime(2025, 1, 1)
+    for i in range(1, 46):
+        sqlite_session.add(Users(id=i, email=f"user{i}@example.com", first_name=f"User{i}", last_name="Test",
+                                 status=UserStatus.PENDING if i % 3 else UserStatus.ACTIVE,
+                                 created_at=started + timedelta(days=i % 7)))
+    sqlite_session.commit()
+    # Каждый пятый без даты — проверяем NULL в сортировке (server_default подставил бы now())
+    sqlite_session.query(Users).filter(Users.id % 5 == 0).update({Users.created_at: None})
+    sqlite_session.commit()
+    return sqlite_session
+
+
+def walk(repo, sort_by, sort_order, filters=None):
+    pages, cursor = [], None
+    while True:
+        page = repo.get_page(filters, sort_by, sort_order, cursor)
+        pages.append(page)
+        if not page.next_cursor:
+            return pages
+        cursor = page.next_cursor
+
+
+@pytest.mark.parametrize("sort_by,sort_order", [("id", "desc"), ("created_at", "desc"), ("created_at", "asc")])
+def test_forward_walk_covers_every_row_once(db, sort_by, sort_order):
+    repo = UserRepository(db)
+    pages = walk(repo, sort_by, sort_order)
+    ids = [user.id for page in pages for user in page.items]
+
+    assert len(ids) == 45 and len(set(ids)) == 45
+    assert [len(page.items) for page in pages] == [20, 20, 5]
+    assert pages[0].prev_cursor is None
+    if sort_by == "created_at":
+        # NULL-значения всегда в конце
+        assert all(user.created_at is None for user in pages[-1].items)
+
+
+def test_prev_cursor_returns_previous_page(db):
+    repo = UserRepository(db)
+    pages = walk(repo, "created_at", "desc")
+
+    back = repo.get_page(None, "created_at", "desc", pages[2].prev_cursor)
+    assert [u.id for u in back.items] == [u.id for u in pages[1].items]
+
+    first = repo.get_page(None, "created_at", "desc", back.prev_cursor)
+    assert [u.id for u in first.items] == [u.id for u in pages[0].items]
+    assert first.prev_cursor is None
+
+
+def test_filters_apply_to_pages(db):
+    repo = UserRepository(db)
+    pages = walk(repo, "id", "asc", {"status": UserStatus.PENDING})
+    items = [user for page in pages for user in page.items]
+
+    assert len(items) == 30
+    assert all(user.status == UserStatus.PENDING for user in items)
+    assert [u.id for u in items] == sorted(u.id for u in items)
+
+
+def test_invalid_cursor_means_first_page(db):
+    repo = UserRepository(db)
+    page = repo.get_page(None, "id", "desc", "not-a-cursor")
+
+    assert page.items[0].id == 45
+
+
+def test_cursor_round_trip_keeps_types(db):
+    user = db.get(Users, 1)
+    cursor = decode_cursor(Users.created_at, encode_cursor(Users.created_at, user, NEXT))
+
+    assert cursor.value == user.created_at
+    assert cursor.id == 1
+    assert cursor.direction == NEXT
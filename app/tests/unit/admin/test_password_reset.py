@@ -0,0 +1,50 @@
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+from passlib.context import CryptContext
+
+from app.models.enums import UserRole, UserStatus, UserTokenType
+from app.models.user import Users
+from app.models.user_token import UserToken
+from app.repositories.admin.user_repository import UserRepository
+from app.services.admin.user_service import UserService
+
+
+@pytest.fixture
+def service(sqlite_session):
+    sqlite_session.add(Users(id=1, email="anna@example.com", hashed_password="old", role=UserRole.STUDENT,
+                             status=UserStatus.ACTIVE))
+    sqlite_session.add_all([
+        UserToken(user_id=1, token="valid", type=UserTokenType.RESET_PASSWORD,
+                  expires_at=datetime.utcnow() + timedelta(hours=2)),
+        UserToken(user_id=1, token="expired", type=UserTokenType.RESET_PASSWORD,
+                  expires_at=datetime.utcnow() - timedelta(minutes=1)),
+    ])
+    sqlite_session.commit()
+    return UserService(UserRepository(sqlite_session))
+
+
+@pytest.mark.asyncio
+async def test_reset_password_sets_hash_and_consumes_token(service):
+    await service.reset_password("valid", "NewPass1!")
+
+    db = service.repository.getDb()
+    assert CryptContext(schemes=["bcrypt"]).verify("NewPass1!", db.get(Users, 1).hashed_password)
+    assert db.query(UserToken).filter(UserToken.token == "valid").first() is None
+
+
+@pytest.mark.asyncio
+async def test_reset_password_rejects_weak_password_and_keeps_token(service):
+    with pytest.raises(ValueError, match="admin.auth.password_too_short"):
+        await service.reset_password("valid", "short")
+
+    db = service.repository.getDb()
+    assert db.get(Users, 1).hashed_password == "old"
+    assert db.query(UserToken).filter(UserToken.token == "valid").first() is not None
+
+
+@pytest.mark.asyncio
+async def test_reset_password_rejects_expired_token(service):
+    with pytest.raises(HTTPException):
+        await service.reset_password("expired", "NewPass1!")
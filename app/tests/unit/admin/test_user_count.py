@@ -0,0 +1,65 @@
+import pytest
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+from app.repositories.admin.user_repository import UserRepository, users_count_cache
+from app.repositories.admin.counting import TotalCount, _Explain, EXACT, CAPPED, ESTIMATE
+from app.models.user import Users
+from app.models.enums import UserRole, UserStatus
+from app.schemas.admin.users import UserCreate
+
+
+@pytest.fixture
+def repo(sqlite_session):
+    for i in range(30):
+        sqlite_session.add(Users(email=f"user{i}@example.com", first_name="Anna" if i < 12 else "Boris",
+                                 last_name="Test", role=UserRole.STUDENT,
+                                 status=UserStatus.ACTIVE if i % 2 else UserStatus.PENDING))
+    sqlite_session.commit()
+    users_count_cache.clear()
+    yield UserRepository(sqlite_session)
+    users_count_cache.clear()
+
+
+def test_count_uses_list_filters(repo):
+    filters = {'query': 'anna', 'role': None, 'status': UserStatus.ACTIVE}
+
+    assert repo.count(filters, EXACT) == TotalCount(6)
+    assert len(repo.get(filters)) == 6
+
+
+def test_capped_count(repo):
+    repo.COUNT_CAP = 10
+
+    assert str(repo.count({'query': 'anna'}, CAPPED)) == "10+"
+    assert str(repo.count({'query': 'nobody'}, CAPPED)) == "0"
+
+
+def test_estimate_falls_back_to_capped_outside_postgres(repo):
+    repo.COUNT_CAP = 1000
+
+    total = repo.count({'query': 'boris'}, ESTIMATE)
+
+    assert total.value == 18 and total.strategy == CAPPED
+
+
+def test_unfiltered_count_is_cached_until_user_write(repo):
+    assert repo.count(strategy=EXACT).value == 30
+
+    repo.db.add(Users(email="late@example.com", first_name="Late", last_name="Test"))
+    repo.db.commit()
+    assert repo.count(strategy=EXACT).value == 30
+
+    # Каждая запись через репозиторий сбрасывает кэш: значения отличаются от закэшированного
+    repo.create(UserCreate(email="new@example.com", first_name="New", last_name="Test", role=UserRole.STUDENT))
+    assert repo.count(strategy=EXACT).value == 32
+
+    repo.hard_delete(1)
+    assert repo.count(strategy=EXACT).value == 31
+
+
+def test_explain_compiles_for_postgres():
+    statement = select(Users.id).where(Users.first_name.ilike('%a%'))
+    sql = str(_Explain(statement).compile(dialect=postgresql.dialect()))
+
+    assert sql.startswith('EXPLAIN (FORMAT JSON) SELECT')
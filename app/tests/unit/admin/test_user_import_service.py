@@ -0,0 +1,58 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.repositories.admin.user_repository import UserRepository
+from app.services.admin.user_import_service import UserImportService, read_rows
+from app.models.user import Users
+from app.models.user_token import UserToken
+from app.models.email_outbox import EmailOutbox
+from app.models.enums import UserRole, UserStatus
+
+
+@pytest.fixture
+def repository(sqlite_session):
+    sqlite_session.add(Users(email="taken@example.com", first_name="Old", last_name="User",
+                             role=UserRole.STUDENT, status=UserStatus.ACTIVE))
+    sqlite_session.commit()
+    return UserRepository(sqlite_session)
+
+
+def test_import_csv_skips_invalid_and_duplicate_rows(repository, tmp_path):
+    path = tmp_path / "users.csv"
+    path.write_text(
+        "email,first_name,last_name,password\n"
+        "anna@example.com,Anna,Ivanova,secret123\n"
+        "not-an-email,Bad,Row,\n"
+        "TAKEN@example.com,Old,User,\n"
+        "anna@example.com,Anna,Again,\n"
+        "boris@example.com,Boris,Petrov,\n"
+    )
+
+    with ThreadPoolExecutor(2) as executor:
+        report = UserImportService(repository, executor, batch_size=2).run(read_rows(str(path)))
+
+    assert (report.read, report.created, report.duplicates, report.invalid) == (5, 2, 2, 1)
+    anna = repository.db.query(Users).filter_by(email="anna@example.com").one()
+    assert anna.role == UserRole.STUDENT and anna.status == UserStatus.ACTIVE
+    assert anna.hashed_password.startswith("$2")
+
+
+def test_import_ndjson_queues_welcome_emails(repository, tmp_path):
+    path = tmp_path / "users.ndjson"
+    path.write_text("\n".join(json.dumps({"email": f"user{i}@example.com", "first_name": "User",
+                                          "last_name": str(i), "password": f"Secret{i}!"}) for i in range(3)))
+
+    with ThreadPoolExecutor(2) as executor:
+        service = UserImportService(repository, executor, send_welcome=True)
+        report = service.run(read_rows(str(path)))
+
+    assert report.created == 3 and report.emails_queued == 3
+    outbox = repository.db.query(EmailOutbox).order_by(EmailOutbox.id).all()
+    assert [message.to for message in outbox] == [f"user{i}@example.com" for i in range(3)]
+    tokens = repository.db.query(UserToken).all()
+    assert len(tokens) == 3
+    assert any(tokens[0].token in message.body for message in outbox)
+    assert "Welcome User" in outbox[0].body and "/admin/reset-password/" in outbox[0].body
+    assert not any(f"Secret{i}!" in message.body for i, message in enumerate(outbox))
@@ -0,0 +1,65 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
+
+from app.repositories.admin.user_repository import UserRepository
+from app.repositories.admin.user_search import PostgresUserSearch, get_user_search
+from app.models.user import Users
+
+
+@pytest.fixture
+def db(sqlite_session):
+    sqlite_session.add_all([
+        Users(email="ivan.petrov@example.com", first_name="Ivan", last_name="Petrov", phone_number="+79001112233"),
+        Users(email="maria@example.com", first_name="Maria", last_name="Ivanova"),
+        Users(email="oleg@example.com", first_name="Oleg", last_name="Sidorov"),
+    ])
+    sqlite_session.commit()
+    return sqlite_session
+
+
+def search(db, term):
+    return get_user_search(db).ranked(db.query(Users), term).all()
+
+
+def test_existing_rows_are_indexed_on_first_search(db):
+    assert {u.last_name for u in search(db, "ivan")} == {"Petrov", "Ivanova"}
+    assert db.execute(text("SELECT count(*) FROM users_fts")).scalar() == 3
+
+
+def test_index_follows_inserts_and_updates(db):
+    search(db, "warm-up")
+
+    db.add(Users(email="new@example.com", first_name="Svetlana", last_name="Orlova"))
+    oleg = db.query(Users).filter(Users.first_name == "Oleg").one()
+    oleg.last_name = "Kuznetsov"
+    db.commit()
+
+    assert [u.first_name for u in search(db, "svetl")] == ["Svetlana"]
+    assert [u.first_name for u in search(db, "kuznets")] == ["Oleg"]
+    assert search(db, "sidorov") == []
+
+
+def test_filters_use_search_backend(db):
+    repo = UserRepository(db)
+
+    assert [u.first_name for u in repo.get({"query": "9001112"})] == ["Ivan"]
+    assert repo.count({"query": "example.com"}, "exact").value == 3
+
+
+def test_short_terms_fall_back_to_like(db):
+    assert {u.first_name for u in search(db, "iv")} == {"Ivan", "Maria"}
+
+
+def test_special_characters_are_escaped(db):
+    assert search(db, '"%_') == []
+    assert search(db, "%") == []
+
+
+def test_postgres_filter_uses_trigram_expression(db):
+    query = PostgresUserSearch().ranked(db.query(Users), "Ivan")
+    sql = str(query.statement.compile(dialect=postgresql.dialect()))
+
+    assert "lower(coalesce(users.first_name, '')" in sql
+    assert "similarity(" in sql
+
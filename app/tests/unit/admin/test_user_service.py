@@ -1,6 +1,5 @@
 import pytest
 from unittest.mock import MagicMock, patch, AsyncMock
-from starlette.requests import Request
 
 from app.models.user import Users
 from app.services.admin.user_service import UserService
@@ -23,7 +22,7 @@ def _get_user():
         first_name="John",
         last_name="Doe",
         is_active=True,
-        role=UserRole.ADMIN,
+        role=UserRole.SUPER_ADMIN,
         phone_number="123456"
     )
 
@@ -34,17 +33,18 @@ def test_get_users(service, mock_repo):
     assert isinstance(result[0], UserOut)
     mock_repo.get.assert_called_once()
 
-@patch("services.admin.user_service.asyncio.create_task")
-@patch("services.admin.user_service.UserTokenService")
-@patch("services.admin.user_service.send", new_callable=AsyncMock)
-@patch("services.admin.user_service.templates")
-def test_create_user(mock_templates, mock_send, mock_token_service, mock_create_task, service, mock_repo):
-    mock_create_task.return_value = None
+@pytest.mark.asyncio
+@patch("app.services.admin.user_service.password_hasher.hash", new_callable=AsyncMock)
+@patch("app.services.admin.user_service.UserTokenService")
+@patch("app.services.admin.user_service.queue_email")
+@patch("app.services.admin.user_service.email_templates")
+async def test_create_user(mock_templates, mock_queue_email, mock_token_service, mock_hash, service, mock_repo):
+    mock_hash.return_value = "hashed-generated"
     obj_in = UserCreate(
         email="new@example.com",
         first_name="John",
         last_name="Doe",
-        role=UserRole.USER,
+        role=UserRole.STUDENT,
         hashed_password=None
     )
 
@@ -57,21 +57,17 @@ def test_create_user(mock_templates, mock_send, mock_token_service, mock_create_
     mock_token.token = "reset123"
     mock_token_service.return_value.create.return_value = mock_token
 
-    mock_template = MagicMock()
-    mock_template.render.return_value = "html-content"
-    mock_templates.env.get_template.return_value = mock_template
+    mock_templates.render.return_value = "html-content"
 
-    request = MagicMock(spec=Request)
-    request.url_for.return_value = "http://test/reset"
-    service.set_request(request)
-
-    result = service.create(obj_in)
+    result = await service.create(obj_in)
 
     assert result == user
+    mock_hash.assert_awaited_once()
+    assert obj_in.hashed_password == "hashed-generated"
     mock_repo.create.assert_called_once()
     mock_token_service.return_value.create.assert_called_once()
-    mock_send.assert_called_once_with(
-        "new@example.com", "Welcome", "html-content"
+    mock_queue_email.assert_called_once_with(
+        mock_repo.getDb.return_value, to="new@example.com", subject="Welcome", body="html-content"
     )
 
 def test_update_user(service, mock_repo):
@@ -80,7 +76,7 @@ def test_update_user(service, mock_repo):
         first_name= "John",
         last_name= "Doe",
         email = "john.doe@example.com",
-        role= UserRole.USER
+        role= UserRole.STUDENT
     )
 
     user = MagicMock()
@@ -99,15 +95,17 @@ def test_update_user(service, mock_repo):
     assert result.first_name == data.first_name
     assert result.role == data.role
 
-def test_update_password(service, mock_repo):
+@pytest.mark.asyncio
+async def test_update_password(service, mock_repo):
     user_id = 1
     password = "test123"
     hashed_password = "hashTest123"
 
-    with patch("services.admin.user_service.bcrypt_context.hash", return_value=hashed_password) as mock_hash:
-        service.update_password(user_id, password)
+    with patch("app.services.admin.user_service.password_hasher.hash", new_callable=AsyncMock,
+               return_value=hashed_password) as mock_hash:
+        await service.update_password(user_id, password)
 
-        mock_hash.assert_called_once_with(password)
+        mock_hash.assert_awaited_once_with(password)
         mock_repo.update_password.assert_called_once_with(user_id, hashed_password)
 
 
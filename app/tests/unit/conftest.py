@@ -0,0 +1,22 @@
+import pytest
+
+from app.infrastructure.database.connection import Base
+from app.infrastructure.database.connections.sqllite import SQLite
+# Модели регистрируются в Base при импорте: create_all должен видеть все таблицы и связи
+from app.models import achievement, email_outbox, file_blob, page, user, user_token  # noqa: F401
+
+
+@pytest.fixture
+def sqlite_connection(tmp_path):
+    """Файловая SQLite-база со всеми таблицами, своя на каждый тест."""
+    connection = SQLite(Base, str(tmp_path / "test"))
+    connection.create_all()
+    yield connection
+    connection.dispose()
+
+
+@pytest.fixture
+def sqlite_session(sqlite_connection):
+    session = sqlite_connection.get_session()
+    yield session
+    session.close()
@@ -0,0 +1,44 @@
+import pytest
+
+from app.infrastructure.database import connection
+
+
+@pytest.fixture
+def sqlite_env(monkeypatch, tmp_path):
+    monkeypatch.setenv("DB_DRIVER", "sqlite")
+    monkeypatch.setenv("DB_NAME", str(tmp_path / "registry"))
+    monkeypatch.setenv("DB_POOL_SIZE", "3")
+    monkeypatch.setenv("DB_MAX_OVERFLOW", "2")
+    yield
+    connection.dispose_database_connections()
+
+
+def test_get_database_connection_is_cached(sqlite_env):
+    first = connection.get_database_connection()
+    second = connection.get_database_connection()
+
+    assert first is second
+    assert first.engine is second.engine
+
+
+def test_engine_options_from_env(sqlite_env):
+    db_connection = connection.get_database_connection()
+
+    assert db_connection.engine.pool.size() == 3
+    assert db_connection.engine.pool._max_overflow == 2
+
+
+def test_pool_status_reports_checked_out(sqlite_env):
+    db_connection = connection.get_database_connection()
+    with db_connection.engine.connect():
+        status = connection.get_pool_status()
+
+    assert status[0]["driver"] == "sqlite"
+    assert status[0]["checkedout"] == 1
+
+
+def test_dispose_clears_registry(sqlite_env):
+    first = connection.get_database_connection()
+    connection.dispose_database_connections()
+
+    assert connection.get_database_connection() is not first
@@ -0,0 +1,110 @@
+import asyncio
+from datetime import datetime
+
+import pytest
+
+from app.infrastructure.database.unit_of_work import UnitOfWork
+from app.infrastructure.email_outbox import EmailOutboxWorker
+from app.repositories.admin.email_outbox_repository import EmailOutboxRepository
+from app.models.email_outbox import EmailOutbox
+from app.models.enums import EmailOutboxStatus
+
+
+class LocalSMTPServer:
+    """Минимальный SMTP-сервер для тестов: принимает письма, отклоняет адреса из reject."""
+
+    def __init__(self, reject=()):
+        self.reject = set(reject)
+        self.messages = []
+        self.connections = 0
+
+    async def handle(self, reader, writer):
+        self.connections += 1
+        writer.write(b"220 localhost ESMTP\r\n")
+        recipient = None
+        while line := await reader.readline():
+            command = line.decode().strip()
+            verb = command.split(" ")[0].upper()
+            if verb in ("EHLO", "HELO"):
+                writer.write(b"250 localhost\r\n")
+            elif verb == "RCPT":
+                recipient = command.split(":", 1)[1].strip().strip("<>")
+                writer.write(b"550 No such user\r\n" if recipient in self.reject else b"250 OK\r\n")
+            elif verb == "DATA":
+                writer.write(b"354 End data with <CR><LF>.<CR><LF>\r\n")
+                await writer.drain()
+                data = b""
+                while not data.endswith(b"\r\n.\r\n"):
+                    data += await reader.readline()
+                self.messages.append((recipient, data.decode()))
+                writer.write(b"250 OK\r\n")
+            elif verb == "QUIT":
+                writer.write(b"221 Bye\r\n")
+                await writer.drain()
+                break
+            else:
+                writer.write(b"250 OK\r\n")
+            await writer.drain()
+        writer.close()
+
+
+def make_worker(connection, port):
+    return EmailOutboxWorker(hostname="127.0.0.1", port=port, username="", password="", use_tls=False,
+                             start_tls=False, from_email="noreply@example.com", batch_size=10,
+                             retry_backoff=30, uow_factory=lambda: UnitOfWork(connection))
+
+
+def enqueue(connection, *recipients):
+    session = connection.get_session()
+    for to in recipients:
+        EmailOutboxRepository(session).enqueue(to, "Welcome", f"<b>Hello {to}</b>")
+    session.close()
+
+
+def statuses(connection):
+    session = connection.get_session()
+    try:
+        return {message.to: message for message in session.query(EmailOutbox)}
+    finally:
+        session.close()
+
+
+@pytest.mark.asyncio
+async def test_delivers_batch_over_one_connection(sqlite_connection):
+    server = LocalSMTPServer(reject={"missing@example.com"})
+    smtp = await asyncio.start_server(server.handle, "127.0.0.1", 0)
+    worker = make_worker(sqlite_connection, smtp.sockets[0].getsockname()[1])
+    enqueue(sqlite_connection, "a@example.com", "missing@example.com", "b@example.com")
+    try:
+        assert await worker.deliver_batch() == 3
+        await worker._disconnect()
+    finally:
+        smtp.close()
+        await smtp.wait_closed()
+
+    assert server.connections == 1
+    assert [to for to, _ in server.messages] == ["a@example.com", "b@example.com"]
+    assert "Hello a@example.com" in server.messages[0][1]
+    result = statuses(sqlite_connection)
+    assert result["a@example.com"].status == EmailOutboxStatus.SENT
+    assert result["missing@example.com"].status == EmailOutboxStatus.FAILED
+    # После отправки (и окончательной ошибки) тело с ссылками из письма не хранится
+    assert result["a@example.com"].body == "" and result["missing@example.com"].body == ""
+
+
+@pytest.mark.asyncio
+async def test_unreachable_server_schedules_retry(sqlite_connection):
+    smtp = await asyncio.start_server(lambda reader, writer: None, "127.0.0.1", 0)
+    port = smtp.sockets[0].getsockname()[1]
+    smtp.close()
+    await smtp.wait_closed()
+    enqueue(sqlite_connection, "a@example.com", "b@example.com")
+
+    assert await make_worker(sqlite_connection, port).deliver_batch() == 2
+
+    for message in statuses(sqlite_connection).values():
+        assert message.status == EmailOutboxStatus.PENDING and message.attempts == 1
+        assert message.next_attempt_at > datetime.utcnow()
+    session = sqlite_connection.get_session()
+    assert EmailOutboxRepository(session).claim(10, 300) == []
+    session.close()
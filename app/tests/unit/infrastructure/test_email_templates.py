@@ -0,0 +1,19 @@
+import pytest
+from jinja2 import UndefinedError
+
+from app.infrastructure.email_templates import EmailTemplates, reset_password_url
+
+
+def test_renders_from_plain_context_without_request():
+    templates = EmailTemplates()
+    templates.load()
+
+    body = templates.render('reset_password', {'user': {'first_name': '<Anna>'}, 'url': reset_password_url('abc')})
+
+    assert 'Hi &lt;Anna&gt;' in body
+    assert '/admin/reset-password/abc' in body
+
+
+def test_missing_context_fails_loudly():
+    with pytest.raises(UndefinedError):
+        EmailTemplates().render('welcome', {'user': {'first_name': 'Anna'}})
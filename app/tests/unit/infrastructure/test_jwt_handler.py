@@ -0,0 +1,36 @@
+from datetime import timedelta
+from unittest.mock import patch
+
+from app.infrastructure import jwt_handler
+from app.infrastructure.jwt_handler import create_access_token, create_refresh_token, verify_token, verified_tokens
+
+
+def test_repeat_verification_skips_decode():
+    verified_tokens.clear()
+    token = create_access_token({"sub": "1"})
+
+    first = verify_token(token)
+    with patch.object(jwt_handler.jwt, "decode", side_effect=AssertionError("decoded twice")):
+        second = verify_token(token)
+
+    assert first == second and second["sub"] == "1"
+    second["sub"] = "2"
+    assert verify_token(token)["sub"] == "1"
+
+
+def test_access_and_refresh_namespaces_are_separate():
+    verified_tokens.clear()
+    access, refresh = create_access_token({"sub": "1"}), create_refresh_token({"sub": "1"})
+
+    assert verify_token(access) is not None
+    assert verify_token(access, refresh=True) is None
+    assert verify_token(refresh, refresh=True)["type"] == "refresh"
+    assert verify_token(refresh) is None
+
+
+def test_entry_expires_with_token():
+    verified_tokens.clear()
+    token = create_access_token({"sub": "1"}, expires_delta=timedelta(seconds=-1))
+
+    assert verify_token(token) is None
+    assert len(verified_tokens) == 0
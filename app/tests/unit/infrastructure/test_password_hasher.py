@@ -0,0 +1,47 @@
+import asyncio
+import threading
+
+import pytest
+from passlib.context import CryptContext
+
+from app.infrastructure.password_hasher import PasswordHasher, PasswordHasherBusy
+
+
+@pytest.mark.asyncio
+async def test_hash_and_verify_run_in_pool():
+    hasher = PasswordHasher(max_workers=2, max_queue=2,
+                            context=CryptContext(schemes=['bcrypt'], bcrypt__rounds=4))
+    try:
+        hashed = await hasher.hash("Secret123!")
+
+        assert await hasher.verify("Secret123!", hashed)
+        assert not await hasher.verify("wrong", hashed)
+        stats = hasher.stats()
+        assert stats['completed'] == 3 and stats['in_flight'] == 0 and stats['rejected'] == 0
+    finally:
+        hasher.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_rejects_when_queue_is_full():
+    release = threading.Event()
+
+    class SlowContext:
+        def hash(self, password):
+            release.wait(5)
+            return password
+
+    hasher = PasswordHasher(max_workers=1, max_queue=1, context=SlowContext())
+    try:
+        running = [asyncio.create_task(hasher.hash(str(i))) for i in range(2)]
+        await asyncio.sleep(0)
+
+        with pytest.raises(PasswordHasherBusy):
+            await hasher.hash("overflow")
+
+        release.set()
+        assert await asyncio.gather(*running) == ["0", "1"]
+        assert hasher.stats()['rejected'] == 1
+    finally:
+        release.set()
+        hasher.shutdown()
@@ -0,0 +1,43 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.infrastructure.pending_counters import PendingCounters
+
+
+@pytest.fixture
+def db():
+    db = MagicMock()
+    db.execute.return_value.one.return_value = (3, 7)
+    return db
+
+
+def test_get_caches_within_ttl(db):
+    counters = PendingCounters(ttl=60)
+
+    first = counters.get(db)
+    second = counters.get(db)
+
+    assert first == {PendingCounters.USERS: 3, PendingCounters.ACHIEVEMENTS: 7}
+    assert second == first
+    db.execute.assert_called_once()
+
+
+def test_invalidate_forces_refresh(db):
+    counters = PendingCounters(ttl=60)
+    counters.get(db)
+
+    db.execute.return_value.one.return_value = (2, 7)
+    counters.invalidate(PendingCounters.USERS)
+
+    assert counters.get(db)[PendingCounters.USERS] == 2
+    assert db.execute.call_count == 2
+
+
+def test_expired_ttl_forces_refresh(db):
+    counters = PendingCounters(ttl=0)
+
+    counters.get(db)
+    counters.get(db)
+
+    assert db.execute.call_count == 2
@@ -0,0 +1,53 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.infrastructure.database.unit_of_work import UnitOfWork
+from app.infrastructure.previews import PreviewGenerator, preview_path_for, render_preview
+from app.models.achievement import Achievement
+from app.repositories.admin.achievement_repository import AchievementRepository
+
+
+@pytest.fixture
+def connection(sqlite_connection, sqlite_session):
+    sqlite_session.add_all([Achievement(id=1, title="Scan", file_path="static/uploads/achievements/abc.png"),
+                            Achievement(id=2, title="Notes", file_path="static/uploads/achievements/def.docx")])
+    sqlite_session.commit()
+    return sqlite_connection
+
+
+def fake_renderer(file_path, target):
+    return None if file_path.endswith('.docx') else target
+
+
+def test_generated_preview_is_stored_on_achievement(connection):
+    generator = PreviewGenerator(executor=ThreadPoolExecutor(1), renderer=fake_renderer,
+                                 uow_factory=lambda: UnitOfWork(connection))
+
+    for row in AchievementRepository(connection.get_session()).without_preview():
+        generator.schedule(row.id, row.file_path)
+    generator.shutdown()
+
+    remaining = AchievementRepository(connection.get_session()).without_preview()
+    assert [row.id for row in remaining] == [2]
+    assert connection.get_session().get(Achievement, 1).preview_path == "static/uploads/previews/abc.webp"
+    assert generator.stats()["generated"] == 1
+
+
+def test_unsupported_files_have_no_preview(tmp_path):
+    source = tmp_path / "notes.docx"
+    source.write_bytes(b"not an image")
+
+    assert render_preview(str(source), preview_path_for(str(source), str(tmp_path))) is None
+
+
+def test_image_is_downscaled_to_webp(tmp_path):
+    Image = pytest.importorskip("PIL.Image")
+    source = tmp_path / "scan.png"
+    Image.new("RGB", (2000, 1000), "white").save(source)
+
+    target = render_preview(str(source), preview_path_for(str(source), str(tmp_path / "previews")), size=200)
+
+    with Image.open(target) as preview:
+        assert preview.format == "WEBP"
+        assert preview.size == (200, 100)
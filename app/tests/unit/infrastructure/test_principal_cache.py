@@ -0,0 +1,40 @@
+import pytest
+
+from app.infrastructure.principal_cache import PrincipalCache, principal_cache
+from app.repositories.admin.user_repository import UserRepository
+from app.models.user import Users
+from app.models.enums import UserRole, UserStatus
+
+
+@pytest.fixture
+def session(sqlite_session):
+    sqlite_session.add(Users(id=1, email="api@example.com", role=UserRole.STUDENT, status=UserStatus.ACTIVE,
+                             is_active=True))
+    sqlite_session.commit()
+    return sqlite_session
+
+
+def test_hit_does_not_touch_database(session):
+    cache = PrincipalCache(ttl=60)
+    loads = []
+
+    def load_db():
+        loads.append(1)
+        return session
+
+    first = cache.get(1, load_db)
+    second = cache.get(1, load_db)
+
+    assert first == second and first.role == UserRole.STUDENT and first.is_allowed
+    assert len(loads) == 1
+    assert cache.get(2, load_db) is None
+
+
+def test_repository_update_invalidates_principal(session):
+    principal_cache.clear()
+    assert principal_cache.get(1, lambda: session).is_allowed
+
+    UserRepository(session).update(1, {"status": UserStatus.REJECTED, "is_active": False})
+
+    assert not principal_cache.get(1, lambda: session).is_allowed
+    principal_cache.clear()
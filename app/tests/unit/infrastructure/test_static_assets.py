@@ -0,0 +1,73 @@
+import hashlib
+
+import pytest
+from starlette.applications import Starlette
+from starlette.routing import Mount
+from starlette.testclient import TestClient
+
+from app.infrastructure.custom_static_files import CustomStaticFiles
+from app.infrastructure.static_assets import AssetManifest
+
+SCAN_SHA256 = hashlib.sha256(b"\x89PNG").hexdigest()
+
+
+@pytest.fixture
+def static(tmp_path):
+    (tmp_path / "assets" / "css").mkdir(parents=True)
+    (tmp_path / "assets" / "fonts").mkdir()
+    (tmp_path / "assets" / "css" / "style.css").write_text("body { color: red; }")
+    (tmp_path / "assets" / "fonts" / "icons.woff2").write_bytes(b"wOF2")
+    (tmp_path / "uploads" / "achievements").mkdir(parents=True)
+    (tmp_path / "uploads" / "scan.png").write_bytes(b"\x89PNG")
+    (tmp_path / "uploads" / "achievements" / f"{SCAN_SHA256}.png").write_bytes(b"\x89PNG")
+    return tmp_path
+
+
+@pytest.fixture
+def client(static):
+    manifest = AssetManifest(str(static)).build()
+    app = Starlette(routes=[Mount("/static", CustomStaticFiles(directory=str(static), manifest=manifest))])
+    return TestClient(app), manifest
+
+
+def test_manifest_maps_assets_to_content_hash(static):
+    manifest = AssetManifest(str(static)).build()
+    digest = hashlib.sha256(b"body { color: red; }").hexdigest()[:12]
+
+    assert manifest.path("assets/css/style.css") == f"assets/css/style.{digest}.css"
+    assert manifest.resolve(f"assets/css/style.{digest}.css") == "assets/css/style.css"
+    assert manifest.path("uploads/scan.png") == "uploads/scan.png"  # загрузки не из roots
+
+
+def test_fingerprinted_asset_is_cached_forever(client):
+    client, manifest = client
+
+    response = client.get("/static/" + manifest.path("assets/fonts/icons.woff2"))
+
+    assert response.status_code == 200
+    assert response.content == b"wOF2"
+    assert response.headers["cache-control"] == "public, max-age=31536000, immutable"
+    assert response.headers["content-type"] == "font/woff2"
+
+
+def test_other_files_revalidate_with_etag(client):
+    client, _ = client
+
+    first = client.get("/static/assets/fonts/icons.woff2")
+    second = client.get("/static/assets/fonts/icons.woff2", headers={"If-None-Match": first.headers["etag"]})
+
+    assert first.headers["cache-control"] == "no-cache"
+    assert "last-modified" in first.headers
+    assert second.status_code == 304
+    assert client.get("/static/assets/css/style.0000.css").status_code == 404
+
+
+def test_content_addressed_uploads_are_cached_forever(client):
+    client, _ = client
+
+    blob = client.get(f"/static/uploads/achievements/{SCAN_SHA256}.png")
+    legacy = client.get("/static/uploads/scan.png")
+
+    assert blob.headers["cache-control"] == "public, max-age=31536000, immutable"
+    assert legacy.status_code == 200
+    assert "cache-control" not in legacy.headers
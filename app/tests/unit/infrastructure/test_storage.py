@@ -0,0 +1,69 @@
+import os
+from urllib.parse import urlparse, parse_qs
+
+import boto3
+import pytest
+from botocore.config import Config
+from botocore.stub import Stubber, ANY
+
+from app.infrastructure.storage import LocalStorage, S3Storage, Storage
+from app.infrastructure.uploads import PendingUpload
+
+
+@pytest.fixture
+def s3():
+    client = boto3.client("s3", region_name="us-east-1", endpoint_url="http://minio.local:9000",
+                          aws_access_key_id="test", aws_secret_access_key="test",
+                          config=Config(signature_version="s3v4"))
+    with Stubber(client) as stubber:
+        yield S3Storage("documents", prefix="app", url_ttl=600, client=client), stubber
+        stubber.assert_no_pending_responses()
+
+
+def test_local_storage_roundtrip(tmp_path):
+    storage = LocalStorage(str(tmp_path))
+
+    storage.save_bytes("static/uploads/a.txt", b"hello", "text/plain")
+
+    assert storage.exists("static/uploads/a.txt")
+    assert storage.url("static/uploads/a.txt") == "/static/uploads/a.txt"
+    with storage.local_path("static/uploads/a.txt") as path:
+        assert open(path, "rb").read() == b"hello"
+    storage.delete("static/uploads/a.txt")
+    assert not storage.exists("static/uploads/a.txt")
+
+
+def test_incomplete_backend_cannot_be_created():
+    class WriteOnlyStorage(Storage):
+        def save(self, key, source_path, content_type=None):
+            pass
+
+    with pytest.raises(TypeError):
+        WriteOnlyStorage()
+
+
+def test_upload_is_committed_to_s3_without_local_copy(s3, tmp_path):
+    storage, stubber = s3
+    upload = PendingUpload(str(tmp_path / "spool"), "scan.png", "image/png", limit=1024, storage=storage)
+    upload.write(b"\x89PNG data")
+    stubber.add_response("put_object", {}, {"Bucket": "documents", "Key": f"app/{tmp_path}/spool/x.png",
+                                            "Body": ANY, "ContentType": "image/png"})
+
+    stored = upload.commit("x.png")
+
+    assert stored.path == f"{tmp_path}/spool/x.png"
+    assert not os.path.exists(tmp_path / "spool")
+
+
+def test_missing_object_and_presigned_url(s3):
+    storage, stubber = s3
+    stubber.add_client_error("head_object", service_error_code="404", http_status_code=404)
+
+    assert not storage.exists("static/uploads/gone.png")
+
+    url = urlparse(storage.url("static/uploads/a b.png"))
+    query = parse_qs(url.query)
+    assert url.netloc == "minio.local:9000"
+    assert url.path == "/documents/app/static/uploads/a%20b.png"
+    assert query["X-Amz-Expires"] == ["600"]
+    assert "X-Amz-Signature" in query
@@ -0,0 +1,50 @@
+from app.infrastructure.ttl_cache import TTLCache
+
+
+def test_get_returns_value_within_ttl():
+    cache = TTLCache(ttl=60)
+    cache.set("key", 1)
+
+    assert cache.get("key") == 1
+    assert cache.stats()["hits"] == 1
+
+
+def test_expired_value_is_a_miss():
+    cache = TTLCache(ttl=0)
+    cache.set("key", 1)
+
+    assert cache.get("key") is None
+    assert cache.stats()["misses"] == 1
+
+
+def test_evicts_least_recently_used():
+    cache = TTLCache(ttl=60, maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_get_or_set_calls_factory_once():
+    cache = TTLCache(ttl=60)
+    calls = []
+
+    def factory():
+        calls.append(1)
+        return "value"
+
+    assert cache.get_or_set("key", factory) == "value"
+    assert cache.get_or_set("key", factory) == "value"
+    assert len(calls) == 1
+
+
+def test_invalidate():
+    cache = TTLCache(ttl=60)
+    cache.set("key", 1)
+    cache.invalidate("key")
+
+    assert cache.get("key") is None
@@ -0,0 +1,61 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.infrastructure.database.unit_of_work import UnitOfWork, get_db
+
+
+@pytest.fixture
+def connection():
+    return MagicMock()
+
+
+def test_session_is_opened_lazily_once(connection):
+    uow = UnitOfWork(connection)
+
+    assert not uow.is_open
+    assert uow.session is uow.session
+    connection.get_session.assert_called_once()
+
+
+def test_complete_commits_and_closes(connection):
+    uow = UnitOfWork(connection)
+    session = uow.session
+
+    uow.complete(success=True)
+
+    session.commit.assert_called_once()
+    session.rollback.assert_not_called()
+    session.close.assert_called_once()
+    assert not uow.is_open
+
+
+def test_complete_rolls_back_on_failure(connection):
+    uow = UnitOfWork(connection)
+    session = uow.session
+
+    uow.complete(success=False)
+
+    session.rollback.assert_called_once()
+    session.commit.assert_not_called()
+    session.close.assert_called_once()
+
+
+def test_complete_without_session_does_nothing(connection):
+    UnitOfWork(connection).complete(success=True)
+
+    connection.get_session.assert_not_called()
+
+
+def test_get_db_reuses_request_session(connection):
+    uow = UnitOfWork(connection)
+    request = MagicMock()
+    request.state.uow = uow
+
+    dependency = get_db(request)
+    session = next(dependency)
+
+    assert session is uow.session
+    with pytest.raises(StopIteration):
+        next(dependency)
+    session.close.assert_not_called()
@@ -0,0 +1,60 @@
+import hashlib
+import os
+
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from app.infrastructure.uploads import UploadPolicy, UploadRejected, receive_upload
+
+
+@pytest.fixture
+def client(tmp_path):
+    policy = UploadPolicy(directory=str(tmp_path / "uploads"), limits={'image/': 1024})
+
+    async def upload(request):
+        form = None
+        try:
+            form = await receive_upload(request, policy)
+            stored = form.files['file'].commit("saved.png") if 'file' in form.files else None
+            return JSONResponse({"fields": form.fields, "file": stored._asdict() if stored else None})
+        except UploadRejected as e:
+            return JSONResponse({"error": str(e)}, status_code=400)
+        finally:
+            if form is not None:
+                form.discard()
+
+    return TestClient(Starlette(routes=[Route("/upload", upload, methods=["POST"])]))
+
+
+def test_streams_file_and_hashes_content(client, tmp_path):
+    content = b"\x89PNG" + os.urandom(600)
+
+    response = client.post("/upload", data={"title": "Diploma"}, files={"file": ("scan.png", content, "image/png")})
+
+    body = response.json()
+    assert body["fields"] == {"title": "Diploma"}
+    assert body["file"]["sha256"] == hashlib.sha256(content).hexdigest()
+    assert body["file"]["size"] == len(content)
+    assert os.listdir(tmp_path / "uploads") == ["saved.png"]
+
+
+def test_rejects_oversized_and_disallowed_files_without_leftovers(client, tmp_path):
+    too_large = client.post("/upload", files={"file": ("big.png", b"x" * 2048, "image/png")})
+    wrong_type = client.post("/upload", files={"file": ("doc.pdf", b"%PDF", "application/pdf")})
+
+    assert too_large.status_code == 400 and "too large" in too_large.json()["error"]
+    assert wrong_type.status_code == 400
+    assert not any((tmp_path / "uploads").glob("*"))
+
+
+def test_empty_file_input_is_ignored(client):
+    # Так браузер отправляет незаполненный input type=file
+    body = (b'--b\r\nContent-Disposition: form-data; name="title"\r\n\r\nNo file\r\n'
+            b'--b\r\nContent-Disposition: form-data; name="file"; filename=""\r\n'
+            b'Content-Type: application/octet-stream\r\n\r\n\r\n--b--\r\n')
+    response = client.post("/upload", content=body, headers={"content-type": "multipart/form-data; boundary=b"})
+
+    assert response.json() == {"fields": {"title": "No file"}, "file": None}
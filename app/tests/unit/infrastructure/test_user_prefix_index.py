@@ -0,0 +1,159 @@
+import threading
+import time
+
+import pytest
+
+from app.infrastructure.user_prefix_index import UserPrefixIndex, IndexedUser, user_prefix_index
+from app.repositories.admin.user_repository import UserRepository
+from app.models.user import Users
+from app.schemas.admin.users import UserCreate
+
+
+def make_index(*users):
+    index = UserPrefixIndex(ttl=60)
+    index._loaded_at = 0
+    for user in users:
+        index.upsert(user)
+    return index
+
+
+def test_prefix_search_over_names_and_email():
+    index = make_index(IndexedUser(1, "Ivan", "Petrov", "ivan@example.com", None),
+                       IndexedUser(2, "Maria", "Ivanova", "m.ivanova@example.com", None),
+                       IndexedUser(3, "Oleg", "Sidorov", "oleg@example.com", None))
+
+    assert [u.id for u in index.search("iv")] == [1, 2]
+    assert [u.id for u in index.search("  IVAN   pet")] == [1]
+    assert [u.id for u in index.search("m.iv")] == [2]
+    assert index.search("xyz") == []
+    assert len(index.search("o", limit=1)) == 1
+
+
+def test_update_and_remove():
+    index = make_index(IndexedUser(1, "Ivan", "Petrov", "ivan@example.com", None))
+
+    index.upsert(IndexedUser(1, "Ivan", "Smirnov", "ivan@example.com", None))
+    assert index.search("petrov") == []
+    assert index.search("smir")[0].last_name == "Smirnov"
+
+    index.remove(1)
+    assert index.search("ivan") == []
+    assert len(index) == 0
+
+
+@pytest.fixture
+def repo(sqlite_session):
+    sqlite_session.add(Users(email="anna@example.com", first_name="Anna", last_name="Volkova"))
+    sqlite_session.commit()
+    user_prefix_index.warm(sqlite_session)
+    yield UserRepository(sqlite_session)
+    user_prefix_index._loaded_at = None
+
+
+def test_repository_keeps_index_in_sync(repo):
+    user = repo.create(UserCreate(email="boris@example.com", first_name="Boris", last_name="Lebedev", role="student"))
+    assert isinstance(repo.search("bor")[0], IndexedUser)
+
+    repo.update(user.id, {"last_name": "Kozlov"})
+    assert repo.search("kozl")[0].id == user.id
+
+    repo.hard_delete(user.id)
+    assert user_prefix_index.search("boris") == []
+
+
+def test_repository_falls_back_to_database(repo):
+    # Подстрока из середины фамилии в префиксном индексе не найдется
+    assert [u.last_name for u in repo.search("olkov")] == ["Volkova"]
+
+
+class BlockingUnitOfWork:
+    """Сессия для фоновой перезагрузки, которая отдается только после release."""
+
+    def __init__(self, connection, release):
+        self._connection = connection
+        self._release = release
+        self._session = None
+
+    @property
+    def session(self):
+        self._release.wait(5)
+        self._session = self._connection.get_session()
+        return self._session
+
+    def close(self):
+        if self._session is not None:
+            self._session.close()
+
+
+def test_stale_index_is_served_while_reloading_in_background(sqlite_connection, sqlite_session):
+    sqlite_session.add(Users(email="anna@example.com", first_name="Anna", last_name="Volkova"))
+    sqlite_session.commit()
+    release = threading.Event()
+    index = UserPrefixIndex(ttl=60, uow_factory=lambda: BlockingUnitOfWork(sqlite_connection, release))
+    assert index.ensure_fresh(sqlite_session) is None  # первая загрузка синхронная
+    assert [u.first_name for u in index.search("an")] == ["Anna"]
+
+    sqlite_session.add(Users(email="andrey@example.com", first_name="Andrey", last_name="Orlov"))
+    sqlite_session.commit()
+    index._loaded_at -= 120
+
+    thread = index.ensure_fresh(sqlite_session)
+    assert thread is not None
+    assert index.ensure_fresh(sqlite_session) is None  # вторая перезагрузка не запускается
+    assert [u.first_name for u in index.search("an")] == ["Anna"]
+
+    release.set()
+    thread.join(5)
+    assert index.is_fresh
+    assert sorted(u.first_name for u in index.search("an")) == ["Andrey", "Anna"]
+
+
+class FailingUnitOfWork:
+    @property
+    def session(self):
+        raise RuntimeError("database is unavailable")
+
+    def close(self):
+        pass
+
+
+def test_failed_background_reload_keeps_stale_index():
+    index = UserPrefixIndex(ttl=60, uow_factory=FailingUnitOfWork)
+    index._loaded_at = time.monotonic() - 120
+    index.upsert(IndexedUser(1, "Ivan", "Petrov", "ivan@example.com", None))
+
+    index.ensure_fresh(None).join(5)
+
+    assert [u.id for u in index.search("iv")] == [1]
+    assert not index._refreshing
+
+
+class ConcurrentWrites:
+    """Сессия, после SELECT которой другой запрос успевает изменить пользователей."""
+
+    def __init__(self, session, write):
+        self._session = session
+        self._write = write
+
+    def execute(self, statement):
+        rows = self._session.execute(statement).all()
+        self._write()
+        return type("Result", (), {"all": lambda _: rows})()
+
+
+def test_writes_during_reload_are_not_lost(sqlite_session):
+    sqlite_session.add_all([Users(id=1, email="anna@example.com", first_name="Anna", last_name="Volkova"),
+                            Users(id=2, email="boris@example.com", first_name="Boris", last_name="Lebedev")])
+    sqlite_session.commit()
+    index = UserPrefixIndex(ttl=60)
+
+    def write():
+        index.remove(2)
+        index.upsert(IndexedUser(3, "Clara", "Orlova", "clara@example.com", None))
+
+    index.warm(ConcurrentWrites(sqlite_session, write))
+
+    assert index.search("bor") == []
+    assert [u.id for u in index.search("cla")] == [3]
+    assert [u.id for u in index.search("ann")] == [1]
+    assert index._changes is None
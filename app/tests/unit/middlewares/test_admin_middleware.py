@@ -0,0 +1,60 @@
+from unittest.mock import patch
+
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from app.infrastructure.tranaslations import current_locale
+from app.middlewares.admin_middleware import GlobalContextMiddleware
+
+
+async def inspect_state(request):
+    return JSONResponse({
+        "locale": current_locale.get(),
+        "app_name": getattr(request.state, "app_name", None),
+        "has_uow": hasattr(request.state, "uow"),
+    })
+
+
+async def fail(request):
+    raise RuntimeError("boom")
+
+
+@pytest.fixture
+def uow():
+    with patch("app.middlewares.admin_middleware.UnitOfWork") as uow_cls:
+        yield uow_cls.return_value
+
+
+@pytest.fixture
+def client(uow):
+    app = Starlette(routes=[Route("/admin/page", inspect_state), Route("/static/file", inspect_state),
+                            Route("/admin/fail", fail)])
+    app.add_middleware(GlobalContextMiddleware)
+    return TestClient(app, raise_server_exceptions=False)
+
+
+def test_sets_request_state_and_commits(client, uow):
+    response = client.get("/admin/page")
+
+    assert response.json() == {"locale": "en", "app_name": "Sirius Achievements", "has_uow": True}
+    uow.commit.assert_called_once()
+    uow.close.assert_called_once()
+
+
+def test_skips_static_prefix(client, uow):
+    response = client.get("/static/file")
+
+    assert response.json() == {"locale": "en", "app_name": None, "has_uow": False}
+    uow.close.assert_not_called()
+
+
+def test_rolls_back_on_exception(client, uow):
+    response = client.get("/admin/fail")
+
+    assert response.status_code == 500
+    uow.rollback.assert_called_once()
+    uow.commit.assert_not_called()
+    uow.close.assert_called_once()
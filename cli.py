@@ -1,5 +1,7 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
 import typer
-from app.infrastructure.database.connection import get_database_connection
+from app.infrastructure.database.connection import get_database_connection, dispose_database_connections
 from app.seeders import users_table_seeder
 
 app = typer.Typer()
@@ -16,6 +18,53 @@ def seed():
         print(f"An error occurred during seeding: {e}")
     finally:
         db.close()
+        dispose_database_connections()
+
+@app.command('import-users')
+def import_users(path: str,
+                 file_format: str = typer.Option(None, '--format', help="csv или ndjson (по умолчанию — по расширению)"),
+                 workers: int = typer.Option(os.cpu_count() or 1, help="Процессы для bcrypt"),
+                 batch_size: int = typer.Option(None, help="Строк в одном INSERT"),
+                 send_welcome: bool = typer.Option(True, '--send-welcome/--no-send-welcome')):
+    from app.repositories.admin.user_repository import UserRepository
+    from app.services.admin.user_import_service import UserImportService, IMPORT_BATCH_SIZE, read_rows
+
+    db = get_database_connection().get_session()
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            service = UserImportService(UserRepository(db), executor, send_welcome=send_welcome,
+                                        batch_size=batch_size or IMPORT_BATCH_SIZE)
+            report = service.run(read_rows(path, file_format),
+                                 on_progress=lambda r: print(f"... {r.read} rows, {r.created} created, {r.rate:.0f} rows/s"))
+        for error in report.errors:
+            print(error)
+        print(f"Import completed: {report.summary()}")
+    except Exception as e:
+        db.rollback()
+        print(f"An error occurred during import: {e}")
+    finally:
+        db.close()
+        dispose_database_connections()
+
+@app.command('generate-previews')
+def generate_previews(workers: int = typer.Option(os.cpu_count() or 1, help="Процессы для рендера превью"),
+                      limit: int = typer.Option(None, help="Не больше N документов за запуск")):
+    """Строит превью для документов, загруженных до появления генератора (или с ошибкой)."""
+    from app.infrastructure.previews import PreviewGenerator
+    from app.repositories.admin.achievement_repository import AchievementRepository
+
+    db = get_database_connection().get_session()
+    generator = PreviewGenerator(max_workers=workers)
+    try:
+        rows = AchievementRepository(db).without_preview(limit)
+        for row in rows:
+            generator.schedule(row.id, row.file_path)
+        generator.shutdown(wait=True)
+        stats = generator.stats()
+        print(f"Previews: {len(rows)} documents, {stats['generated']} generated, {stats['failed']} failed")
+    finally:
+        db.close()
+        dispose_database_connections()
 
 if __name__ == "__main__":
-    app()
\ No newline at end of file
+    app()
@@ -1,10 +1,20 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from starlette.middleware.sessions import SessionMiddleware
 from fastapi.middleware.cors import CORSMiddleware
 import os
-from starlette.responses import Response, RedirectResponse
+from starlette.responses import Response, RedirectResponse, PlainTextResponse
 
 from app.infrastructure.custom_static_files import CustomStaticFiles
+from app.infrastructure.static_assets import asset_manifest
+from app.infrastructure.database.connection import (get_database_connection, dispose_database_connections,
+                                                    dispose_async_database_connections)
+from app.infrastructure.database.unit_of_work import UnitOfWork
+from app.infrastructure.user_prefix_index import user_prefix_index
+from app.infrastructure.password_hasher import password_hasher, PasswordHasherBusy
+from app.infrastructure.previews import preview_generator
+from app.infrastructure.email_outbox import email_outbox_worker
+from app.infrastructure.email_templates import email_templates
 
 from app.routers.admin.admin import public_router as admin_common_router
 from app.routers.admin.auth import router as admin_auth_router
@@ -18,7 +28,35 @@ from app.middlewares.admin_middleware import GlobalContextMiddleware
 from app.infrastructure.tranaslations import TranslationManager
 from app.routers.api.auth import router as api_auth_router
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Engine и пул создаются один раз на процесс и закрываются при остановке
+    get_database_connection()
+    # Прогрев индекса автодополнения пользователей; если БД недоступна, индекс
+    # загрузится при первом поиске, а приложение все равно стартует
+    uow = UnitOfWork()
+    try:
+        user_prefix_index.warm(uow.session)
+    except Exception as e:
+        print(f"Error warming user prefix index: {e}")
+    finally:
+        uow.close()
+    # Шаблоны писем компилируются один раз
+    email_templates.load()
+    # Манифест статики с хешами содержимого
+    asset_manifest.build()
+    # Доставка писем из outbox в фоне (только если настроен MAIL_HOST)
+    await email_outbox_worker.start()
+    yield
+    await email_outbox_worker.stop()
+    await dispose_async_database_connections()
+    dispose_database_connections()
+    password_hasher.shutdown()
+    preview_generator.shutdown()
+
+
+app = FastAPI(lifespan=lifespan)
 
 # --- MIDDLEWARE ---
 origins = ["*"]
@@ -34,6 +72,11 @@ app.add_middleware(
 app.add_middleware(GlobalContextMiddleware)
 app.add_middleware(SessionMiddleware, secret_key=os.getenv('ADMIN_SECRET_KEY', 'secret'))
 
+# --- ПЕРЕГРУЗКА BCRYPT: отказываем сразу, клиент повторит позже ---
+@app.exception_handler(PasswordHasherBusy)
+async def password_hasher_busy(request, exc):
+    return PlainTextResponse("Server is busy, please retry.", status_code=503, headers={"Retry-After": "1"})
+
 # --- ФИКС FAVICON ---
 @app.get("/favicon.ico", include_in_schema=False)
 async def favicon():
@@ -51,7 +94,7 @@ app.include_router(admin_moderation_router)
 app.include_router(api_auth_router)
 
 # --- СТАТИКА ---
-app.mount("/static", CustomStaticFiles(directory="static"), name="static")
+app.mount("/static", CustomStaticFiles(directory="static", manifest=asset_manifest), name="static")
 
 # --- ГЛАВНАЯ СТРАНИЦА ---
 @app.get('/')
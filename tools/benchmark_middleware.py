@@ -0,0 +1,106 @@
+import sys
+import os
+import time
+import asyncio
+import tempfile
+
+# Добавляем текущую папку в путь поиска модулей
+sys.path.append(os.getcwd())
+
+# Отдельная SQLite-база, чтобы замер не зависел от внешнего сервера
+os.environ["DB_DRIVER"] = "sqlite"
+os.environ["DB_NAME"] = os.path.join(tempfile.mkdtemp(), "benchmark")
+
+import httpx
+from passlib.context import CryptContext
+from starlette.middleware import Middleware
+from starlette.middleware.base import BaseHTTPMiddleware
+
+import main
+from app.infrastructure.database.connection import get_database_connection
+from app.infrastructure.database.unit_of_work import UnitOfWork
+from app.infrastructure.tranaslations import current_locale
+from app.middlewares.admin_middleware import GlobalContextMiddleware
+from app.models.user import Users
+from app.models.achievement import Achievement  # noqa: F401 — регистрация модели для create_all
+from app.models.user_token import UserToken  # noqa: F401
+from app.models.page import Page  # noqa: F401
+from app.models.enums import UserRole, UserStatus
+
+REQUESTS = int(os.getenv("BENCH_REQUESTS", 500))
+CONCURRENCY = int(os.getenv("BENCH_CONCURRENCY", 10))
+ROUTES = ["/admin/dashboard", "/static/assets/css/bootstrap.min.css"]
+
+
+class LegacyGlobalContextMiddleware(BaseHTTPMiddleware):
+    """Прежняя реализация на BaseHTTPMiddleware — точка отсчета для сравнения."""
+
+    async def dispatch(self, request, call_next):
+        token = current_locale.set(request.session.get('locale', 'en'))
+        uow = UnitOfWork()
+        request.state.uow = uow
+        request.state.app_name = "Sirius Achievements"
+        request.state.pending_users_count = 0
+        request.state.pending_achievements_count = 0
+        success = False
+        try:
+            response = await call_next(request)
+            success = response.status_code < 400
+            return response
+        finally:
+            uow.complete(success)
+            current_locale.reset(token)
+
+
+def use_middleware(middleware_class):
+    main.app.user_middleware = [
+        Middleware(middleware_class) if m.cls in (GlobalContextMiddleware, LegacyGlobalContextMiddleware) else m
+        for m in main.app.user_middleware
+    ]
+    main.app.middleware_stack = None
+
+
+def seed():
+    connection = get_database_connection()
+    connection.create_all()
+    db = connection.get_session()
+    db.add(Users(email="bench@example.com", first_name="Bench", last_name="Admin",
+                 hashed_password=CryptContext(schemes=['bcrypt']).hash("Bench123!"),
+                 role=UserRole.SUPER_ADMIN, status=UserStatus.ACTIVE, is_active=True))
+    db.commit()
+    db.close()
+
+
+async def measure(client: httpx.AsyncClient, path: str) -> float:
+    semaphore = asyncio.Semaphore(CONCURRENCY)
+
+    async def one():
+        async with semaphore:
+            response = await client.get(path)
+            assert response.status_code == 200, (path, response.status_code)
+
+    await client.get(path)  # прогрев
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(REQUESTS)))
+    return REQUESTS / (time.perf_counter() - started)
+
+
+async def run():
+    results = {}
+    for label, middleware_class in (("before", LegacyGlobalContextMiddleware), ("after", GlobalContextMiddleware)):
+        use_middleware(middleware_class)
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            await client.post("/admin/login", data={"email": "bench@example.com", "password": "Bench123!"})
+            for path in ROUTES:
+                results[(label, path)] = await measure(client, path)
+
+    print(f"{REQUESTS} requests, concurrency {CONCURRENCY}")
+    for path in ROUTES:
+        before, after = results[("before", path)], results[("after", path)]
+        print(f"{path:45} before {before:8.1f} req/s   after {after:8.1f} req/s   ({after / before - 1:+.0%})")
+
+
+if __name__ == "__main__":
+    seed()
+    asyncio.run(run())